@@ -0,0 +1,81 @@
+"""
+对比 pymysql 与 mysqlclient 两种驱动下 list_dict 读取大结果集的每秒行数
+
+用法:
+    pip install mysqlclient
+    python benchmarks/driver.py --host localhost --user test --password test --database test
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+
+from pydorm import dorm
+
+DRIVERS = ("pymysql", "mysqlclient")
+
+
+@dataclass
+class BenchRow:
+    __table_name__ = "dorm_bench_driver"
+
+    id: int | None = None
+    name: str | None = None
+    score: float | None = None
+    created_at: str | None = None
+
+
+def run(driver: str, rounds: int) -> float:
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        rows += len(dorm.list_dict(dorm.qw(BenchRow), data_source_id=driver))
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--database", required=True)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    for driver in DRIVERS:
+        dorm.add_data_source(
+            driver,
+            "mysql",
+            args.host,
+            args.port,
+            args.user,
+            args.password,
+            args.database,
+            pool={"min_size": 1, "max_size": 1},
+            driver=driver,
+        )
+
+    table = BenchRow.__table_name__
+    dorm.raw_query(f"DROP TABLE IF EXISTS {table}", (), data_source_id="pymysql")
+    dorm.raw_query(
+        f"CREATE TABLE {table} (id INT PRIMARY KEY AUTO_INCREMENT, name VARCHAR(64), score DOUBLE, created_at DATETIME)",
+        (),
+        data_source_id="pymysql",
+    )
+    try:
+        dorm.insert_bulk(
+            BenchRow,
+            [{"name": f"row-{i}", "score": i / 7, "created_at": "2024-01-01 00:00:00"} for i in range(args.rows)],
+            data_source_id="pymysql",
+        )
+        for driver in DRIVERS:
+            run(driver, 1)  # 预热
+            print(f"{driver:<12} {run(driver, args.rounds):,.0f} rows/s")
+    finally:
+        dorm.raw_query(f"DROP TABLE {table}", (), data_source_id="pymysql")
+
+
+if __name__ == "__main__":
+    main()
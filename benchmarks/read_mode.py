@@ -0,0 +1,87 @@
+"""
+对比 transaction 与 autocommit 两种读模式下单条主键查询的耗时
+
+用法:
+    python benchmarks/read_mode.py --host localhost --user test --password test --database test
+"""
+
+import argparse
+import statistics
+import time
+from dataclasses import dataclass
+
+from pydorm import dorm
+
+
+@dataclass
+class BenchRow:
+    __table_name__ = "dorm_bench_read_mode"
+
+    id: int | None = None
+    name: str | None = None
+
+
+def run(data_source_id: str, ids: list[int], rounds: int) -> list[float]:
+    latencies: list[float] = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        dorm.find_dict(dorm.qw(BenchRow).eq("id", ids[i % len(ids)]), data_source_id=data_source_id)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(read_mode: str, latencies: list[float]):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{read_mode:<12} avg={statistics.mean(latencies) * 1000:.3f}ms "
+        f"p50={statistics.median(latencies) * 1000:.3f}ms p99={p99 * 1000:.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--database", required=True)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+
+    for read_mode in ("transaction", "autocommit"):
+        dorm.add_data_source(
+            read_mode,
+            "mysql",
+            args.host,
+            args.port,
+            args.user,
+            args.password,
+            args.database,
+            pool={"min_size": 1, "max_size": 1},
+            read_mode=read_mode,
+        )
+
+    table = BenchRow.__table_name__
+    dorm.raw_query(f"DROP TABLE IF EXISTS {table}", (), data_source_id="transaction")
+    dorm.raw_query(
+        f"CREATE TABLE {table} (id INT PRIMARY KEY AUTO_INCREMENT, name VARCHAR(64))",
+        (),
+        data_source_id="transaction",
+    )
+    try:
+        dorm.insert_bulk(
+            BenchRow, [{"name": f"row-{i}"} for i in range(args.rows)], data_source_id="transaction"
+        )
+        ids = [row["id"] for row in dorm.raw_query(f"SELECT id FROM {table}", (), data_source_id="transaction")]
+
+        for read_mode in ("transaction", "autocommit"):
+            run(read_mode, ids, min(args.rounds, 100))  # 预热
+            report(read_mode, run(read_mode, ids, args.rounds))
+    finally:
+        dorm.raw_query(f"DROP TABLE {table}", (), data_source_id="transaction")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
+from ._async_dorm import AsyncDorm, async_dorm
+from ._batch import Batch, BatchFuture
+from ._columnar_result import ColumnarResult
 from ._delete_wrapper import DeleteWrapper
 from ._dorm import dorm
-from ._initializer import init
+from ._hydrator import compact
+from ._initializer import init, init_async
+from ._instrumentation import QueryEvent, remove_query_listener, use_query_listener
 from ._insert_wrapper import InsertWrapper
+from ._lazy_result import LazyResultSet, RowProxy
+from ._loader import AsyncLoader, Loader, PendingLoad
 from ._middlewares import use_insert_middleware, use_query_middleware
 from ._query_wrapper import QueryWrapper
 from ._update_wrapper import UpdateWrapper
@@ -11,11 +18,26 @@ __version__ = "0.10.4"
 
 __all__ = [
     "init",
+    "init_async",
     "dorm",
+    "async_dorm",
+    "AsyncDorm",
     "use_query_middleware",
     "use_insert_middleware",
+    "use_query_listener",
+    "remove_query_listener",
+    "QueryEvent",
     "QueryWrapper",
     "DeleteWrapper",
     "UpdateWrapper",
     "InsertWrapper",
+    "ColumnarResult",
+    "compact",
+    "LazyResultSet",
+    "RowProxy",
+    "Loader",
+    "AsyncLoader",
+    "PendingLoad",
+    "Batch",
+    "BatchFuture",
 ]
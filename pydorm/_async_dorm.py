@@ -0,0 +1,276 @@
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Literal, Tuple, Type, TypeVar
+
+from loguru import logger
+
+from ._async_delete import delete
+from ._async_insert import insert, insert_bulk
+from ._async_query import find, find_dict, list as list_obj, list_dict, page as page_obj, page_dict, count
+from ._async_update import update
+from ._data_source_storage import DataSourceStorage
+from ._delete_wrapper import DeleteWrapper
+from ._entity_meta import get_entity_meta
+from ._insert_wrapper import InsertWrapper
+from ._loader import AsyncLoader
+from ._query_wrapper import QueryWrapper
+from ._sql_log import sql_log
+from ._update_wrapper import UpdateWrapper
+from .mysql import AsyncMysqlDataSource, AsyncReusableMysqlConnection
+from .utils.random_utils import generate_random_string
+
+T = TypeVar("T", bound=Any)
+
+
+class AsyncDorm:
+    """Dorm 的 asyncio 版本，所有数据库操作均为协程"""
+
+    def __init__(self):
+        self._init = False
+        self._config_dict = None
+        self._dss = DataSourceStorage[AsyncMysqlDataSource]({"mysql": AsyncMysqlDataSource})
+
+    def is_initialized(self):
+        return self._init
+
+    def init(self, config_dict: Dict[str, Any]):
+        self._config_dict = config_dict
+        self._dss.load(config_dict)
+        if "sql_log" in config_dict:
+            sql_log.configure(config_dict["sql_log"])
+        self._init = True
+        logger.info("async dorm initialized")
+
+    def qw(self, cls: Type[T]) -> QueryWrapper[T]:
+        return QueryWrapper[T](cls)
+
+    def uw(self, cls: Type[T]) -> UpdateWrapper[T]:
+        return UpdateWrapper[T](cls)
+
+    def dw(self, cls: Type[T]) -> DeleteWrapper[T]:
+        return DeleteWrapper[T](cls)
+
+    def _get_data_source(self, data_source_id: str) -> AsyncMysqlDataSource:
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return ds
+
+    async def find(
+        self,
+        wrapper: QueryWrapper[T],
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> T | None:
+        return await find(wrapper, conn=conn, data_source=self._get_data_source(data_source_id))
+
+    async def find_dict(
+        self,
+        wrapper: QueryWrapper[T],
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> Dict[str, Any] | None:
+        return await find_dict(wrapper, conn=conn, data_source=self._get_data_source(data_source_id))
+
+    async def list(
+        self,
+        wrapper: QueryWrapper[T],
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> List[T]:
+        return await list_obj(wrapper, conn=conn, data_source=self._get_data_source(data_source_id))
+
+    async def list_dict(
+        self,
+        wrapper: QueryWrapper[T],
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> List[Dict[str, Any]]:
+        return await list_dict(wrapper, conn=conn, data_source=self._get_data_source(data_source_id))
+
+    def loader(
+        self,
+        cls: Type[T],
+        key: str | None = None,
+        max_batch_size: int = 100,
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> AsyncLoader[T]:
+        """
+        创建按键批量加载实体的 AsyncLoader，多次 load 合并为 WHERE key IN (...) 查询
+
+        Args:
+            cls: 实体类
+            key: 作为键的字段，默认为主键
+            max_batch_size: 单条 IN 查询的最大键数
+        """
+        key_field = key or get_entity_meta(cls).primary_key
+        if key_field is None:
+            raise ValueError(f"key is required for entity [{cls}] without primary key")
+        self.qw(cls).check_field(key_field)
+        return AsyncLoader[T](
+            lambda keys: self.list(self.qw(cls).in_(key_field, keys), conn=conn, data_source_id=data_source_id),
+            key_field,
+            max_batch_size,
+        )
+
+    async def page(
+        self,
+        wrapper: QueryWrapper[T],
+        current: int,
+        page_size: int,
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+        consistent: bool = False,
+    ) -> Tuple[List[T], int]:
+        ds = self._get_data_source(data_source_id)
+        return await page_obj(wrapper, conn=conn, data_source=ds, current=current, page_size=page_size, consistent=consistent)
+
+    async def page_dict(
+        self,
+        wrapper: QueryWrapper[T],
+        current: int,
+        page_size: int,
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+        consistent: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        ds = self._get_data_source(data_source_id)
+        return await page_dict(wrapper, conn=conn, data_source=ds, current=current, page_size=page_size, consistent=consistent)
+
+    async def count(
+        self, wrapper: QueryWrapper[T], conn: AsyncReusableMysqlConnection | None = None, data_source_id="default"
+    ) -> int:
+        return await count(wrapper, conn=conn, data_source=self._get_data_source(data_source_id))
+
+    async def insert(
+        self,
+        cls: Type[T],
+        data: Dict[str, Any] | T,
+        duplicate_key_update: List[str] | Literal["all"] | None = None,
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> Tuple[int, int]:
+        ds = self._get_data_source(data_source_id)
+        wrapper = InsertWrapper[T](cls)
+        dict_data: Dict[str, Any] = data if isinstance(data, Dict) else asdict(data)
+        return await insert(wrapper, dict_data, duplicate_key_update, conn=conn, data_source=ds)
+
+    async def insert_bulk(
+        self,
+        cls: Type[T],
+        data: List[Dict[str, Any]],
+        duplicate_key_update: List[str] | Literal["all"] | None = None,
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> int:
+        ds = self._get_data_source(data_source_id)
+        wrapper = InsertWrapper[T](cls)
+        return await insert_bulk(wrapper, data, duplicate_key_update, conn=conn, data_source=ds)
+
+    async def update(
+        self,
+        wrapper: UpdateWrapper[T],
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> int:
+        return await update(wrapper, conn=conn, data_source=self._get_data_source(data_source_id))
+
+    async def delete(
+        self,
+        wrapper: DeleteWrapper[T],
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> int:
+        return await delete(wrapper, conn=conn, data_source=self._get_data_source(data_source_id))
+
+    async def raw_query(
+        self,
+        sql: str,
+        args: tuple[Any, ...],
+        conn: AsyncReusableMysqlConnection | None = None,
+        data_source_id="default",
+    ) -> List[Dict[str, Any]]:
+        ds = self._get_data_source(data_source_id)
+        if conn is not None:
+            return await ds.get_executor().select_many(conn, sql, args)
+
+        raw_query_id = generate_random_string("raw-query-", 10)
+        new_conn = ds.get_reusable_connection()
+        try:
+            await new_conn.acquire(operation_id=raw_query_id)
+            await new_conn.begin()
+            rows = await ds.get_executor().select_many(new_conn, sql, args)
+            await new_conn.commit()
+            return rows
+        finally:
+            await new_conn.release(operation_id=raw_query_id)
+
+    async def begin(self, data_source_id="default") -> AsyncReusableMysqlConnection:
+        tx_id = generate_random_string("tx-", 10)
+
+        conn = self._get_data_source(data_source_id).get_reusable_connection()
+        await conn.acquire(operation_id=tx_id)
+        try:
+            await conn.begin()
+            return conn
+        except Exception as e:
+            logger.error(f"Failed to begin transaction on data source '{data_source_id}': {e}")
+            await conn.release(operation_id=tx_id)
+            raise e
+
+    async def commit(self, conn: AsyncReusableMysqlConnection):
+        if conn is None:
+            raise RuntimeError("No connection to commit")
+        try:
+            await conn.commit()
+            data_source = self._dss.get(conn.get_data_source_id())
+            if data_source is not None:
+                data_source.mark_write()
+        except Exception as e:
+            logger.error(f"Failed to commit transaction: {e}")
+            raise e
+        finally:
+            await conn.release()
+
+    async def rollback(self, conn: AsyncReusableMysqlConnection):
+        if conn is None:
+            raise RuntimeError("No connection to rollback")
+        try:
+            await conn.rollback()
+        except Exception as e:
+            logger.error(f"Failed to rollback transaction: {e}")
+            raise e
+        finally:
+            await conn.release()
+
+    def add_data_source(
+        self,
+        data_source_id: str,
+        dialect: str,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        database: str | None = None,
+        **options: Any,
+    ):
+        self._dss.add_datasource(data_source_id, dialect, host, port, user, password, database, **options)
+
+    def register_dialect(self, dialect: str, data_source_type: Callable[..., Any]):
+        """
+        注册自定义方言，需要在 init 之前调用
+
+        Args:
+            dialect: 配置中 dialect 的取值
+            data_source_type: 数据源类型，接口与 AsyncMysqlDataSource 一致
+        """
+        self._dss.register(dialect, data_source_type)
+
+    def get_data_source(self, data_source_id="default"):
+        return self._dss.get(data_source_id)
+
+    def pool_stats(self, data_source_id="default") -> Dict[str, Any]:
+        return self._get_data_source(data_source_id).get_pool_stats()
+
+
+async_dorm = AsyncDorm()
@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Literal, Tuple, TypeVar
+
+from ._insert_wrapper import InsertWrapper
+from ._middlewares import before_insert_middlewares
+from .mysql._async_mysql_data_source import AsyncMysqlDataSource
+from .mysql._async_reusable_mysql_connection import AsyncReusableMysqlConnection
+from .utils.random_utils import generate_random_string
+
+T = TypeVar("T", bound=Any)
+
+
+async def insert(
+    wrapper: InsertWrapper[T],
+    data: Dict[str, Any],
+    duplicate_key_update: List[str] | Literal["all"] | None = None,
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+) -> Tuple[int, int]:
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    operation_id = generate_random_string("D-", 10)
+
+    for middleware in before_insert_middlewares:
+        if callable(middleware):
+            middleware(data)
+
+    sql, args = wrapper.compile_insert_sql(data, duplicate_key_update, data_source.get_sql_dialect())
+    if conn is None:
+        new_conn = data_source.get_reusable_connection()
+        try:
+            await new_conn.acquire(operation_id=operation_id)
+            await new_conn.begin()
+            row_affected, last_row_id = await data_source.get_executor().execute(new_conn, sql, args)
+            await new_conn.commit()
+            data_source.mark_write()
+            return row_affected, last_row_id
+        finally:
+            await new_conn.release(operation_id=operation_id)
+    row_affected, last_row_id = await data_source.get_executor().execute(conn, sql, args)
+    data_source.mark_write()
+    return row_affected, last_row_id
+
+
+async def insert_bulk(
+    wrapper: InsertWrapper[T],
+    data: List[Dict[str, Any]],
+    duplicate_key_update: List[str] | Literal["all"] | None = None,
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+) -> int:
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    operation_id = generate_random_string("D-", 10)
+
+    for middleware in before_insert_middlewares:
+        if callable(middleware):
+            middleware(data)
+
+    sql, args = wrapper.compile_insert_bulk_sql(data, duplicate_key_update, data_source.get_sql_dialect())
+    if conn is None:
+        new_conn = data_source.get_reusable_connection()
+        try:
+            await new_conn.acquire(operation_id=operation_id)
+            await new_conn.begin()
+            row_affected = await data_source.get_executor().executemany(new_conn, sql, args)
+            await new_conn.commit()
+            data_source.mark_write()
+            return row_affected
+        finally:
+            await new_conn.release(operation_id=operation_id)
+    row_affected = await data_source.get_executor().executemany(conn, sql, args)
+    data_source.mark_write()
+    return row_affected
@@ -0,0 +1,184 @@
+from typing import Any, Dict, List, Tuple, TypeVar
+
+from ._hydrator import to_entities, to_entity
+from ._middlewares import before_query_middlewares
+from ._query_wrapper import QueryWrapper
+from .mysql._async_mysql_data_source import AsyncMysqlDataSource
+from .mysql._async_reusable_mysql_connection import AsyncReusableMysqlConnection
+from .utils.random_utils import generate_random_string
+
+T = TypeVar("T", bound=Any)
+
+
+async def find(
+    wrapper: QueryWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+) -> T | None:
+    result = await find_dict(wrapper, conn, data_source)
+    if result is None:
+        return None
+    return to_entity(wrapper.get_type(), result)
+
+
+async def find_dict(
+    wrapper: QueryWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+) -> Dict[str, Any] | None:
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    operation_id = generate_random_string("R-", 10)
+
+    for middleware in before_query_middlewares:
+        if callable(middleware):
+            middleware(wrapper)
+
+    sql, args = wrapper.compile_sql(data_source.get_placeholder())
+
+    if conn is None:
+        new_conn = data_source.get_reusable_connection(for_read=True)
+        try:
+            await new_conn.acquire(operation_id=operation_id)
+            await new_conn.begin_read()
+            result = await data_source.get_executor().select_one(new_conn, sql, args)
+            await new_conn.end_read()
+            return result
+        finally:
+            await new_conn.release(operation_id=operation_id)
+    else:
+        return await data_source.get_executor().select_one(conn, sql, args)
+
+
+async def list(
+    wrapper: QueryWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+) -> List[T]:
+    result = await list_dict(wrapper, conn, data_source)
+    return to_entities(wrapper.get_type(), result)
+
+
+async def list_dict(
+    wrapper: QueryWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+) -> List[Dict[str, Any]]:
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    operation_id = generate_random_string("R-", 10)
+
+    for middleware in before_query_middlewares:
+        if callable(middleware):
+            middleware(wrapper)
+
+    sql, args = wrapper.compile_sql(data_source.get_placeholder())
+    if conn is None:
+        new_conn = data_source.get_reusable_connection(for_read=True)
+        try:
+            await new_conn.acquire(operation_id=operation_id)
+            await new_conn.begin_read()
+            result = await data_source.get_executor().select_many(new_conn, sql, args)
+            await new_conn.end_read()
+            return result
+        finally:
+            await new_conn.release(operation_id=operation_id)
+    else:
+        return await data_source.get_executor().select_many(conn, sql, args)
+
+
+async def count(
+    wrapper: QueryWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+    load_middlewares: bool = True,
+) -> int:
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    operation_id = generate_random_string("R-", 10)
+
+    if load_middlewares:
+        for middleware in before_query_middlewares:
+            if callable(middleware):
+                middleware(wrapper)
+
+    sql, args = wrapper.compile_count_sql(data_source.get_placeholder())
+
+    if conn is None:
+        new_conn = data_source.get_reusable_connection(for_read=True)
+        try:
+            await new_conn.acquire(operation_id=operation_id)
+            await new_conn.begin_read()
+            result = await data_source.get_executor().select_one(new_conn, sql, args)
+            await new_conn.end_read()
+        finally:
+            await new_conn.release(operation_id=operation_id)
+    else:
+        result = await data_source.get_executor().select_one(conn, sql, args)
+
+    if result is None:
+        return 0
+    return result["COUNT(*)"]
+
+
+async def page(
+    wrapper: QueryWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+    current: int = 1,
+    page_size: int = 10,
+    consistent: bool = False,
+) -> Tuple[List[T], int]:
+    rows, total = await page_dict(wrapper, conn, data_source, current, page_size, consistent)
+    return to_entities(wrapper.get_type(), rows), total
+
+
+async def page_dict(
+    wrapper: QueryWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+    current: int = 1,
+    page_size: int = 10,
+    consistent: bool = False,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    分页查询
+
+    Args:
+        consistent: 未传入 conn 时，是否在同一事务中执行 COUNT 和查询以保证结果一致。
+            transaction 读模式下总是一致
+    """
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    operation_id = generate_random_string("R-", 10)
+
+    for middleware in before_query_middlewares:
+        if callable(middleware):
+            middleware(wrapper)
+
+    wrapper.limit(page_size).offset((current - 1) * page_size)
+    sql, args = wrapper.compile_sql(data_source.get_placeholder())
+
+    if conn is None:
+        new_conn = data_source.get_reusable_connection(for_read=True)
+        try:
+            await new_conn.acquire(operation_id=operation_id)
+            await new_conn.begin_read(consistent)
+            total = await count(wrapper, new_conn, data_source, load_middlewares=False)
+            if total == 0:
+                return [], total
+            rows = await data_source.get_executor().select_many(new_conn, sql, args)
+            await new_conn.end_read()
+            return rows, total
+        finally:
+            await new_conn.release(operation_id=operation_id)
+
+    total = await count(wrapper, conn, data_source, load_middlewares=False)
+    if total == 0:
+        return [], total
+    rows = await data_source.get_executor().select_many(conn, sql, args)
+    return rows, total
@@ -0,0 +1,46 @@
+from typing import Any, TypeVar
+
+from ._middlewares import before_query_middlewares
+from ._update_wrapper import UpdateWrapper
+from .mysql._async_mysql_data_source import AsyncMysqlDataSource
+from .mysql._async_reusable_mysql_connection import AsyncReusableMysqlConnection
+from .utils.random_utils import generate_random_string
+
+T = TypeVar("T", bound=Any)
+
+
+async def update(
+    wrapper: UpdateWrapper[T],
+    conn: AsyncReusableMysqlConnection | None = None,
+    data_source: AsyncMysqlDataSource | None = None,
+) -> int:
+    if wrapper._where.count() == 0:
+        raise ValueError("where condition is required for update operation")
+
+    if len(wrapper._update_fields) == 0:
+        raise ValueError("update fields are required")
+
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    operation_id = generate_random_string("U-", 10)
+
+    for middleware in before_query_middlewares:
+        if callable(middleware):
+            middleware(wrapper)
+
+    sql, args = wrapper.compile_sql(data_source.get_placeholder())
+    if conn is None:
+        new_conn = data_source.get_reusable_connection()
+        try:
+            await new_conn.acquire(operation_id=operation_id)
+            await new_conn.begin()
+            row_affected, _ = await data_source.get_executor().execute(new_conn, sql, args)
+            await new_conn.commit()
+            data_source.mark_write()
+            return row_affected or 0
+        finally:
+            await new_conn.release(operation_id=operation_id)
+    row_affected, _ = await data_source.get_executor().execute(conn, sql, args)
+    data_source.mark_write()
+    return row_affected or 0
@@ -0,0 +1,243 @@
+from typing import Any, Callable, Dict, Generic, List, Tuple, TypeVar
+
+from ._delete_wrapper import DeleteWrapper
+from ._hydrator import get_hydrator, is_compact, to_entity
+from ._instrumentation import instrument
+from ._middlewares import before_query_middlewares
+from ._query_wrapper import QueryWrapper
+from ._update_wrapper import UpdateWrapper
+from .errors import BatchAbortedException
+from .protocols import DataSource, ReusableConnection
+from .utils.random_utils import generate_random_string
+
+T = TypeVar("T", bound=Any)
+
+# (列名, 每行的值, 受影响的行数) -> 结果
+Converter = Callable[[Tuple[str, ...], List[Tuple[Any, ...]], int], Any]
+
+_NOT_EXECUTED = object()
+
+
+class BatchFuture(Generic[T]):
+    """批量执行中一条语句的结果，批量执行结束后通过 get 获取"""
+
+    __slots__ = ("_result", "_exception")
+
+    def __init__(self):
+        self._result: Any = _NOT_EXECUTED
+        self._exception: BaseException | None = None
+
+    def done(self) -> bool:
+        return self._result is not _NOT_EXECUTED or self._exception is not None
+
+    def get(self) -> T:
+        """返回语句的结果，语句失败或因之前的语句失败而未执行时抛出对应的异常"""
+        if self._exception is not None:
+            raise self._exception
+        if self._result is _NOT_EXECUTED:
+            raise ValueError("batch has not been executed")
+        return self._result
+
+    def exception(self) -> BaseException | None:
+        return self._exception
+
+    def set_result(self, result: T) -> None:
+        self._result = result
+
+    def set_exception(self, exception: BaseException) -> None:
+        self._exception = exception
+
+
+class _Statement:
+    __slots__ = ("sql", "args", "convert", "future", "write")
+
+    def __init__(
+        self,
+        sql: str,
+        args: Tuple[Any, ...],
+        convert: Converter,
+        future: BatchFuture[Any],
+        write: Tuple[str, Tuple[Any, ...] | None] | None,
+    ):
+        self.sql = sql
+        self.args = args
+        self.convert = convert
+        self.future = future
+        # 写入语句的 (表, 主键值)
+        self.write = write
+
+
+def _one_entity(entity_type: Any) -> Converter:
+    def convert(columns: Tuple[str, ...], rows: List[Tuple[Any, ...]], _: int) -> Any:
+        if len(rows) == 0:
+            return None
+        return to_entity(entity_type, dict(zip(columns, rows[0])))
+
+    return convert
+
+
+def _one_dict(columns: Tuple[str, ...], rows: List[Tuple[Any, ...]], _: int) -> Dict[str, Any] | None:
+    return dict(zip(columns, rows[0])) if rows else None
+
+
+def _many_entities(entity_type: Any) -> Converter:
+    def convert(columns: Tuple[str, ...], rows: List[Tuple[Any, ...]], _: int) -> List[Any]:
+        if is_compact(entity_type):
+            hydrate = get_hydrator(entity_type, columns)
+            return [hydrate(row) for row in rows]
+        return [entity_type(**dict(zip(columns, row))) for row in rows]
+
+    return convert
+
+
+def _many_dicts(columns: Tuple[str, ...], rows: List[Tuple[Any, ...]], _: int) -> List[Dict[str, Any]]:
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _count(_: Tuple[str, ...], rows: List[Tuple[Any, ...]], __: int) -> int:
+    return rows[0][0] if rows else 0
+
+
+def _row_affected(_: Tuple[str, ...], __: List[Tuple[Any, ...]], row_affected: int) -> int:
+    return row_affected
+
+
+class Batch:
+    """
+    批量执行多条互不依赖的语句，数据源开启 multi_statements 时在一次往返中发送，否则在同一连接上依次执行
+
+    - 每个方法将语句加入队列并返回 BatchFuture，execute 后按语句顺序得到各自的结果
+    - 含有写入语句时所有语句在同一事务中执行；传入 conn 时在调用方的事务中执行，由调用方提交
+    - 某条语句失败时之后的语句不再执行：失败语句的 BatchFuture 为驱动异常，之后的为 BatchAbortedException，
+      execute 抛出驱动异常；自行开启的事务被回滚，之前语句的结果仍可获取但写入不会生效
+    - 批量中的查询不读写结果缓存和事务内实体缓存
+    """
+
+    def __init__(self, data_source: DataSource, conn: ReusableConnection | None = None):
+        self._data_source = data_source
+        self._conn = conn
+        self._statements: List[_Statement] = []
+        self._executed = False
+
+    def _add(
+        self,
+        sql: str,
+        args: Tuple[Any, ...],
+        convert: Converter,
+        write: Tuple[str, Tuple[Any, ...] | None] | None = None,
+    ) -> BatchFuture[Any]:
+        if self._executed:
+            raise ValueError("batch has already been executed")
+        future: BatchFuture[Any] = BatchFuture()
+        self._statements.append(_Statement(sql, args, convert, future, write))
+        return future
+
+    @staticmethod
+    def _apply_middlewares(wrapper: Any) -> None:
+        for middleware in before_query_middlewares:
+            if callable(middleware):
+                middleware(wrapper)
+
+    def find(self, wrapper: QueryWrapper[T]) -> BatchFuture[T | None]:
+        self._apply_middlewares(wrapper)
+        sql, args = wrapper.compile_sql(self._data_source.get_placeholder())
+        return self._add(sql, args, _one_entity(wrapper.get_type()))
+
+    def find_dict(self, wrapper: QueryWrapper[T]) -> BatchFuture[Dict[str, Any] | None]:
+        self._apply_middlewares(wrapper)
+        sql, args = wrapper.compile_sql(self._data_source.get_placeholder())
+        return self._add(sql, args, _one_dict)
+
+    def list(self, wrapper: QueryWrapper[T]) -> BatchFuture[List[T]]:
+        self._apply_middlewares(wrapper)
+        sql, args = wrapper.compile_sql(self._data_source.get_placeholder())
+        return self._add(sql, args, _many_entities(wrapper.get_type()))
+
+    def list_dict(self, wrapper: QueryWrapper[T]) -> BatchFuture[List[Dict[str, Any]]]:
+        self._apply_middlewares(wrapper)
+        sql, args = wrapper.compile_sql(self._data_source.get_placeholder())
+        return self._add(sql, args, _many_dicts)
+
+    def count(self, wrapper: QueryWrapper[T]) -> BatchFuture[int]:
+        self._apply_middlewares(wrapper)
+        sql, args = wrapper.compile_count_sql(self._data_source.get_placeholder())
+        return self._add(sql, args, _count)
+
+    def update(self, wrapper: UpdateWrapper[T]) -> BatchFuture[int]:
+        if wrapper._where.count() == 0:
+            raise ValueError("where condition is required for update operation")
+        if len(wrapper._update_fields) == 0:
+            raise ValueError("update fields are required")
+        self._apply_middlewares(wrapper)
+        sql, args = wrapper.compile_sql(self._data_source.get_placeholder())
+        return self._add(sql, args, _row_affected, (wrapper.get_table(), wrapper.get_key_values()))
+
+    def delete(self, wrapper: DeleteWrapper[T]) -> BatchFuture[int]:
+        if wrapper._where.count() == 0:
+            raise ValueError("where condition is required for delete operation")
+        self._apply_middlewares(wrapper)
+        sql, args = wrapper.compile_sql(self._data_source.get_placeholder())
+        return self._add(sql, args, _row_affected, (wrapper.get_table(), wrapper.get_key_values()))
+
+    def get_writes(self) -> List[Tuple[str, Tuple[Any, ...] | None]]:
+        """返回执行过的批量中写入语句的 (表, 主键值)，失败时也包含在内，用于使缓存失效"""
+        if not self._executed:
+            return []
+        return [statement.write for statement in self._statements if statement.write is not None]
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def execute(self) -> None:
+        """执行队列中的所有语句"""
+        if self._executed:
+            raise ValueError("batch has already been executed")
+        self._executed = True
+        if len(self._statements) == 0:
+            return
+
+        with instrument("batch", self._data_source):
+            has_write = any(statement.write is not None for statement in self._statements)
+            if self._conn is not None:
+                try:
+                    self._run(self._conn)
+                finally:
+                    if has_write:
+                        self._data_source.mark_write()
+                return
+
+            operation_id = generate_random_string("B-", 10)
+            new_conn = self._data_source.get_reusable_connection(for_read=not has_write)
+            try:
+                new_conn.acquire(operation_id=operation_id)
+                if has_write:
+                    new_conn.begin()
+                    self._run(new_conn)
+                    new_conn.commit()
+                    self._data_source.mark_write()
+                else:
+                    new_conn.begin_read()
+                    self._run(new_conn)
+                    new_conn.end_read()
+            finally:
+                # 未提交的事务在归还连接时回滚
+                new_conn.release(operation_id=operation_id)
+
+    def _run(self, conn: Any) -> None:
+        statements = self._statements
+        executor = self._data_source.get_executor()
+        index = 0
+        try:
+            results = executor.execute_batch(conn, [(statement.sql, statement.args) for statement in statements])
+            for columns, rows, row_affected in results:
+                statement = statements[index]
+                statement.future.set_result(statement.convert(columns, rows, row_affected))
+                index += 1
+        except Exception as e:
+            if index < len(statements):
+                statements[index].future.set_exception(e)
+            for statement in statements[index + 1 :]:
+                statement.future.set_exception(
+                    BatchAbortedException(f"statement {index} of the batch failed, this statement was not executed")
+                )
+            raise
@@ -0,0 +1,107 @@
+import itertools
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, Literal, Sequence, Tuple, TypeVar
+
+from ._insert_wrapper import InsertWrapper
+from .protocols import DataSource, ReusableConnection
+from .utils.random_utils import generate_random_string
+from .utils.tsv_utils import encode_tsv_row
+
+T = TypeVar("T", bound=Any)
+
+
+def bulk_load(
+    wrapper: InsertWrapper[T],
+    rows: Iterable[Dict[str, Any] | Sequence[Any]],
+    columns: Sequence[str] | None = None,
+    duplicate: Literal["ignore", "replace"] | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    chunk_rows: int = 500_000,
+    commit_per_chunk: bool = False,
+) -> int:
+    """
+    通过 LOAD DATA LOCAL INFILE 导入数据，数据按块编码到临时文件后逐块导入
+
+    Args:
+        rows: 字典或元组组成的可迭代对象，可以是生成器
+        columns: 列名。字典数据默认取第一行中属于实体的键，元组数据默认取实体的全部字段
+        duplicate: 主键冲突时的处理方式，ignore 跳过，replace 覆盖
+        chunk_rows: 每个临时文件的最大行数
+        commit_per_chunk: 是否每块提交一次，仅在未传入 conn 时生效
+
+    Returns:
+        受影响的总行数
+    """
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+    if not data_source.is_local_infile_enabled():
+        raise ValueError(
+            f"[{data_source.get_id()}] bulk_load requires 'local_infile: true' in the data source options"
+        )
+
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None:
+        return 0
+
+    if isinstance(first, dict):
+        keys = wrapper.filter_columns(columns) if columns is not None else wrapper.get_bulk_keys([first])
+        values: Iterable[Tuple[Any, ...]] = (
+            tuple(row.get(k) for k in keys) for row in itertools.chain([first], iterator)  # type: ignore
+        )
+    else:
+        keys = wrapper.filter_columns(columns)
+        values = itertools.chain([first], iterator)  # type: ignore
+
+    sql = wrapper.build_load_data_sql(keys, duplicate)
+    operation_id = generate_random_string("D-", 10)
+
+    def _load_chunks(c: ReusableConnection, commit: bool) -> int:
+        row_affected = 0
+        while True:
+            chunk = list(itertools.islice(values, chunk_rows))
+            if len(chunk) == 0:
+                return row_affected
+            row_affected += _load_chunk(c, sql, keys, chunk, data_source)
+            if commit:
+                c.commit()
+                c.begin()
+
+    if conn is None:
+        new_conn = data_source.get_reusable_connection()
+        try:
+            new_conn.acquire(operation_id=operation_id)
+            new_conn.begin()
+            row_affected = _load_chunks(new_conn, commit_per_chunk)
+            new_conn.commit()
+            data_source.mark_write()
+            return row_affected
+        finally:
+            new_conn.release(operation_id=operation_id)
+    row_affected = _load_chunks(conn, False)
+    data_source.mark_write()
+    return row_affected
+
+
+def _load_chunk(
+    conn: ReusableConnection,
+    sql: str,
+    keys: List[str],
+    chunk: List[Tuple[Any, ...]],
+    data_source: DataSource,
+) -> int:
+    f = tempfile.NamedTemporaryFile(mode="wb", prefix="pydorm-", suffix=".tsv", delete=False)
+    path = f.name
+    # 写入失败时也要删除文件，避免已写入的行留在临时目录
+    try:
+        with f:
+            for row in chunk:
+                if len(row) != len(keys):
+                    raise ValueError(f"row has {len(row)} values but {len(keys)} columns: {keys}")
+                f.write(encode_tsv_row(row))
+        row_affected, _ = data_source.get_executor().execute(conn, sql, (path,))
+        return row_affected or 0
+    finally:
+        os.unlink(path)
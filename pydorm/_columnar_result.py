@@ -0,0 +1,77 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+
+def _to_column(values: Tuple[Any, ...]) -> List[Any] | array:
+    """整数列和浮点数列（不含 NULL）转换为 array.array，其他列使用 list"""
+    if len(values) == 0:
+        return []
+    first_type = type(values[0])
+    if first_type is int or first_type is float:
+        if all(type(value) is first_type for value in values):
+            try:
+                return array("q" if first_type is int else "d", values)
+            except OverflowError:
+                pass
+    return list(values)
+
+
+class ColumnarResult:
+    """
+    按列存储的查询结果，每列为一个 list 或 array.array
+
+    整数和浮点数列使用 array.array 紧凑存储，不为每个值分配 Python 对象；含 NULL 或其他类型的列使用 list
+    """
+
+    __slots__ = ("_columns", "_data", "_size")
+
+    def __init__(self, columns: Sequence[str], rows: Sequence[Tuple[Any, ...]]):
+        self._columns: Tuple[str, ...] = tuple(columns)
+        self._size: int = len(rows)
+        if self._size == 0:
+            self._data: Dict[str, List[Any] | array] = {column: [] for column in self._columns}
+        else:
+            self._data = {column: _to_column(values) for column, values in zip(self._columns, zip(*rows))}
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self._columns
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, column: str) -> List[Any] | array:
+        return self._data[column]
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __repr__(self) -> str:
+        return f"ColumnarResult(columns={list(self._columns)}, rows={self._size})"
+
+    def to_dict(self) -> Dict[str, List[Any] | array]:
+        """返回列名到列数据的字典"""
+        return dict(self._data)
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        转换为 NumPy 数组，array.array 列不复制数据，其他列为 object 数组
+
+        Returns:
+            列名到 numpy.ndarray 的字典
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is required for ColumnarResult.to_numpy, please install it with `pip install numpy`")
+
+        result: Dict[str, Any] = {}
+        for column, values in self._data.items():
+            if isinstance(values, array):
+                result[column] = numpy.frombuffer(values, dtype="i8" if values.typecode == "q" else "f8")
+            else:
+                result[column] = numpy.array(values, dtype=object)
+        return result
@@ -11,6 +11,9 @@ class Condition:
     def parse(self) -> tuple[str, Any]:
         return f"{self.field} {self.operator.value} ?", self.value
 
+    def shape(self) -> Tuple[str, Operator]:
+        return self.field, self.operator
+
 
 class ConditionTree:
     def __init__(self, logic="and"):
@@ -28,6 +31,33 @@ class ConditionTree:
         self.conditions.append(condition_tree)
         return self
 
+    def key_values(self, field: str) -> Tuple[Any, ...] | None:
+        """条件仅为 field = ? 或 field IN (...) 时返回对应的值，否则返回 None"""
+        if len(self.conditions) != 1:
+            return None
+        condition = self.conditions[0]
+        if isinstance(condition, ConditionTree) or condition.field != field:
+            return None
+        if condition.operator == Operator.EQ:
+            return (condition.value,)
+        if condition.operator == Operator.IN:
+            return tuple(condition.value)
+        return None
+
+    def shape(self) -> Tuple[Any, ...]:
+        """条件树的结构（字段、运算符与嵌套关系），不包含参数值"""
+        return self.logic, tuple(condition.shape() for condition in self.conditions)
+
+    def values(self) -> Tuple[Any, ...]:
+        """按 parse 生成的占位符顺序返回参数值"""
+        args: List[Any] = []
+        for condition in self.conditions:
+            if isinstance(condition, ConditionTree):
+                args.extend(condition.values())
+            else:
+                args.append(condition.value)
+        return tuple(args)
+
     def parse(self) -> Tuple[str, Tuple[Any, ...]]:
         if len(self.conditions) == 0:
             return "", ()
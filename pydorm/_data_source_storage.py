@@ -1,13 +1,37 @@
-from typing import Any, Dict
+import inspect
+from typing import Any, Callable, Dict, Generic, List, TypeVar
 
-from .mysql import MysqlDataSource
+from loguru import logger
 
+D = TypeVar("D")
 
-class DataSourceStorage:
-    def __init__(self):
-        self._data_sources: Dict[str, MysqlDataSource] = {}
 
-    def default(self) -> MysqlDataSource | None:
+class DataSourceStorage(Generic[D]):
+    def __init__(self, data_source_types: Dict[str, Callable[..., D]] | None = None):
+        """
+        Args:
+            data_source_types: 方言名称到数据源类型的映射，数据源需实现 protocols.DataSource
+        """
+        self._data_source_types: Dict[str, Callable[..., D]] = dict(data_source_types or {})
+        self._data_sources: Dict[str, D] = {}
+
+    def register(self, dialect: str, data_source_type: Callable[..., D]):
+        """
+        注册方言，配置中 dialect 为该名称的数据源由 data_source_type 创建。已注册的方言会被覆盖，
+        可以用来替换内置实现
+
+        Args:
+            dialect: 方言名称
+            data_source_type: 数据源类型或工厂函数，参数为 data_source_id 和数据源配置
+        """
+        if not dialect:
+            raise ValueError("dialect is required")
+        self._data_source_types[dialect] = data_source_type
+
+    def get_dialects(self) -> List[str]:
+        return list(self._data_source_types.keys())
+
+    def default(self) -> D | None:
         return self._data_sources.get("default", None)
 
     def load(self, config_dict: Dict[str, Any]):
@@ -19,59 +43,72 @@ class DataSourceStorage:
             if "dialect" not in conf:
                 raise ValueError("dialect is required")
 
-            if "mysql" == conf["dialect"]:
-                mysql_ds = MysqlDataSource(
-                    data_source_id=data_source_id,
-                    host=conf["host"],
-                    port=conf["port"],
-                    user=conf["user"],
-                    password=conf["password"],
-                    database=conf["database"],
-                )
-                self._data_sources[data_source_id] = mysql_ds
-            else:
-                raise ValueError(f'unsupported dialect: {conf["dialect"]}')
+            # 数据源声明的参数作为构造参数，各方言的必填项由构造函数校验；options 为驱动的连接参数
+            kwargs = self._declared_kwargs(data_source_id, conf)
+            self._data_sources[data_source_id] = self._create(
+                data_source_id,
+                conf["dialect"],
+                **kwargs,
+                **(conf.get("options") or {}),
+            )
+
+    def _declared_kwargs(self, data_source_id: str, conf: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        取出配置中数据源构造函数声明的参数，其余配置项忽略，避免作为连接参数传给驱动。
+        只接受 **kwargs 的工厂函数传入除 dialect 和 options 外的全部配置项
+        """
+        items = {k: v for k, v in conf.items() if k not in ("dialect", "options")}
+        data_source_type = self._data_source_types.get(conf["dialect"])
+        if data_source_type is None:
+            return items
+        parameters = inspect.signature(data_source_type).parameters.values()
+        declared = {
+            parameter.name
+            for parameter in parameters
+            if parameter.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        }
+        declared.discard("data_source_id")
+        if not declared:
+            return items
+        ignored = [k for k in items if k not in declared]
+        if ignored:
+            logger.warning(f"[{data_source_id}] unknown data source config ignored: {', '.join(ignored)}")
+        return {k: v for k, v in items.items() if k in declared}
 
     def add_datasource(
         self,
         data_source_id: str,
         dialect: str,
-        host: str,
-        port: int,
-        user: str,
-        password: str,
-        database: str,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        database: str | None = None,
         **options: Any,
     ):
         if dialect is None or dialect == "":
             raise ValueError("dialect is required")
-        if host is None or host == "":
-            raise ValueError("host is required")
-        if port is None or port <= 0:
-            raise ValueError("port is required and must be greater than 0")
-        if user is None or user == "":
-            raise ValueError("user is required")
-        if password is None or password == "":
-            raise ValueError("password is required")
         if database is None or database == "":
             raise ValueError("database is required")
 
         if data_source_id in self._data_sources:
             raise ValueError(f"data source with id {data_source_id} already exists")
 
-        if "mysql" == dialect:
-            mysql_ds = MysqlDataSource(
-                data_source_id=data_source_id,
-                host=host,
-                port=port,
-                user=user,
-                password=password,
-                database=database,
-                **options,
-            )
-            self._data_sources[data_source_id] = mysql_ds
-        else:
+        # 未传入的连接参数不传给数据源，各方言的必填项由构造函数校验
+        connect_args = dict(host=host, port=port, user=user, password=password)
+        self._data_sources[data_source_id] = self._create(
+            data_source_id,
+            dialect,
+            database=database,
+            **{k: v for k, v in connect_args.items() if v is not None},
+            **options,
+        )
+
+    def _create(self, data_source_id: str, dialect: str, **kwargs: Any) -> D:
+        data_source_type = self._data_source_types.get(dialect)
+        if data_source_type is None:
             raise ValueError(f"unsupported dialect: {dialect}")
+        return data_source_type(data_source_id=data_source_id, **kwargs)
 
-    def get(self, data_source_id: str) -> MysqlDataSource | None:
+    def get(self, data_source_id: str) -> D | None:
         return self._data_sources.get(data_source_id, None)
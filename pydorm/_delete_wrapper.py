@@ -1,5 +1,7 @@
-from typing import Any, Generic, Type, TypeVar, get_type_hints
+from typing import Any, Generic, Tuple, Type, TypeVar
 from pydorm._where import Or, Where
+from ._entity_meta import get_entity_meta
+from ._sql_cache import CompiledSql, sql_cache
 from .protocols import EntityProtocol
 
 T = TypeVar("T", bound=EntityProtocol)
@@ -12,18 +14,26 @@ class DeleteWrapper(Generic[T]):
     ):
 
         self._entity_type = entity_type
-        self._table = entity_type.__table_name__
+        self._meta = get_entity_meta(entity_type)
+        self._table = self._meta.table
 
         self._where = Where()
-
-        fields = list(get_type_hints(entity_type).keys())
-        self._fields = [field for field in fields if not field.startswith("__")]
+        self._fields = self._meta.fields
 
     def get_type(self) -> Type[T]:
         return self._entity_type
 
+    def get_table(self) -> str:
+        return self._table
+
+    def get_key_values(self) -> Tuple[Any, ...] | None:
+        """条件仅为主键等值或 IN 时返回涉及的主键值，否则返回 None"""
+        if self._meta.primary_key is None:
+            return None
+        return self._where.tree().key_values(self._meta.primary_key)
+
     def check_field(self, field: str):
-        if not hasattr(self._entity_type, field):
+        if field not in self._meta.field_set:
             raise ValueError(f"invalid field [{field}] in entity [{self._entity_type}]")
 
     def eq(self, field: str, value: Any) -> "DeleteWrapper[T]":
@@ -80,6 +90,11 @@ class DeleteWrapper(Generic[T]):
         self._where.or_(or_)
         return self
 
+    def compile_sql(self, placeholder: str = "%s") -> Tuple[CompiledSql, Tuple[Any, ...]]:
+        """生成使用驱动占位符的删除SQL，相同结构的语句只在第一次构建"""
+        shape = ("delete", self._table, self._where.tree().shape())
+        return sql_cache.compile(shape, placeholder, self.build_sql, self._where.tree().values)
+
     def build_sql(self) -> tuple[str, tuple[Any, ...]]:
         sql = f"DELETE FROM {self._table}"
         args = ()
@@ -1,19 +1,50 @@
+import weakref
+from contextlib import contextmanager
 from dataclasses import asdict
-from typing import Any, Dict, List, Literal, Tuple, Type, TypeVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Sequence, Set, Tuple, Type, TypeVar
 
 from loguru import logger
-from pymysql.cursors import DictCursor
 
+from . import settings
+from ._batch import Batch
+from ._bulk_load import bulk_load
+from ._columnar_result import ColumnarResult
 from ._data_source_storage import DataSourceStorage
 from ._delete import delete
 from ._delete_wrapper import DeleteWrapper
+from ._entity_meta import get_entity_meta
+from ._identity_map import IdentityMap
 from ._insert import insert, insert_bulk
 from ._insert_wrapper import InsertWrapper
-from ._query import find, find_dict, list as list_obj, list_dict, page as page_obj, page_dict, count
+from ._instrumentation import instrument, remove_query_listener, use_query_listener
+from ._lazy_result import LazyResultSet
+from ._loader import Loader
+from ._query import (
+    find,
+    find_dict,
+    list as list_obj,
+    list_dict,
+    list_tuples,
+    list_columns,
+    list_lazy,
+    iter as iter_obj,
+    iter_dict,
+    page as page_obj,
+    page_dict,
+    page_after as page_after_obj,
+    page_after_dict,
+    count,
+)
 from ._query_wrapper import QueryWrapper
+from ._result_cache import MemoryResultCacheBackend, ResultCache
+from ._sql_cache import sql_cache
+from ._sql_log import sql_log
+from ._statement_stats import StatementStats
 from ._update import update
 from ._update_wrapper import UpdateWrapper
-from .mysql import ReusableMysqlConnection
+from .mysql import MysqlDataSource
+from .protocols import DataSource, ReusableConnection
+from .sqlite import SqliteDataSource
 from .utils.random_utils import generate_random_string
 
 T = TypeVar("T", bound=Any)
@@ -23,9 +54,15 @@ class Dorm:
     def __init__(self):
         self._init = False
         self._config_dict = None
-        self._dss = DataSourceStorage()
+        self._dss = DataSourceStorage[DataSource]({"mysql": MysqlDataSource, "sqlite": SqliteDataSource})
 
         self._tx_id = None
+        self._result_cache: ResultCache | None = None
+        self._statement_stats: StatementStats | None = None
+        # 事务中写入的表，提交时再次失效，避免提交前其他请求读到旧数据并写入缓存
+        self._pending_tables: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+        # dorm.begin() 返回的连接上的事务内实体缓存
+        self._identity_maps: "weakref.WeakKeyDictionary[Any, IdentityMap]" = weakref.WeakKeyDictionary()
 
     def is_initialized(self):
         return self._init
@@ -33,6 +70,22 @@ class Dorm:
     def init(self, config_dict: Dict[str, Any]):
         self._config_dict = config_dict
         self._dss.load(config_dict)
+        sql_cache_config = config_dict.get("sql_cache") or {}
+        if "max_size" in sql_cache_config:
+            sql_cache.resize(sql_cache_config["max_size"])
+        if "sql_log" in config_dict:
+            sql_log.configure(config_dict["sql_log"])
+        result_cache_config = config_dict.get("result_cache")
+        if result_cache_config is not None and result_cache_config.get("enabled", True):
+            self.enable_result_cache(
+                max_bytes=result_cache_config.get("max_bytes", settings.result_cache_max_bytes),
+                ttl=result_cache_config.get("ttl"),
+            )
+        statement_stats_config = config_dict.get("statement_stats")
+        if statement_stats_config is not None and statement_stats_config.get("enabled", True):
+            self.enable_statement_stats(
+                max_statements=statement_stats_config.get("max_statements", settings.statement_stats_max_size)
+            )
         self._init = True
         logger.info("dorm initialized")
 
@@ -48,87 +101,269 @@ class Dorm:
     def find(
         self,
         wrapper: QueryWrapper[T],
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> T | None:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return find(wrapper, conn=conn, data_source=ds)
+        return find(
+            wrapper,
+            conn=conn,
+            data_source=ds,
+            cache=self._result_cache,
+            identity_map=self._identity_maps.get(conn) if conn is not None else None,
+        )
 
     def find_dict(
         self,
         wrapper: QueryWrapper[T],
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> Dict[str, Any] | None:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return find_dict(wrapper, conn=conn, data_source=ds)
+        return find_dict(
+            wrapper,
+            conn=conn,
+            data_source=ds,
+            cache=self._result_cache,
+            identity_map=self._identity_maps.get(conn) if conn is not None else None,
+        )
 
     def list(
         self,
         wrapper: QueryWrapper[T],
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> List[T]:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return list_obj(wrapper, conn=conn, data_source=ds)
+        return list_obj(wrapper, conn=conn, data_source=ds, cache=self._result_cache)
 
     def list_dict(
         self,
         wrapper: QueryWrapper[T],
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> List[Dict[str, Any]]:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return list_dict(wrapper, conn=conn, data_source=ds)
+        return list_dict(wrapper, conn=conn, data_source=ds, cache=self._result_cache)
+
+    def list_tuples(
+        self,
+        wrapper: QueryWrapper[T],
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+    ) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        """
+        查询并以元组返回结果，不为每行构造字典，适合大结果集的只读处理
+
+        Returns:
+            (列名, 每行的值)，值的顺序与列名一致
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return list_tuples(wrapper, conn=conn, data_source=ds, cache=self._result_cache)
+
+    def list_columns(
+        self,
+        wrapper: QueryWrapper[T],
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+    ) -> ColumnarResult:
+        """
+        查询并按列返回结果，整数和浮点数列使用 array.array 存储，可通过 to_numpy 导出
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return list_columns(wrapper, conn=conn, data_source=ds, cache=self._result_cache)
+
+    def list_lazy(
+        self,
+        wrapper: QueryWrapper[T],
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+    ) -> LazyResultSet:
+        """
+        查询并返回延迟构造的结果集，行以 RowProxy 访问，支持 row["field"] 和 row.field。
+        适合宽表只读取少数几列的场景，需要实体时调用 to_entities
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return list_lazy(wrapper, conn=conn, data_source=ds, cache=self._result_cache)
+
+    def loader(
+        self,
+        cls: Type[T],
+        key: str | None = None,
+        max_batch_size: int = 100,
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+    ) -> Loader[T]:
+        """
+        创建按键批量加载实体的 Loader，多次 load 合并为 WHERE key IN (...) 查询
+
+        Args:
+            cls: 实体类
+            key: 作为键的字段，默认为主键
+            max_batch_size: 单条 IN 查询的最大键数
+        """
+        key_field = key or get_entity_meta(cls).primary_key
+        if key_field is None:
+            raise ValueError(f"key is required for entity [{cls}] without primary key")
+        self.qw(cls).check_field(key_field)
+        return Loader[T](
+            lambda keys: self.list(self.qw(cls).in_(key_field, keys), conn=conn, data_source_id=data_source_id),
+            key_field,
+            max_batch_size,
+        )
+
+    @contextmanager
+    def batch(self, conn: ReusableConnection | None = None, data_source_id="default") -> Iterator[Batch]:
+        """
+        批量执行互不依赖的查询、计数、更新和删除，退出 with 块时一次执行，结果从各语句返回的 BatchFuture 获取。
+        数据源开启 multi_statements 时所有语句在一次往返中发送
+
+        with dorm.batch() as batch:
+            user = batch.find(dorm.qw(User).eq("id", 1))
+            total = batch.count(dorm.qw(Order).eq("user_id", 1))
+        print(user.get(), total.get())
+
+        某条语句失败时之后的语句不执行，with 块抛出该异常，失败语句之后的 BatchFuture 为 BatchAbortedException
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        batch = Batch(ds, conn)
+        yield batch
+        try:
+            batch.execute()
+        finally:
+            for table, keys in batch.get_writes():
+                self._after_write(data_source_id, table, conn, keys)
+
+    def iter(
+        self,
+        wrapper: QueryWrapper[T],
+        batch_size: int = 1000,
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+    ) -> Iterator[T]:
+        """
+        流式查询，使用服务端游标逐行返回实体，内存占用与结果集大小无关。
+        未遍历完就关闭生成器时，自行获取的连接会被废弃而不是读完剩余结果。
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return iter_obj(wrapper, batch_size, conn=conn, data_source=ds)
+
+    def iter_dict(
+        self,
+        wrapper: QueryWrapper[T],
+        batch_size: int = 1000,
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+    ) -> Iterator[Dict[str, Any]]:
+        """流式查询，逐行返回字典，参见 iter"""
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return iter_dict(wrapper, batch_size, conn=conn, data_source=ds)
 
     def page(
         self,
         wrapper: QueryWrapper[T],
         current: int,
         page_size: int,
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
+        consistent: bool = False,
     ) -> Tuple[List[T], int]:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return page_obj(wrapper, conn=conn, data_source=ds, current=current, page_size=page_size)
+        return page_obj(wrapper, conn=conn, data_source=ds, current=current, page_size=page_size, consistent=consistent)
 
     def page_dict(
         self,
         wrapper: QueryWrapper[T],
         current: int,
         page_size: int,
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
+        consistent: bool = False,
     ) -> Tuple[List[Dict[str, Any]], int]:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return page_dict(wrapper, conn=conn, data_source=ds, current=current, page_size=page_size)
+        return page_dict(wrapper, conn=conn, data_source=ds, current=current, page_size=page_size, consistent=consistent)
+
+    def page_after(
+        self,
+        wrapper: QueryWrapper[T],
+        after: str | None = None,
+        size: int = 10,
+        with_count: bool = False,
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+        consistent: bool = False,
+    ) -> Tuple[List[T], str | None, int | None]:
+        """
+        键集分页，每页的查询代价与页码无关
+
+        Args:
+            wrapper: 查询条件，分页键取自 asc/desc 指定的排序字段
+            after: 上一页返回的游标，None 表示第一页
+            size: 每页条数
+            with_count: 是否同时查询总数
+            consistent: autocommit 读模式下，是否在同一事务中查询总数和数据
+
+        Returns:
+            (当前页数据, 下一页游标, 总数)，没有下一页时游标为 None，未查询总数时总数为 None
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return page_after_obj(wrapper, after, size, with_count, conn=conn, data_source=ds, consistent=consistent)
+
+    def page_after_dict(
+        self,
+        wrapper: QueryWrapper[T],
+        after: str | None = None,
+        size: int = 10,
+        with_count: bool = False,
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+        consistent: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], str | None, int | None]:
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return page_after_dict(wrapper, after, size, with_count, conn=conn, data_source=ds, consistent=consistent)
 
     def count(
-        self, wrapper: QueryWrapper[T], conn: ReusableMysqlConnection | None = None, data_source_id="default"
+        self, wrapper: QueryWrapper[T], conn: ReusableConnection | None = None, data_source_id="default"
     ) -> int:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return count(wrapper, conn=conn, data_source=ds)
+        return count(wrapper, conn=conn, data_source=ds, cache=self._result_cache)
 
     def insert(
         self,
         cls: Type[T],
         data: Dict[str, Any] | T,
         duplicate_key_update: List[str] | Literal["all"] | None = None,
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> Tuple[int, int]:
         ds = self._dss.get(data_source_id)
@@ -136,85 +371,145 @@ class Dorm:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
         wrapper = InsertWrapper[T](cls)
         dict_data: Dict[str, Any] = data if isinstance(data, Dict) else asdict(data)
-        return insert(wrapper, dict_data, duplicate_key_update, conn=conn, data_source=ds)
+        result = insert(wrapper, dict_data, duplicate_key_update, conn=conn, data_source=ds)
+        self._after_write(data_source_id, wrapper.get_table(), conn)
+        return result
 
     def insert_bulk(
         self,
         cls: Type[T],
         data: List[Dict[str, Any]],
         duplicate_key_update: List[str] | Literal["all"] | None = None,
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
+        chunk_rows: int = 1000,
+        max_packet_bytes: int | None = None,
+        commit_per_chunk: bool = False,
+        on_progress: Callable[[int, int, int], None] | None = None,
     ) -> int:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
 
         wrapper = InsertWrapper[T](cls)
-        return insert_bulk(wrapper, data, duplicate_key_update, conn=conn, data_source=ds)
+        try:
+            return insert_bulk(
+                wrapper,
+                data,
+                duplicate_key_update,
+                conn=conn,
+                data_source=ds,
+                chunk_rows=chunk_rows,
+                max_packet_bytes=max_packet_bytes,
+                commit_per_chunk=commit_per_chunk,
+                on_progress=on_progress,
+            )
+        finally:
+            # 按块提交时部分数据可能已写入，失败也需要失效
+            self._after_write(data_source_id, wrapper.get_table(), conn)
+
+    def bulk_load(
+        self,
+        cls: Type[T],
+        rows: Iterable[Dict[str, Any] | Sequence[Any]],
+        columns: Sequence[str] | None = None,
+        duplicate: Literal["ignore", "replace"] | None = None,
+        conn: ReusableConnection | None = None,
+        data_source_id="default",
+        chunk_rows: int = 500_000,
+        commit_per_chunk: bool = False,
+    ) -> int:
+        """
+        通过 LOAD DATA LOCAL INFILE 快速导入大量数据，数据源需要配置 local_infile: true
+
+        Args:
+            cls: 实体类
+            rows: 字典或元组组成的可迭代对象，可以是生成器
+            columns: 列名，元组数据默认按实体字段顺序
+            duplicate: 主键冲突时的处理方式，ignore 跳过，replace 覆盖
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+
+        wrapper = InsertWrapper[T](cls)
+        try:
+            return bulk_load(
+                wrapper,
+                rows,
+                columns,
+                duplicate,
+                conn=conn,
+                data_source=ds,
+                chunk_rows=chunk_rows,
+                commit_per_chunk=commit_per_chunk,
+            )
+        finally:
+            self._after_write(data_source_id, wrapper.get_table(), conn)
 
     def update(
         self,
         wrapper: UpdateWrapper[T],
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> int:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return update(wrapper, conn=conn, data_source=ds)
+        result = update(wrapper, conn=conn, data_source=ds)
+        self._after_write(data_source_id, wrapper.get_table(), conn, wrapper.get_key_values())
+        return result
 
     def delete(
         self,
         wrapper: DeleteWrapper[T],
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> int:
         ds = self._dss.get(data_source_id)
         if ds is None:
             raise ValueError(f"Data source with ID '{data_source_id}' not found")
-        return delete(wrapper, conn=conn, data_source=ds)
+        result = delete(wrapper, conn=conn, data_source=ds)
+        self._after_write(data_source_id, wrapper.get_table(), conn, wrapper.get_key_values())
+        return result
 
     def raw_query(
         self,
         sql: str,
         args: tuple[Any, ...],
-        conn: ReusableMysqlConnection | None = None,
+        conn: ReusableConnection | None = None,
         data_source_id="default",
     ) -> List[Dict[str, Any]]:
         raw_query_id = generate_random_string("raw-query-", 10)
 
-        sql = sql.replace("?", "%s")
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        with instrument("raw_query", ds):
+            if conn is not None:
+                # 原始SQL可能修改任意表，清空事务内实体缓存
+                identity_map = self._identity_maps.get(conn)
+                if identity_map is not None:
+                    identity_map.clear()
+                return ds.get_executor().select_many(conn, sql, args)
 
-        if conn is None:
-            ds = self._dss.get(data_source_id)
-            if ds is None:
-                raise ValueError(f"Data source with ID '{data_source_id}' not found")
             new_conn = ds.get_reusable_connection()
             try:
                 new_conn.acquire(operation_id=raw_query_id)
                 new_conn.begin()
-                cursor: DictCursor = new_conn.cursor()
-                result = cursor.execute(sql, args)
-                if result is None:
-                    return []
-                rows = cursor.fetchall()
-                if rows is None:
-                    return []
-                return list(rows)
+                rows = ds.get_executor().select_many(new_conn, sql, args)
+                new_conn.commit()
+                return rows
             finally:
                 new_conn.release(operation_id=raw_query_id)
-        else:
-            cursor: DictCursor = conn.cursor()
-            result = cursor.execute(sql, args)
-            if result is None:
-                return []
-            rows = cursor.fetchall()
-            if rows is None:
-                return []
-            return list(rows)
-
-    def begin(self, data_source_id="default") -> ReusableMysqlConnection:
+
+    def begin(self, data_source_id="default") -> ReusableConnection:
+        """
+        开启事务并返回连接，传给其他方法的 conn 参数以在同一事务中执行。
+
+        事务内按主键的 find 会缓存整行，同一主键再次查询时不访问数据库；通过该连接的写入会移除受影响的行，
+        提交或回滚时丢弃
+        """
         self._tx_id = generate_random_string("tx-", 10)
 
         data_source = self._dss.get(data_source_id)
@@ -224,27 +519,36 @@ class Dorm:
         conn.acquire(operation_id=self._tx_id)
         try:
             conn.begin()
+            self._identity_maps[conn] = IdentityMap()
             return conn
         except Exception as e:
             logger.error(f"Failed to begin transaction on data source '{data_source_id}': {e}")
             conn.release(operation_id=self._tx_id)
             raise e
 
-    def commit(self, conn: ReusableMysqlConnection):
+    def commit(self, conn: ReusableConnection):
         if conn is None:
             raise RuntimeError("No connection to commit")
         try:
+            self._identity_maps.pop(conn, None)
             conn.commit()
+            data_source = self._dss.get(conn.get_data_source_id())
+            if data_source is not None:
+                data_source.mark_write()
+            for table in self._pending_tables.pop(conn, ()):
+                self._after_write(conn.get_data_source_id(), table)
         except Exception as e:
             logger.error(f"Failed to commit transaction: {e}")
             raise e
         finally:
             conn.release(operation_id=self._tx_id)
 
-    def rollback(self, conn: ReusableMysqlConnection):
+    def rollback(self, conn: ReusableConnection):
         if conn is None:
             raise RuntimeError("No connection to rollback")
         try:
+            self._pending_tables.pop(conn, None)
+            self._identity_maps.pop(conn, None)
             conn.rollback()
         except Exception as e:
             logger.error(f"Failed to rollback transaction: {e}")
@@ -256,17 +560,152 @@ class Dorm:
         self,
         data_source_id: str,
         dialect: str,
-        host: str,
-        port: int,
-        user: str,
-        password: str,
-        database: str,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        database: str | None = None,
         **options: Any,
     ):
         self._dss.add_datasource(data_source_id, dialect, host, port, user, password, database, **options)
 
+    def register_dialect(self, dialect: str, data_source_type: Callable[..., DataSource]):
+        """
+        注册自定义方言，需要在 init 之前调用
+
+        Args:
+            dialect: 配置中 dialect 的取值
+            data_source_type: 实现 protocols.DataSource 的数据源类型
+        """
+        self._dss.register(dialect, data_source_type)
+
     def get_data_source(self, data_source_id="default"):
         return self._dss.get(data_source_id)
 
+    def sql_cache_stats(self) -> Dict[str, Any]:
+        return sql_cache.stats()
+
+    def configure_sql_log(self, config: Dict[str, Any] | None):
+        """
+        设置SQL日志策略，配置项与配置文件中的 sql_log 相同，为 None 时恢复默认（DEBUG 级别记录每条语句）
+        """
+        sql_log.configure(config)
+
+    def sql_log_stats(self) -> Dict[str, Any]:
+        return sql_log.stats()
+
+    def enable_result_cache(
+        self,
+        max_bytes: int = settings.result_cache_max_bytes,
+        ttl: float | None = None,
+        backend: Any = None,
+    ):
+        """
+        启用查询结果缓存，只缓存未传入 conn 的 find、list、count 等查询
+
+        Args:
+            max_bytes: 进程内缓存的最大字节数，指定 backend 时不生效
+            ttl: 默认缓存时间（秒），为 None 时只缓存定义了 __cache_ttl__ 的实体
+            backend: 实现 protocols.ResultCacheBackend 的存储后端，默认为进程内的LRU缓存
+        """
+        self._result_cache = ResultCache(backend if backend is not None else MemoryResultCacheBackend(max_bytes), ttl)
+
+    def disable_result_cache(self):
+        if self._result_cache is not None:
+            self._result_cache.clear()
+        self._result_cache = None
+
+    def invalidate_result_cache(self, cls: Type[T], data_source_id="default"):
+        """使实体所在表的缓存失效，用于 raw_query 或外部写入之后"""
+        if self._result_cache is not None:
+            self._result_cache.invalidate(data_source_id, self.qw(cls).get_table())
+
+    def result_cache_stats(self) -> Dict[str, Any]:
+        if self._result_cache is None:
+            return {}
+        return self._result_cache.stats()
+
+    def enable_statement_stats(self, max_statements: int = settings.statement_stats_max_size):
+        """
+        启用语句统计，按归一化的SQL汇总调用次数、耗时分位数、行数和失败次数，已启用时保留已有的统计
+
+        Args:
+            max_statements: 最多统计的语句结构数，超出后移除调用次数最少的
+        """
+        if self._statement_stats is not None:
+            return
+        self._statement_stats = StatementStats(max_statements)
+        use_query_listener(self._statement_stats)
+
+    def disable_statement_stats(self):
+        if self._statement_stats is not None:
+            remove_query_listener(self._statement_stats)
+        self._statement_stats = None
+
+    def stats(self, reset: bool = False) -> List[Dict[str, Any]]:
+        """
+        获取语句统计快照，按总耗时从高到低排序，未启用时返回空列表
+
+        Args:
+            reset: 是否在获取后清空统计
+        """
+        if self._statement_stats is None:
+            return []
+        return self._statement_stats.snapshot(reset)
+
+    def reset_stats(self):
+        if self._statement_stats is not None:
+            self._statement_stats.reset()
+
+    def stats_prometheus(self) -> str:
+        """以 Prometheus 文本格式导出语句统计，未启用时返回空字符串"""
+        if self._statement_stats is None:
+            return ""
+        return self._statement_stats.to_prometheus()
+
+    def pool_stats(self, data_source_id="default") -> Dict[str, Any]:
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return ds.get_pool_stats()
+
+    def slow_queries(self, data_source_id="default", clear: bool = False) -> List[Dict[str, Any]]:
+        """
+        获取数据源的慢查询记录，按时间从旧到新，需在数据源配置中开启 slow_query
+
+        每条记录包含 sql、args（参数摘要）、duration、stack（调用栈）、error，开启 explain 时还包含
+        explain_status、plan（执行计划）和 issues（如 full_table_scan:表名、filesort、temporary_table）
+
+        Args:
+            clear: 是否在获取后清空记录
+        """
+        ds = self._dss.get(data_source_id)
+        if ds is None:
+            raise ValueError(f"Data source with ID '{data_source_id}' not found")
+        return ds.get_slow_queries(clear)
+
+    def _after_write(
+        self,
+        data_source_id: str,
+        table: str,
+        conn: ReusableConnection | None = None,
+        keys: Tuple[Any, ...] | None = None,
+    ):
+        """
+        写入后使结果缓存失效，并从事务内实体缓存中移除受影响的行
+
+        Args:
+            keys: 写入涉及的主键值，为 None 时按整张表处理
+        """
+        if conn is not None:
+            identity_map = self._identity_maps.get(conn)
+            if identity_map is not None:
+                identity_map.evict(table, keys)
+        if self._result_cache is None:
+            return
+        self._result_cache.invalidate(data_source_id, table)
+        if conn is not None:
+            self._pending_tables.setdefault(conn, set()).add(table)
+
 
 dorm = Dorm()
@@ -0,0 +1,56 @@
+import threading
+import weakref
+from typing import Any, FrozenSet, Tuple, Type, get_type_hints
+
+
+class EntityMeta:
+    """
+    实体元数据，每个实体类只解析一次
+
+    元数据是注册表中的值，只弱引用实体类，实体类不再使用时与元数据一起回收
+    """
+
+    __slots__ = ("_entity_type", "table", "fields", "field_set", "primary_key", "__weakref__")
+
+    def __init__(self, entity_type: Type[Any]):
+        fields = tuple(field for field in get_type_hints(entity_type).keys() if not field.startswith("__"))
+
+        self._entity_type: "weakref.ref[Type[Any]]" = weakref.ref(entity_type)
+        self.table: str = entity_type.__table_name__
+        self.fields: Tuple[str, ...] = fields
+        self.field_set: FrozenSet[str] = frozenset(fields)
+        self.primary_key: str | None = getattr(entity_type, "__primary_key__", "id" if "id" in fields else None)
+
+        if self.primary_key is not None and self.primary_key not in self.field_set:
+            raise ValueError(f"primary key [{self.primary_key}] is not a field of entity [{entity_type}]")
+
+    @property
+    def entity_type(self) -> Type[Any]:
+        entity_type = self._entity_type()
+        if entity_type is None:
+            raise ReferenceError("entity type of the metadata has been garbage collected")
+        return entity_type
+
+
+_registry: "weakref.WeakKeyDictionary[type, EntityMeta]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def get_entity_meta(entity_type: Type[Any]) -> EntityMeta:
+    """
+    获取实体元数据，首次访问时解析并缓存
+
+    Args:
+        entity_type: 实体类
+
+    Returns:
+        实体元数据
+    """
+    meta = _registry.get(entity_type)
+    if meta is None:
+        with _lock:
+            meta = _registry.get(entity_type)
+            if meta is None:
+                meta = EntityMeta(entity_type)
+                _registry[entity_type] = meta
+    return meta
@@ -0,0 +1,130 @@
+import dataclasses
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Type, TypeVar
+
+from ._entity_meta import EntityMeta, get_entity_meta
+
+T = TypeVar("T")
+
+Hydrator = Callable[[Sequence[Any]], Any]
+
+# 标记由 compact 生成的实体类
+_COMPACT_FLAG = "__dorm_compact__"
+# 紧凑实体按列布局缓存的构造函数，保存在实体类上，构造函数引用实体类只形成可回收的循环引用
+_HYDRATORS = "__dorm_hydrators__"
+
+
+def compact(entity_type: Type[T]) -> Type[T]:
+    """
+    实体类装饰器，将实体转换为带 __slots__ 的 dataclass
+
+    紧凑实体的实例没有 __dict__，查询结果通过按列布局生成的构造函数按位置赋值，不经过关键字参数解析。
+    已是 dataclass 的类保留其 frozen、eq、order 等参数；也可以用于 get_model 返回的动态模型
+
+    Args:
+        entity_type: 实体类
+
+    Returns:
+        新的紧凑实体类，原类不受影响
+    """
+    if entity_type.__dict__.get(_COMPACT_FLAG):
+        return entity_type
+    if not dataclasses.is_dataclass(entity_type):
+        entity_type = dataclasses.dataclass(entity_type)
+
+    # 与 dataclass(slots=True) 相同，复制一份类并以字段作为 __slots__，字段的默认值已保存在生成的 __init__ 中
+    field_names = tuple(entity_field.name for entity_field in dataclasses.fields(entity_type))
+    namespace = {k: v for k, v in entity_type.__dict__.items() if k not in field_names}
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = field_names
+    namespace[_COMPACT_FLAG] = True
+    namespace[_HYDRATORS] = {}
+    if entity_type.__dataclass_params__.frozen:  # type: ignore[attr-defined]
+        # frozen 实体不能通过 __setattr__ 恢复状态，pickle 时需要自定义
+        namespace["__getstate__"] = _frozen_getstate
+        namespace["__setstate__"] = _frozen_setstate
+    return type(entity_type)(entity_type.__name__, entity_type.__bases__, namespace)
+
+
+def _frozen_getstate(self: Any) -> List[Any]:
+    return [getattr(self, name) for name in self.__slots__]
+
+
+def _frozen_setstate(self: Any, state: List[Any]) -> None:
+    for name, value in zip(self.__slots__, state):
+        object.__setattr__(self, name, value)
+
+
+def is_compact(entity_type: Type[Any]) -> bool:
+    return bool(entity_type.__dict__.get(_COMPACT_FLAG))
+
+
+def _build_hydrator(entity_type: Type[Any], meta: EntityMeta, columns: Tuple[str, ...]) -> Hydrator:
+    """生成按列位置为实体赋值的构造函数"""
+    positions: Dict[str, int] = {}
+    for index, column in enumerate(columns):
+        if column not in meta.field_set:
+            raise ValueError(f"column [{column}] is not a field of entity [{entity_type}]")
+        positions[column] = index
+
+    entity_fields = {entity_field.name: entity_field for entity_field in dataclasses.fields(entity_type)}
+    frozen = entity_type.__dataclass_params__.frozen  # type: ignore[attr-defined]
+    namespace: Dict[str, Any] = {"_new": object.__new__, "_cls": entity_type, "_setattr": object.__setattr__}
+    lines = ["def hydrate(row):", "    obj = _new(_cls)"]
+    for index, name in enumerate(meta.fields):
+        if name not in entity_fields:
+            continue
+        if name in positions:
+            value = f"row[{positions[name]}]"
+        elif entity_fields[name].default is not dataclasses.MISSING:
+            namespace[f"_default_{index}"] = entity_fields[name].default
+            value = f"_default_{index}"
+        elif entity_fields[name].default_factory is not dataclasses.MISSING:
+            namespace[f"_factory_{index}"] = entity_fields[name].default_factory
+            value = f"_factory_{index}()"
+        else:
+            raise ValueError(f"field [{name}] of entity [{entity_type}] is not selected and has no default")
+        if frozen:
+            lines.append(f"    _setattr(obj, {name!r}, {value})")
+        else:
+            lines.append(f"    obj.{name} = {value}")
+    lines.append("    return obj")
+
+    exec("\n".join(lines), namespace)
+    return namespace["hydrate"]
+
+
+def get_hydrator(entity_type: Type[T], columns: Tuple[str, ...]) -> Callable[[Sequence[Any]], T]:
+    """
+    获取紧凑实体在指定列布局下的构造函数，每个实体和列布局只生成一次
+
+    Args:
+        entity_type: 由 compact 生成的实体类
+        columns: 查询结果的列名，顺序与行中的值一致
+
+    Returns:
+        接收一行值并返回实体的函数
+    """
+    hydrators: Dict[Tuple[str, ...], Hydrator] = entity_type.__dict__[_HYDRATORS]
+    hydrator = hydrators.get(columns)
+    if hydrator is None:
+        hydrator = _build_hydrator(entity_type, get_entity_meta(entity_type), columns)
+        hydrators[columns] = hydrator
+    return hydrator
+
+
+def to_entity(entity_type: Type[T], row: Dict[str, Any]) -> T:
+    """将字典行转换为实体，紧凑实体使用生成的构造函数"""
+    if is_compact(entity_type):
+        return get_hydrator(entity_type, tuple(row))(tuple(row.values()))
+    return entity_type(**row)
+
+
+def to_entities(entity_type: Type[T], rows: Sequence[Dict[str, Any]]) -> List[T]:
+    """将同一查询的字典行批量转换为实体，紧凑实体只按首行的列布局获取一次构造函数"""
+    if len(rows) == 0:
+        return []
+    if is_compact(entity_type):
+        hydrate = get_hydrator(entity_type, tuple(rows[0]))
+        return [hydrate(tuple(row.values())) for row in rows]
+    return [entity_type(**row) for row in rows]
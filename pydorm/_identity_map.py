@@ -0,0 +1,62 @@
+from typing import Any, Dict, Sequence, Tuple
+
+
+class IdentityMap:
+    """
+    事务内的实体缓存，按 (表, 主键) 保存按主键查询到的整行
+
+    只在 dorm.begin() 返回的连接上使用，提交或回滚时丢弃；同一连接上的写入会按主键或按表移除对应的行
+    """
+
+    __slots__ = ("_rows", "_hits", "_misses")
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, table: str, key: Any) -> Dict[str, Any] | None:
+        """返回缓存行的副本，未缓存时返回 None"""
+        try:
+            row = self._rows.get((table, key))
+        except TypeError:
+            return None
+        if row is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return dict(row)
+
+    def put(self, table: str, key: Any, row: Dict[str, Any]) -> None:
+        try:
+            self._rows[(table, key)] = dict(row)
+        except TypeError:
+            pass
+
+    def evict(self, table: str, keys: Sequence[Any] | None = None) -> None:
+        """
+        移除缓存的行
+
+        Args:
+            table: 表名
+            keys: 主键值，为 None 时移除该表的全部行
+        """
+        if keys is None:
+            for cached in [cached for cached in self._rows if cached[0] == table]:
+                del self._rows[cached]
+            return
+        for key in keys:
+            try:
+                self._rows.pop((table, key), None)
+            except TypeError:
+                self.evict(table)
+                return
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self._hits, "misses": self._misses, "size": len(self._rows)}
+
+    def __len__(self) -> int:
+        return len(self._rows)
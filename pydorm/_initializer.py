@@ -1,5 +1,6 @@
 import yaml
 
+from ._async_dorm import async_dorm, AsyncDorm
 from ._dorm import dorm, Dorm
 
 
@@ -8,3 +9,10 @@ def init(path: str) -> Dorm:
         config_dict = yaml.load(f, Loader=yaml.FullLoader)
         dorm.init(config_dict)
     return dorm
+
+
+def init_async(path: str) -> AsyncDorm:
+    with open(path, 'r') as f:
+        config_dict = yaml.load(f, Loader=yaml.FullLoader)
+        async_dorm.init(config_dict)
+    return async_dorm
@@ -1,9 +1,9 @@
-from typing import Any, Dict, List, Literal, Tuple, TypeVar
+from typing import Any, Callable, Dict, List, Literal, Tuple, TypeVar
 
 from ._insert_wrapper import InsertWrapper
+from ._instrumentation import PHASE_BUILD, instrument
 from ._middlewares import before_insert_middlewares
-from .mysql._mysql_data_source import MysqlDataSource
-from .mysql._reusable_mysql_connection import ReusableMysqlConnection
+from .protocols import DataSource, ReusableConnection
 from .utils.random_utils import generate_random_string
 
 T = TypeVar("T", bound=Any)
@@ -13,59 +13,105 @@ def insert(
     wrapper: InsertWrapper[T],
     data: Dict[str, Any],
     duplicate_key_update: List[str] | Literal["all"] | None = None,
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
 ) -> Tuple[int, int]:
 
     if data_source is None:
         raise ValueError("data_source must be provided")
 
-    operation_id = generate_random_string("D-", 10)
+    with instrument("insert", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("D-", 10)
 
-    for middleware in before_insert_middlewares:
-        if callable(middleware):
-            middleware(data)
+        for middleware in before_insert_middlewares:
+            if callable(middleware):
+                middleware(data)
 
-    sql, args = wrapper.build_insert_sql(data, duplicate_key_update)
-    if conn is None:
-        new_conn = data_source.get_reusable_connection()
-        try:
-            new_conn.acquire(operation_id=operation_id)
-            new_conn.begin()
-            row_affected, last_row_id = data_source.get_executor().execute(new_conn, sql, args)
-            new_conn.commit()
-            return row_affected, last_row_id
-        finally:
-            new_conn.release(operation_id=operation_id)
-    return data_source.get_executor().execute(conn, sql, args)
+        sql, args = wrapper.compile_insert_sql(data, duplicate_key_update, data_source.get_sql_dialect())
+        if event is not None:
+            event.lap(PHASE_BUILD)
+        if conn is None:
+            new_conn = data_source.get_reusable_connection()
+            try:
+                new_conn.acquire(operation_id=operation_id)
+                new_conn.begin()
+                row_affected, last_row_id = data_source.get_executor().execute(new_conn, sql, args)
+                new_conn.commit()
+                data_source.mark_write()
+                return row_affected, last_row_id
+            finally:
+                new_conn.release(operation_id=operation_id)
+        row_affected, last_row_id = data_source.get_executor().execute(conn, sql, args)
+        data_source.mark_write()
+        return row_affected, last_row_id
 
 
 def insert_bulk(
     wrapper: InsertWrapper[T],
     data: List[Dict[str, Any]],
     duplicate_key_update: List[str] | Literal["all"] | None = None,
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    chunk_rows: int = 1000,
+    max_packet_bytes: int | None = None,
+    commit_per_chunk: bool = False,
+    on_progress: Callable[[int, int, int], None] | None = None,
 ) -> int:
+    """
+    批量插入，按行数和语句大小拆分为多条多行 VALUES 插入语句
+
+    Args:
+        chunk_rows: 每条语句最多的行数
+        max_packet_bytes: 每条语句的最大字节数，默认取服务端的 max_allowed_packet
+        commit_per_chunk: 是否每块提交一次，仅在未传入 conn 时生效，否则在最后统一提交
+        on_progress: 每块执行后回调 (块序号, 已插入行数, 总行数)
+    """
 
     if data_source is None:
         raise ValueError("data_source must be provided")
 
-    operation_id = generate_random_string("D-", 10)
+    if len(data) == 0:
+        return 0
+
+    with instrument("insert_bulk", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("D-", 10)
 
-    for middleware in before_insert_middlewares:
-        if callable(middleware):
-            middleware(data)
+        for middleware in before_insert_middlewares:
+            if callable(middleware):
+                middleware(data)
 
-    sql, args = wrapper.build_insert_bulk_sql(data, duplicate_key_update)
-    if conn is None:
-        new_conn = data_source.get_reusable_connection()
-        try:
-            new_conn.acquire(operation_id=operation_id)
-            new_conn.begin()
-            row_affected = data_source.get_executor().executemany(new_conn, sql, args)
-            new_conn.commit()
+        prefix, suffix, rows = wrapper.build_insert_values_sql(
+            data, duplicate_key_update, data_source.get_sql_dialect()
+        )
+        if event is not None:
+            event.lap(PHASE_BUILD)
+
+        def _insert_chunks(c: ReusableConnection, commit: bool) -> int:
+            packet_bytes = max_packet_bytes or data_source.get_max_allowed_packet(c) - 1024
+            row_affected = 0
+            rows_done = 0
+            chunks = data_source.get_executor().insert_values(c, prefix, suffix, rows, chunk_rows, packet_bytes)
+            for index, (row_count, chunk_affected) in enumerate(chunks):
+                row_affected += chunk_affected
+                rows_done += row_count
+                if commit:
+                    c.commit()
+                    c.begin()
+                if on_progress is not None:
+                    on_progress(index, rows_done, len(rows))
             return row_affected
-        finally:
-            new_conn.release(operation_id=operation_id)
-    return data_source.get_executor().executemany(conn, sql, args)
+
+        if conn is None:
+            new_conn = data_source.get_reusable_connection()
+            try:
+                new_conn.acquire(operation_id=operation_id)
+                new_conn.begin()
+                row_affected = _insert_chunks(new_conn, commit_per_chunk)
+                new_conn.commit()
+                data_source.mark_write()
+                return row_affected
+            finally:
+                new_conn.release(operation_id=operation_id)
+        row_affected = _insert_chunks(conn, False)
+        data_source.mark_write()
+        return row_affected
@@ -1,5 +1,8 @@
-from typing import Any, Dict, Generic, List, Literal, Tuple, Type, TypeVar, get_type_hints
-from .protocols import EntityProtocol
+from typing import Any, Dict, Generic, List, Literal, Sequence, Tuple, Type, TypeVar
+from ._entity_meta import get_entity_meta
+from ._sql_cache import CompiledSql, sql_cache
+from .mysql._mysql_dialect import mysql_dialect
+from .protocols import EntityProtocol, SqlDialect
 
 T = TypeVar("T", bound=EntityProtocol)
 
@@ -7,61 +10,172 @@ T = TypeVar("T", bound=EntityProtocol)
 class InsertWrapper(Generic[T]):
     def __init__(self, entity_type: Type[T]):
         self._entity_type = entity_type
-        self._table = entity_type.__table_name__
+        self._meta = get_entity_meta(entity_type)
+        self._table = self._meta.table
+        self._fields = self._meta.fields
 
-        fields = list(get_type_hints(entity_type).keys())
-        self._fields = [field for field in fields if not field.startswith("__")]
+    def get_type(self) -> Type[T]:
+        return self._entity_type
 
-    def build_insert_sql(
-        self, data: Dict[str, Any], duplicate_key_update: List[str] | Literal["all"] | None = None
-    ) -> Tuple[str, Tuple[Any, ...]]:
-        placeholder: List[str] = []
+    def get_table(self) -> str:
+        return self._table
+
+    def _filter_data(self, data: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
         keys: List[str] = []
         values: List[Any] = []
         for k, v in data.items():
-            if k in self._fields:
+            if k in self._meta.field_set:
                 if v is None:
                     continue
                 keys.append(k)
                 values.append(v)
-                placeholder.append("?")
 
         if len(keys) == 0:
             raise ValueError("no valid field found")
+        return keys, values
 
-        sql = f'INSERT INTO {self._table}({",".join(keys)}) VALUES({",".join(placeholder)})'
-        if duplicate_key_update is not None:
-            if isinstance(duplicate_key_update, str) and duplicate_key_update == "all":
-                sql += f' ON DUPLICATE KEY UPDATE {",".join([f"{k}=VALUES({k})" for k in keys])}'
-            elif len(duplicate_key_update) > 0:
-                sql += f' ON DUPLICATE KEY UPDATE {",".join([f"{k}=VALUES({k})" for k in duplicate_key_update])}'
+    def filter_columns(self, columns: Sequence[str] | None = None) -> List[str]:
+        """校验列名，未指定时使用实体的全部字段"""
+        if columns is None:
+            return list(self._meta.fields)
+        for column in columns:
+            if column not in self._meta.field_set:
+                raise ValueError(f"invalid field [{column}] in entity [{self._entity_type}]")
+        return list(columns)
 
-        args = tuple(values)
+    def get_bulk_keys(self, data: List[Dict[str, Any]]) -> List[str]:
+        keys = [k for k in data[0].keys() if k in self._meta.field_set]
+        if len(keys) == 0:
+            raise ValueError("no valid field found")
+        return keys
+
+    def _build_prefix(self, keys: List[str]) -> str:
+        return f'INSERT INTO {self._table}({",".join(keys)}) VALUES'
+
+    # noinspection PyMethodMayBeStatic
+    def _build_suffix(
+        self,
+        keys: List[str],
+        duplicate_key_update: List[str] | Literal["all"] | None = None,
+        dialect: SqlDialect = mysql_dialect,
+    ) -> str:
+        if duplicate_key_update is None:
+            return ""
+        if isinstance(duplicate_key_update, str) and duplicate_key_update == "all":
+            return dialect.upsert_clause(keys, keys)
+        elif len(duplicate_key_update) > 0:
+            return dialect.upsert_clause(keys, duplicate_key_update)
+        return ""
+
+    def _build_sql(
+        self,
+        keys: List[str],
+        duplicate_key_update: List[str] | Literal["all"] | None = None,
+        dialect: SqlDialect = mysql_dialect,
+    ) -> str:
+        return (
+            f'{self._build_prefix(keys)}({",".join(["?"] * len(keys))})'
+            f"{self._build_suffix(keys, duplicate_key_update, dialect)}"
+        )
+
+    @staticmethod
+    def _duplicate_key_update_shape(duplicate_key_update: List[str] | Literal["all"] | None) -> Any:
+        if duplicate_key_update is None or isinstance(duplicate_key_update, str):
+            return duplicate_key_update
+        return tuple(duplicate_key_update)
+
+    def build_insert_sql(
+        self, data: Dict[str, Any], duplicate_key_update: List[str] | Literal["all"] | None = None
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        keys, values = self._filter_data(data)
+        return self._build_sql(keys, duplicate_key_update), tuple(values)
 
-        return sql, args
+    def compile_insert_sql(
+        self,
+        data: Dict[str, Any],
+        duplicate_key_update: List[str] | Literal["all"] | None = None,
+        dialect: SqlDialect = mysql_dialect,
+    ) -> Tuple[CompiledSql, Tuple[Any, ...]]:
+        """生成使用驱动占位符的插入SQL，相同字段组合的语句只在第一次构建"""
+        keys, values = self._filter_data(data)
+        args = tuple(values)
+        shape = (
+            "insert",
+            dialect.name,
+            self._table,
+            tuple(keys),
+            self._duplicate_key_update_shape(duplicate_key_update),
+        )
+        return sql_cache.compile(
+            shape,
+            dialect.placeholder,
+            lambda: (self._build_sql(keys, duplicate_key_update, dialect), args),
+            lambda: args,
+        )
 
     def build_insert_bulk_sql(
         self,
         data: List[Dict[str, Any]],
         duplicate_key_update: List[str] | Literal["all"] | None = None,
     ) -> Tuple[str, List[Tuple[Any, ...]]]:
-        placeholder: List[str] = []
-        keys: List[str] = []
-        for k, _ in data[0].items():
-            if k in self._fields:
-                keys.append(k)
-                placeholder.append("?")
+        keys = self.get_bulk_keys(data)
+        args = [tuple(datum[k] for k in keys) for datum in data]
+        return self._build_sql(keys, duplicate_key_update), args
 
-        if len(keys) == 0:
-            raise ValueError("no valid field found")
+    def compile_insert_bulk_sql(
+        self,
+        data: List[Dict[str, Any]],
+        duplicate_key_update: List[str] | Literal["all"] | None = None,
+        dialect: SqlDialect = mysql_dialect,
+    ) -> Tuple[CompiledSql, List[Tuple[Any, ...]]]:
+        """生成使用驱动占位符的批量插入SQL，相同字段组合的语句只在第一次构建"""
+        keys = self.get_bulk_keys(data)
+        args = [tuple(datum[k] for k in keys) for datum in data]
+        shape = (
+            "insert",
+            dialect.name,
+            self._table,
+            tuple(keys),
+            self._duplicate_key_update_shape(duplicate_key_update),
+        )
+        return sql_cache.compile(
+            shape,
+            dialect.placeholder,
+            lambda: (self._build_sql(keys, duplicate_key_update, dialect), args),
+            lambda: args,
+        )
 
-        sql = f'INSERT INTO {self._table}({",".join(keys)}) VALUES({",".join(placeholder)})'
+    def build_insert_values_sql(
+        self,
+        data: List[Dict[str, Any]],
+        duplicate_key_update: List[str] | Literal["all"] | None = None,
+        dialect: SqlDialect = mysql_dialect,
+    ) -> Tuple[str, str, List[Tuple[Any, ...]]]:
+        """
+        生成多行 VALUES 插入语句的组成部分，由执行器按大小分块拼接
 
-        if duplicate_key_update is not None:
-            if isinstance(duplicate_key_update, str) and duplicate_key_update == "all":
-                sql += f' ON DUPLICATE KEY UPDATE {",".join([f"{k}=VALUES({k})" for k in keys])}'
-            elif len(duplicate_key_update) > 0:
-                sql += f' ON DUPLICATE KEY UPDATE {",".join([f"{k}=VALUES({k})" for k in duplicate_key_update])}'
+        Returns:
+            (INSERT ... VALUES 前缀, 主键冲突时的更新子句, 每行的参数)
+        """
+        keys = self.get_bulk_keys(data)
+        rows = [tuple(datum[k] for k in keys) for datum in data]
+        return self._build_prefix(keys), self._build_suffix(keys, duplicate_key_update, dialect), rows
 
-        args = [tuple(datum[k] for k in keys) for datum in data]
-        return sql, args
+    def build_load_data_sql(
+        self, keys: List[str], duplicate: Literal["ignore", "replace"] | None = None
+    ) -> str:
+        """
+        生成 LOAD DATA LOCAL INFILE 语句，文件名使用占位符，文件格式见 utils.tsv_utils
+
+        Args:
+            keys: 文件中各列对应的字段
+            duplicate: 主键冲突时的处理方式，ignore 跳过，replace 覆盖，None 使用服务端默认（LOCAL 模式下等同 ignore）
+        """
+        if duplicate is not None and duplicate not in ("ignore", "replace"):
+            raise ValueError(f"unsupported duplicate policy: {duplicate}")
+        policy = f" {duplicate.upper()}" if duplicate is not None else ""
+        return (
+            f"LOAD DATA LOCAL INFILE ?{policy} INTO TABLE {self._table} CHARACTER SET utf8mb4"
+            " FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n'"
+            f' ({",".join(keys)})'
+        )
@@ -0,0 +1,180 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+from .protocols import DataSource
+
+PHASE_BUILD = "build"
+PHASE_ACQUIRE = "acquire"
+PHASE_EXECUTE = "execute"
+PHASE_FETCH = "fetch"
+PHASE_HYDRATE = "hydrate"
+
+
+class QueryEvent:
+    """
+    一次操作的耗时和结果，操作结束后传给监听器
+
+    phases 为各阶段的耗时（秒）：build 生成SQL（含中间件），acquire 等待连接，execute 服务端执行，
+    fetch 读取结果，hydrate 构造实体。未计入任何阶段的时间为事务语句、缓存读写和连接归还等
+    """
+
+    __slots__ = (
+        "operation",
+        "data_source_id",
+        "table",
+        "sql",
+        "statements",
+        "phases",
+        "rows",
+        "row_affected",
+        "error",
+        "started_at",
+        "duration",
+        "_start",
+        "_last",
+    )
+
+    def __init__(self, operation: str, data_source_id: str | None, table: str | None):
+        self.operation = operation
+        self.data_source_id = data_source_id
+        self.table = table
+        # 第一条语句的SQL，参数为占位符，相同结构的语句SQL相同
+        self.sql: str | None = None
+        self.statements = 0
+        self.phases: Dict[str, float] = {}
+        self.rows = 0
+        self.row_affected = 0
+        self.error: BaseException | None = None
+        self.started_at = time.time()
+        self.duration = 0.0
+        self._start = time.perf_counter()
+        self._last = self._start
+
+    def lap(self, phase: str | None = None) -> None:
+        """将上次 lap 到现在的时间计入 phase，phase 为 None 时只开始计时"""
+        now = time.perf_counter()
+        if phase is not None:
+            self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def before_execute(self, sql: str) -> None:
+        self.lap()
+        if self.sql is None:
+            self.sql = str(sql)
+        self.statements += 1
+
+    def after_execute(self, row_affected: int = 0) -> None:
+        self.lap(PHASE_EXECUTE)
+        if row_affected > 0:
+            self.row_affected += row_affected
+
+    def after_fetch(self, rows: int) -> None:
+        self.lap(PHASE_FETCH)
+        self.rows += rows
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{k}={v * 1000:.3f}ms" for k, v in self.phases.items())
+        return (
+            f"QueryEvent({self.operation} [{self.data_source_id}] {self.table}, "
+            f"duration={self.duration * 1000:.3f}ms, {phases}, rows={self.rows}, row_affected={self.row_affected})"
+        )
+
+
+query_listeners: List[Callable[[QueryEvent], None]] = []
+
+_current_event: ContextVar[QueryEvent | None] = ContextVar("pydorm_query_event", default=None)
+
+# 执行器和连接通过当前上下文的事件记录耗时，没有进行中的操作时为 None
+current_event = _current_event.get
+
+
+def use_query_listener(listener: Callable[[QueryEvent], None]):
+    """注册监听器，每次查询、插入、更新、删除和 raw_query 结束后在执行线程中调用"""
+    query_listeners.append(listener)
+
+
+def remove_query_listener(listener: Callable[[QueryEvent], None]):
+    if listener in query_listeners:
+        query_listeners.remove(listener)
+
+
+class _NoopInstrument:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _JoinedInstrument:
+    """嵌套的操作计入外层事件"""
+
+    __slots__ = ("_event",)
+
+    def __init__(self, event: QueryEvent):
+        self._event = event
+
+    def __enter__(self) -> QueryEvent:
+        return self._event
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _Instrument:
+    __slots__ = ("_event", "_bind", "_token")
+
+    def __init__(self, event: QueryEvent, bind: bool):
+        self._event = event
+        self._bind = bind
+        self._token: Token | None = None
+
+    def __enter__(self) -> QueryEvent:
+        if self._bind:
+            self._token = _current_event.set(self._event)
+        return self._event
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, tb: Any) -> None:
+        event = self._event
+        event.duration = time.perf_counter() - event._start
+        # 提前关闭的流式查询不算失败
+        event.error = None if isinstance(exc, GeneratorExit) else exc
+        if self._token is not None:
+            _current_event.reset(self._token)
+        for listener in tuple(query_listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"query listener {listener} failed: {e}")
+
+
+_noop = _NoopInstrument()
+
+
+def instrument(
+    operation: str, data_source: DataSource | str | None, table: str | None = None, bind: bool = True
+) -> Any:
+    """
+    记录一次操作，with 返回事件，没有监听器时返回 None，开销只有一次列表判断
+
+    with instrument("find", data_source, table) as event:
+        ...
+        if event is not None:
+            event.lap(PHASE_BUILD)
+
+    Args:
+        bind: 是否设为当前上下文的事件，使连接和执行器记录各阶段耗时、嵌套的操作计入该事件。
+            生成器中 yield 后会回到调用方的代码，不能绑定
+    """
+    if not query_listeners:
+        return _noop
+    event = _current_event.get()
+    if bind and event is not None:
+        return _JoinedInstrument(event)
+    data_source_id = data_source if isinstance(data_source, str) or data_source is None else data_source.get_id()
+    return _Instrument(QueryEvent(operation, data_source_id, table), bind)
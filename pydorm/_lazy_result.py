@@ -0,0 +1,112 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Type, overload
+
+from ._hydrator import get_hydrator, is_compact
+
+
+class RowProxy(Mapping):
+    """
+    查询结果中一行的只读视图，按需从原始元组中取值
+
+    支持 row["nickname"] 和 row.nickname 两种访问方式，与字典行的用法一致；
+    列名与 keys、get 等方法同名时使用下标访问
+    """
+
+    __slots__ = ("_row", "_index")
+
+    def __init__(self, row: Tuple[Any, ...], index: Dict[str, int]):
+        self._row = row
+        self._index = index
+
+    def __getitem__(self, column: str) -> Any:
+        return self._row[self._index[column]]
+
+    def __getattr__(self, column: str) -> Any:
+        try:
+            return self._row[self._index[column]]
+        except KeyError:
+            raise AttributeError(f"row has no column [{column}]") from None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __repr__(self) -> str:
+        return f"RowProxy({self.to_dict()})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._index, self._row))
+
+
+class LazyResultSet(Sequence):
+    """
+    延迟构造的查询结果，保存原始元组行和共享的列索引
+
+    按下标或遍历时返回 RowProxy，只为实际访问的行创建轻量的视图对象，不为每行构造字典或实体
+    """
+
+    __slots__ = ("_entity_type", "_columns", "_index", "_rows")
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        rows: List[Tuple[Any, ...]],
+        entity_type: Type[Any] | None = None,
+        index: Dict[str, int] | None = None,
+    ):
+        self._entity_type = entity_type
+        self._columns: Tuple[str, ...] = tuple(columns)
+        self._index: Dict[str, int] = index if index is not None else {c: i for i, c in enumerate(self._columns)}
+        self._rows = rows
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self._columns
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, item: int) -> RowProxy: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> "LazyResultSet": ...
+
+    def __getitem__(self, item: int | slice) -> "RowProxy | LazyResultSet":
+        if isinstance(item, slice):
+            return LazyResultSet(self._columns, self._rows[item], self._entity_type, self._index)
+        return RowProxy(self._rows[item], self._index)
+
+    def __iter__(self) -> Iterator[RowProxy]:
+        index = self._index
+        for row in self._rows:
+            yield RowProxy(row, index)
+
+    def __repr__(self) -> str:
+        return f"LazyResultSet(columns={list(self._columns)}, rows={len(self._rows)})"
+
+    def column(self, column: str) -> List[Any]:
+        """返回一列的全部值"""
+        position = self._index[column]
+        return [row[position] for row in self._rows]
+
+    def rows(self) -> List[Tuple[Any, ...]]:
+        """返回原始元组行"""
+        return self._rows
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        columns = self._columns
+        return [dict(zip(columns, row)) for row in self._rows]
+
+    def to_entities(self) -> List[Any]:
+        """转换为实体列表，紧凑实体使用生成的构造函数"""
+        if self._entity_type is None:
+            raise ValueError("entity type is unknown for this result set")
+        if is_compact(self._entity_type):
+            hydrate = get_hydrator(self._entity_type, self._columns)
+            return [hydrate(row) for row in self._rows]
+        entity_type = self._entity_type
+        columns = self._columns
+        return [entity_type(**dict(zip(columns, row))) for row in self._rows]
@@ -0,0 +1,156 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Sequence, TypeVar
+
+T = TypeVar("T", bound=Any)
+
+
+def _chunks(keys: Sequence[Hashable], size: int) -> Iterable[List[Hashable]]:
+    for start in range(0, len(keys), size):
+        yield list(keys[start : start + size])
+
+
+class PendingLoad(Generic[T]):
+    """Loader.load 返回的待加载结果，首次调用 get 时一次性查询所有排队的键"""
+
+    __slots__ = ("_loader", "_key")
+
+    def __init__(self, loader: "Loader[T]", key: Hashable):
+        self._loader = loader
+        self._key = key
+
+    def get(self) -> T | None:
+        return self._loader.resolve(self._key)
+
+
+class Loader(Generic[T]):
+    """
+    按键批量加载实体，将多次 load 合并为 WHERE key IN (...) 查询，解决循环中逐条 find 的 N+1 问题
+
+    已加载的结果在 Loader 内缓存，不存在的键返回 None；Loader 不是线程安全的，应按请求创建
+    """
+
+    def __init__(self, fetch: Callable[[List[Hashable]], List[T]], key: str, max_batch_size: int = 100):
+        """
+        Args:
+            fetch: 按一批键查询实体
+            key: 实体中作为键的字段
+            max_batch_size: 单条 IN 查询的最大键数
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self._fetch = fetch
+        self._key = key
+        self._max_batch_size = max_batch_size
+        self._queue: Dict[Hashable, None] = {}
+        self._results: Dict[Hashable, T | None] = {}
+
+    def load(self, key: Hashable) -> PendingLoad[T]:
+        """将键加入队列，返回的 PendingLoad.get() 触发查询"""
+        if key not in self._results:
+            self._queue[key] = None
+        return PendingLoad(self, key)
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[T | None]:
+        """批量加载，结果与 keys 的顺序一致"""
+        keys = list(keys)
+        for key in keys:
+            self.load(key)
+        self.dispatch()
+        return [self._results.get(key) for key in keys]
+
+    def resolve(self, key: Hashable) -> T | None:
+        if key not in self._results:
+            self._queue[key] = None
+            self.dispatch()
+        return self._results.get(key)
+
+    def dispatch(self) -> None:
+        """查询所有排队的键"""
+        keys = [key for key in self._queue if key not in self._results]
+        self._queue.clear()
+        for chunk in _chunks(keys, self._max_batch_size):
+            found: Dict[Hashable, T] = {}
+            for entity in self._fetch(chunk):
+                found.setdefault(getattr(entity, self._key), entity)
+            for key in chunk:
+                self._results[key] = found.get(key)
+
+    def prime(self, key: Hashable, value: T | None) -> None:
+        """写入已知的结果"""
+        self._results[key] = value
+
+    def clear(self, key: Hashable | None = None) -> None:
+        """清除缓存的结果，key 为 None 时全部清除"""
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
+
+
+class AsyncLoader(Generic[T]):
+    """
+    Loader 的 asyncio 版本，同一轮事件循环中发起的 load 合并为一次查询
+
+    例如 await asyncio.gather(*(loader.load(i) for i in ids)) 只执行 len(ids) / max_batch_size 次查询
+    """
+
+    def __init__(
+        self, fetch: Callable[[List[Hashable]], Awaitable[List[T]]], key: str, max_batch_size: int = 100
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self._fetch = fetch
+        self._key = key
+        self._max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._results: Dict[Hashable, T | None] = {}
+        self._dispatch_task: asyncio.Task | None = None
+
+    async def load(self, key: Hashable) -> T | None:
+        if key in self._results:
+            return self._results[key]
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if self._dispatch_task is None:
+                # 任务在下一轮事件循环执行，本轮发起的 load 都会进入同一批
+                self._dispatch_task = loop.create_task(self._dispatch())
+        return await future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[T | None]:
+        """批量加载，结果与 keys 的顺序一致"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    async def _dispatch(self) -> None:
+        pending = self._pending
+        self._pending = {}
+        self._dispatch_task = None
+        for chunk in _chunks(list(pending), self._max_batch_size):
+            try:
+                entities = await self._fetch(chunk)
+            except Exception as e:
+                for key in chunk:
+                    if not pending[key].done():
+                        pending[key].set_exception(e)
+                continue
+            found: Dict[Hashable, T] = {}
+            for entity in entities:
+                found.setdefault(getattr(entity, self._key), entity)
+            for key in chunk:
+                value = found.get(key)
+                self._results[key] = value
+                if not pending[key].done():
+                    pending[key].set_result(value)
+
+    def prime(self, key: Hashable, value: T | None) -> None:
+        """写入已知的结果"""
+        self._results[key] = value
+
+    def clear(self, key: Hashable | None = None) -> None:
+        """清除缓存的结果，key 为 None 时全部清除"""
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
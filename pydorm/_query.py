@@ -1,9 +1,15 @@
-from typing import Any, Dict, List, Tuple, TypeVar
+from typing import Any, Dict, Iterator, List, Tuple, TypeVar
 
+from ._columnar_result import ColumnarResult
+from ._hydrator import get_hydrator, is_compact, to_entities, to_entity
+from ._identity_map import IdentityMap
+from ._instrumentation import PHASE_ACQUIRE, PHASE_BUILD, PHASE_HYDRATE, instrument
+from ._lazy_result import LazyResultSet
 from ._middlewares import before_query_middlewares
 from ._query_wrapper import QueryWrapper
-from .mysql._mysql_data_source import MysqlDataSource
-from .mysql._reusable_mysql_connection import ReusableMysqlConnection
+from ._result_cache import ResultCache
+from .protocols import DataSource, ReusableConnection
+from .utils.cursor_utils import decode_cursor, encode_cursor
 from .utils.random_utils import generate_random_string
 
 T = TypeVar("T", bound=Any)
@@ -11,175 +17,475 @@ T = TypeVar("T", bound=Any)
 
 def find(
     wrapper: QueryWrapper[T],
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    cache: ResultCache | None = None,
+    identity_map: IdentityMap | None = None,
 ) -> T | None:
-    result = find_dict(wrapper, conn, data_source)
-    if result is None:
-        return None
-    return wrapper.get_type()(**result)
+    with instrument("find", data_source, wrapper.get_table()) as event:
+        result = find_dict(wrapper, conn, data_source, cache, identity_map)
+        if result is None:
+            return None
+        if event is not None:
+            event.lap()
+        entity = to_entity(wrapper.get_type(), result)
+        if event is not None:
+            event.lap(PHASE_HYDRATE)
+        return entity
 
 
 def find_dict(
     wrapper: QueryWrapper[T],
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    cache: ResultCache | None = None,
+    identity_map: IdentityMap | None = None,
 ) -> Dict[str, Any] | None:
+    """
+    查询单条记录
 
+    Args:
+        identity_map: 传入 conn 时使用的事务内实体缓存，按主键查询整行时优先从中读取
+    """
     if data_source is None:
         raise ValueError("data_source must be provided")
 
-    operation_id = generate_random_string("R-", 10)
-
-    for middleware in before_query_middlewares:
-        if callable(middleware):
-            middleware(wrapper)
+    with instrument("find_dict", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("R-", 10)
 
-    sql, args = wrapper.build_sql()
+        for middleware in before_query_middlewares:
+            if callable(middleware):
+                middleware(wrapper)
 
-    if conn is None:
-        new_conn = data_source.get_reusable_connection()
-        try:
-            new_conn.acquire(operation_id=operation_id)
-            new_conn.begin()
-            result: Dict[str, Any] | None = data_source.get_executor().select_one(new_conn, sql, args)
-            new_conn.commit()
+        identity_key = wrapper.get_identity_key() if identity_map is not None and conn is not None else None
+        if identity_map is not None and identity_key is not None:
+            row = identity_map.get(wrapper.get_table(), identity_key)
+            if row is not None:
+                return row
+
+        sql, args = wrapper.compile_sql(data_source.get_placeholder())
+        if event is not None:
+            event.lap(PHASE_BUILD)
+
+        if conn is None:
+
+            def load() -> Dict[str, Any] | None:
+                new_conn = data_source.get_reusable_connection(for_read=True)
+                try:
+                    new_conn.acquire(operation_id=operation_id)
+                    new_conn.begin_read()
+                    result: Dict[str, Any] | None = data_source.get_executor().select_one(new_conn, sql, args)
+                    new_conn.end_read()
+                    return result
+                finally:
+                    new_conn.release(operation_id=operation_id)
+
+            if cache is None:
+                return load()
+            return cache.get_or_load(
+                data_source.get_id(), wrapper.get_type(), wrapper.get_table(), "one", sql, args, load
+            )
+        else:
+            result = data_source.get_executor().select_one(conn, sql, args)
+            if identity_map is not None and identity_key is not None and result is not None:
+                identity_map.put(wrapper.get_table(), identity_key, result)
             return result
-        finally:
-            new_conn.release(operation_id=operation_id)
-    else:
-        return data_source.get_executor().select_one(conn, sql, args)
 
 
 def list(
     wrapper: QueryWrapper[T],
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    cache: ResultCache | None = None,
 ) -> List[T]:
-    result = list_dict(wrapper, conn, data_source)
-    if result is None:
-        return []
-    return [wrapper.get_type()(**item) for item in result]
+    with instrument("list", data_source, wrapper.get_table()) as event:
+        entity_type = wrapper.get_type()
+        if is_compact(entity_type):
+            # 紧凑实体直接由元组行构造，不生成中间字典
+            columns, rows = list_tuples(wrapper, conn, data_source, cache)
+            if event is not None:
+                event.lap()
+            hydrate = get_hydrator(entity_type, columns)
+            entities = [hydrate(row) for row in rows]
+        else:
+            result = list_dict(wrapper, conn, data_source, cache)
+            if event is not None:
+                event.lap()
+            entities = [entity_type(**item) for item in result] if result else []
+        if event is not None:
+            event.lap(PHASE_HYDRATE)
+        return entities
 
 
 def list_dict(
     wrapper: QueryWrapper[T],
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    cache: ResultCache | None = None,
 ) -> List[Dict[str, Any]]:
     if data_source is None:
         raise ValueError("data_source must be provided")
 
-    operation_id = generate_random_string("R-", 10)
+    with instrument("list_dict", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("R-", 10)
 
-    for middleware in before_query_middlewares:
-        if callable(middleware):
-            middleware(wrapper)
+        for middleware in before_query_middlewares:
+            if callable(middleware):
+                middleware(wrapper)
 
-    sql, args = wrapper.build_sql()
-    if conn is None:
-        new_conn = data_source.get_reusable_connection()
-        try:
-            new_conn.acquire(operation_id=operation_id)
-            new_conn.begin()
-            result: List[Dict[str, Any]] | None = data_source.get_executor().select_many(new_conn, sql, args)
-            new_conn.commit()
-            return result
-        finally:
-            new_conn.release(operation_id=operation_id)
-    else:
-        return data_source.get_executor().select_many(conn, sql, args)
+        sql, args = wrapper.compile_sql(data_source.get_placeholder())
+        if event is not None:
+            event.lap(PHASE_BUILD)
+        if conn is None:
+
+            def load() -> List[Dict[str, Any]]:
+                new_conn = data_source.get_reusable_connection(for_read=True)
+                try:
+                    new_conn.acquire(operation_id=operation_id)
+                    new_conn.begin_read()
+                    result: List[Dict[str, Any]] | None = data_source.get_executor().select_many(new_conn, sql, args)
+                    new_conn.end_read()
+                    return result
+                finally:
+                    new_conn.release(operation_id=operation_id)
+
+            if cache is None:
+                return load()
+            return cache.get_or_load(
+                data_source.get_id(), wrapper.get_type(), wrapper.get_table(), "many", sql, args, load
+            )
+        else:
+            return data_source.get_executor().select_many(conn, sql, args)
+
+
+def list_tuples(
+    wrapper: QueryWrapper[T],
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    cache: ResultCache | None = None,
+) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+    if data_source is None:
+        raise ValueError("data_source must be provided")
 
+    with instrument("list_tuples", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("R-", 10)
 
-def count(
+        for middleware in before_query_middlewares:
+            if callable(middleware):
+                middleware(wrapper)
+
+        sql, args = wrapper.compile_sql(data_source.get_placeholder())
+        if event is not None:
+            event.lap(PHASE_BUILD)
+        if conn is None:
+
+            def load() -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+                new_conn = data_source.get_reusable_connection(for_read=True)
+                try:
+                    new_conn.acquire(operation_id=operation_id)
+                    new_conn.begin_read()
+                    result = data_source.get_executor().select_tuples(new_conn, sql, args)
+                    new_conn.end_read()
+                    return result
+                finally:
+                    new_conn.release(operation_id=operation_id)
+
+            if cache is None:
+                return load()
+            return cache.get_or_load(
+                data_source.get_id(), wrapper.get_type(), wrapper.get_table(), "tuples", sql, args, load
+            )
+        else:
+            return data_source.get_executor().select_tuples(conn, sql, args)
+
+
+def list_columns(
     wrapper: QueryWrapper[T],
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
-    load_middlewares: bool = True,
-) -> int:
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    cache: ResultCache | None = None,
+) -> ColumnarResult:
+    with instrument("list_columns", data_source, wrapper.get_table()) as event:
+        columns, rows = list_tuples(wrapper, conn, data_source, cache)
+        if event is not None:
+            event.lap()
+        result = ColumnarResult(columns, rows)
+        if event is not None:
+            event.lap(PHASE_HYDRATE)
+        return result
+
+
+def list_lazy(
+    wrapper: QueryWrapper[T],
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    cache: ResultCache | None = None,
+) -> LazyResultSet:
+    with instrument("list_lazy", data_source, wrapper.get_table()) as event:
+        columns, rows = list_tuples(wrapper, conn, data_source, cache)
+        if event is not None:
+            event.lap()
+        result = LazyResultSet(columns, rows, wrapper.get_type())
+        if event is not None:
+            event.lap(PHASE_HYDRATE)
+        return result
+
+
+def iter(
+    wrapper: QueryWrapper[T],
+    batch_size: int = 1000,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+) -> Iterator[T]:
+    entity_type = wrapper.get_type()
+    for row in iter_dict(wrapper, batch_size, conn, data_source):
+        yield to_entity(entity_type, row)
+
+
+def _count_rows(event: Any, sql: str, rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    if event is None:
+        yield from rows
+        return
+    event.before_execute(sql)
+    for row in rows:
+        event.rows += 1
+        yield row
+
+
+def iter_dict(
+    wrapper: QueryWrapper[T],
+    batch_size: int = 1000,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    流式查询
+
+    事件在遍历结束后发出，只记录 build 和 acquire 阶段，duration 包含调用方处理各行的时间
+    """
     if data_source is None:
         raise ValueError("data_source must be provided")
 
-    operation_id = generate_random_string("R-", 10)
+    with instrument("iter", data_source, wrapper.get_table(), bind=False) as event:
+        operation_id = generate_random_string("R-", 10)
 
-    if load_middlewares:
         for middleware in before_query_middlewares:
             if callable(middleware):
                 middleware(wrapper)
 
-    sql, args = wrapper.build_count_sql()
+        sql, args = wrapper.compile_sql(data_source.get_placeholder())
+        if event is not None:
+            event.lap(PHASE_BUILD)
+        if conn is None:
+            new_conn = data_source.get_reusable_connection(for_read=True)
+            try:
+                if event is not None:
+                    event.lap()
+                new_conn.acquire(operation_id=operation_id)
+                if event is not None:
+                    event.lap(PHASE_ACQUIRE)
+                new_conn.begin_read()
+                rows = data_source.get_executor().select_iter(
+                    new_conn, sql, args, batch_size, discard_on_close=True
+                )
+                yield from _count_rows(event, sql, rows)
+                new_conn.end_read()
+            finally:
+                new_conn.release(operation_id=operation_id)
+        else:
+            yield from _count_rows(event, sql, data_source.get_executor().select_iter(conn, sql, args, batch_size))
 
-    if conn is None:
-        new_conn = data_source.get_reusable_connection()
-        try:
-            new_conn.acquire(operation_id=operation_id)
-            new_conn.begin()
-            result = data_source.get_executor().select_one(new_conn, sql, args)
-            new_conn.commit()
 
+def count(
+    wrapper: QueryWrapper[T],
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    load_middlewares: bool = True,
+    cache: ResultCache | None = None,
+) -> int:
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    with instrument("count", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("R-", 10)
+
+        if load_middlewares:
+            for middleware in before_query_middlewares:
+                if callable(middleware):
+                    middleware(wrapper)
+
+        sql, args = wrapper.compile_count_sql(data_source.get_placeholder())
+        if event is not None:
+            event.lap(PHASE_BUILD)
+
+        if conn is None:
+
+            def load() -> int:
+                new_conn = data_source.get_reusable_connection(for_read=True)
+                try:
+                    new_conn.acquire(operation_id=operation_id)
+                    new_conn.begin_read()
+                    result = data_source.get_executor().select_one(new_conn, sql, args)
+                    new_conn.end_read()
+
+                    if result is None:
+                        return 0
+                    return result["COUNT(*)"]
+                finally:
+                    new_conn.release(operation_id=operation_id)
+
+            if cache is None:
+                return load()
+            return cache.get_or_load(
+                data_source.get_id(), wrapper.get_type(), wrapper.get_table(), "count", sql, args, load
+            )
+        else:
+            result = data_source.get_executor().select_one(conn, sql, args)
             if result is None:
                 return 0
             return result["COUNT(*)"]
-        finally:
-            new_conn.release(operation_id=operation_id)
-    else:
-        result = data_source.get_executor().select_one(conn, sql, args)
-        if result is None:
-            return 0
-        return result["COUNT(*)"]
 
 
 def page(
     wrapper: QueryWrapper[T],
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
     current: int = 1,
     page_size: int = 10,
+    consistent: bool = False,
 ) -> Tuple[List[T], int]:
     if data_source is None:
         raise ValueError("data_source must be provided")
 
-    rows, total = page_dict(wrapper, conn, data_source, current, page_size)
-    if rows is None:
-        return [], 0
-    return [wrapper.get_type()(**row) for row in rows], total
+    with instrument("page", data_source, wrapper.get_table()) as event:
+        rows, total = page_dict(wrapper, conn, data_source, current, page_size, consistent)
+        if rows is None:
+            return [], 0
+        if event is not None:
+            event.lap()
+        entities = to_entities(wrapper.get_type(), rows)
+        if event is not None:
+            event.lap(PHASE_HYDRATE)
+        return entities, total
 
 
 def page_dict(
     wrapper: QueryWrapper[T],
-    conn: ReusableMysqlConnection | None = None,
-    data_source: MysqlDataSource | None = None,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
     current: int = 1,
     page_size: int = 10,
+    consistent: bool = False,
 ) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    分页查询
+
+    Args:
+        consistent: 未传入 conn 时，是否在同一事务中执行 COUNT 和查询以保证结果一致。
+            transaction 读模式下总是一致
+    """
+    if data_source is None:
+        raise ValueError("data_source must be provided")
+
+    with instrument("page_dict", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("R-", 10)
+
+        for middleware in before_query_middlewares:
+            if callable(middleware):
+                middleware(wrapper)
+
+        wrapper.limit(page_size).offset((current - 1) * page_size)
+        sql, args = wrapper.compile_sql(data_source.get_placeholder())
+        if event is not None:
+            event.lap(PHASE_BUILD)
+
+        if conn is None:
+            new_conn = data_source.get_reusable_connection(for_read=True)
+            try:
+                new_conn.acquire(operation_id=operation_id)
+                new_conn.begin_read(consistent)
+                total = count(wrapper, new_conn, data_source, load_middlewares=False)
+                if total == 0:
+                    return [], total
+                rows = data_source.get_executor().select_many(new_conn, sql, args)
+                new_conn.end_read()
+                return rows, total
+            finally:
+                new_conn.release(operation_id=operation_id)
+
+        total = count(wrapper, conn, data_source, load_middlewares=False)
+        if total == 0:
+            return [], total
+        rows = data_source.get_executor().select_many(conn, sql, args)
+        return rows, total
+
+
+def page_after(
+    wrapper: QueryWrapper[T],
+    after: str | None = None,
+    size: int = 10,
+    with_count: bool = False,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    consistent: bool = False,
+) -> Tuple[List[T], str | None, int | None]:
+    with instrument("page_after", data_source, wrapper.get_table()) as event:
+        rows, next_cursor, total = page_after_dict(wrapper, after, size, with_count, conn, data_source, consistent)
+        if event is not None:
+            event.lap()
+        entities = to_entities(wrapper.get_type(), rows)
+        if event is not None:
+            event.lap(PHASE_HYDRATE)
+        return entities, next_cursor, total
+
+
+def page_after_dict(
+    wrapper: QueryWrapper[T],
+    after: str | None = None,
+    size: int = 10,
+    with_count: bool = False,
+    conn: ReusableConnection | None = None,
+    data_source: DataSource | None = None,
+    consistent: bool = False,
+) -> Tuple[List[Dict[str, Any]], str | None, int | None]:
     if data_source is None:
         raise ValueError("data_source must be provided")
 
-    operation_id = generate_random_string("R-", 10)
+    with instrument("page_after_dict", data_source, wrapper.get_table()) as event:
+        operation_id = generate_random_string("R-", 10)
 
-    for middleware in before_query_middlewares:
-        if callable(middleware):
-            middleware(wrapper)
+        for middleware in before_query_middlewares:
+            if callable(middleware):
+                middleware(wrapper)
 
-    wrapper.limit(page_size).offset((current - 1) * page_size)
-    sql, args = wrapper.build_sql()
+        wrapper.seek_page(decode_cursor(after) if after else None, size)
+        sql, args = wrapper.compile_sql(data_source.get_placeholder())
+        if event is not None:
+            event.lap(PHASE_BUILD)
 
-    if conn is None:
-        new_conn = data_source.get_reusable_connection()
-        try:
-            new_conn.acquire(operation_id=operation_id)
-            new_conn.begin()
-            total = count(wrapper, new_conn, data_source, load_middlewares=False)
+        def _query(c: ReusableConnection) -> Tuple[List[Dict[str, Any]], int | None]:
+            total = count(wrapper, c, data_source, load_middlewares=False) if with_count else None
             if total == 0:
                 return [], total
-            rows = data_source.get_executor().select_many(new_conn, sql, args)
-            new_conn.commit()
-            return rows, total
-        finally:
-            new_conn.release(operation_id=operation_id)
-
-    total = count(wrapper, conn, data_source, load_middlewares=False)
-    if total == 0:
-        return [], total
-    rows = data_source.get_executor().select_many(conn, sql, args)
-    return rows, total
+            return data_source.get_executor().select_many(c, sql, args), total
+
+        if conn is None:
+            new_conn = data_source.get_reusable_connection(for_read=True)
+            try:
+                new_conn.acquire(operation_id=operation_id)
+                new_conn.begin_read(consistent and with_count)
+                rows, total = _query(new_conn)
+                new_conn.end_read()
+            finally:
+                new_conn.release(operation_id=operation_id)
+        else:
+            rows, total = _query(conn)
+
+        next_cursor = None
+        if len(rows) == size:
+            last = rows[-1]
+            try:
+                next_cursor = encode_cursor(tuple(last[key] for key in wrapper.get_seek_keys()))
+            except KeyError as e:
+                raise ValueError(f"seek key {e} must be selected") from e
+        return rows, next_cursor, total
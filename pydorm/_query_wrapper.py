@@ -1,5 +1,9 @@
-from typing import Any, Generic, List, Type, TypeVar, get_type_hints
+from typing import Any, Generic, List, Sequence, Tuple, Type, TypeVar
 from pydorm._where import Or, Where
+from ._condition import Condition
+from ._entity_meta import get_entity_meta
+from ._sql_cache import CompiledSql, sql_cache
+from .enums import Operator
 from .protocols import EntityProtocol
 
 T = TypeVar("T", bound=EntityProtocol)
@@ -12,22 +16,26 @@ class QueryWrapper(Generic[T]):
     ):
 
         self._entity_type = entity_type
-        self._table = entity_type.__table_name__
+        self._meta = get_entity_meta(entity_type)
+        self._table = self._meta.table
 
         self._where = Where()
-        self._select_fields: List[str] = []
+        self._select_fields: Sequence[str] = []
         self._ignore_fields: List[str] = []
         self._order_by = None
         self._limit = None
         self._offset = None
         self._distinct = False
-
-        fields = list(get_type_hints(entity_type).keys())
-        self._fields = [field for field in fields if not field.startswith("__")]
+        self._seek_keys: Tuple[str, ...] = ()
+        self._seek_after: Tuple[Any, ...] | None = None
+        self._fields = self._meta.fields
 
     def get_type(self) -> Type[T]:
         return self._entity_type
 
+    def get_table(self) -> str:
+        return self._table
+
     def select(self, *select_fields: str, distinct: bool = False) -> "QueryWrapper[T]":
         for select_field in select_fields:
             self.check_field(select_field)
@@ -44,7 +52,7 @@ class QueryWrapper(Generic[T]):
         return self
 
     def check_field(self, field: str):
-        if not hasattr(self._entity_type, field):
+        if field not in self._meta.field_set:
             raise ValueError(f"invalid field [{field}] in entity [{self._entity_type}]")
 
     def eq(self, field: str, value: Any) -> "QueryWrapper[T]":
@@ -117,24 +125,148 @@ class QueryWrapper(Generic[T]):
         self._offset = offset
         return self
 
-    def build_sql(self) -> tuple[str, tuple[Any, ...]]:
-        if len(self._select_fields) == 0:
-            self._select_fields = self._fields
+    def seek_page(
+        self, after: Sequence[Any] | None, size: int, keys: Sequence[str] | None = None
+    ) -> "QueryWrapper[T]":
+        """
+        键集分页，查询排在 after 之后的 size 条记录
+
+        Args:
+            after: 上一页最后一行的分页键值，None 表示第一页
+            size: 每页条数
+            keys: 分页键，默认使用 asc/desc 指定的排序字段，分页键组合必须唯一
+        """
+        if keys is None:
+            if self._order_by is None:
+                raise ValueError("seek_page requires keys or an order by")
+            keys = [order.rsplit(" ", 1)[0] for order in self._order_by]
+            descending = self._order_by[0].endswith(" desc")
+        else:
+            descending = self._order_by is not None and self._order_by[0].endswith(" desc")
+        if len(keys) == 0:
+            raise ValueError("seek keys are required")
+        for key in keys:
+            self.check_field(key)
+        if after is not None and len(after) != len(keys):
+            raise ValueError(f"seek value count {len(after)} does not match keys {list(keys)}")
+
+        if descending:
+            self.desc(*keys)
+        else:
+            self.asc(*keys)
+        self._seek_keys = tuple(keys)
+        self._seek_after = tuple(after) if after is not None else None
+        self._limit = size
+        self._offset = None
+        return self
+
+    def get_seek_keys(self) -> Tuple[str, ...]:
+        return self._seek_keys
+
+    def get_identity_key(self) -> Any:
+        """
+        查询是否为按主键等值查询整行，用于事务内的实体缓存
+
+        Returns:
+            主键值，不是按主键查询整行时返回 None
+        """
+        if (
+            self._meta.primary_key is None
+            or self._select_fields
+            or self._ignore_fields
+            or self._distinct
+            or self._order_by is not None
+            or self._seek_after is not None
+            or self._offset is not None
+        ):
+            return None
+        conditions = self._where.tree().conditions
+        if len(conditions) != 1:
+            return None
+        condition = conditions[0]
+        if (
+            not isinstance(condition, Condition)
+            or condition.field != self._meta.primary_key
+            or condition.operator != Operator.EQ
+        ):
+            return None
+        return condition.value
+
+    def _build_seek(self) -> Tuple[str, Tuple[Any, ...]]:
+        operator = "<" if self._order_by is not None and self._order_by[0].endswith(" desc") else ">"
+        if len(self._seek_keys) == 1:
+            return f"{self._seek_keys[0]} {operator} ?", self._seek_after or ()
+        placeholder = ",".join(["?"] * len(self._seek_keys))
+        return f'({",".join(self._seek_keys)}) {operator} ({placeholder})', self._seek_after or ()
+
+    def _shape(self) -> Tuple[Any, ...]:
+        return (
+            "select",
+            self._table,
+            tuple(self._get_select_fields()),
+            tuple(self._ignore_fields),
+            self._distinct,
+            self._where.tree().shape(),
+            tuple(self._order_by) if self._order_by is not None else None,
+            self._seek_keys if self._seek_after is not None else None,
+            self._limit is not None,
+            self._offset is not None,
+        )
+
+    def _build_args(self) -> Tuple[Any, ...]:
+        args = self._where.tree().values()
+        if self._seek_after is not None:
+            args += self._seek_after
+        if self._limit is not None:
+            args += (self._limit,)
+        if self._offset is not None:
+            args += (self._offset,)
+        return args
 
-        select_fields = [field for field in self._select_fields if field not in self._ignore_fields]
+    def compile_sql(self, placeholder: str = "%s") -> Tuple[CompiledSql, Tuple[Any, ...]]:
+        """
+        生成使用驱动占位符的查询SQL，相同结构的语句只在第一次构建
 
-        sql = f'SELECT {"DISTINCT " if self._distinct and self._select_fields else ""}{",".join(select_fields)} FROM {self._table}'
+        Args:
+            placeholder: 驱动使用的占位符
+
+        Returns:
+            (SQL, 参数)
+        """
+        return sql_cache.compile(self._shape(), placeholder, self.build_sql, self._build_args)
+
+    def compile_count_sql(self, placeholder: str = "%s") -> Tuple[CompiledSql, Tuple[Any, ...]]:
+        shape = ("count", self._table, self._where.tree().shape())
+        return sql_cache.compile(shape, placeholder, self.build_count_sql, self._where.tree().values)
+
+    def _get_select_fields(self) -> Sequence[str]:
+        """未指定查询字段时为实体的全部字段，不修改包装器，以便复用时仍能识别为按主键查询整行"""
+        return self._select_fields if len(self._select_fields) > 0 else self._fields
+
+    def build_sql(self) -> tuple[str, tuple[Any, ...]]:
+        select_fields = [field for field in self._get_select_fields() if field not in self._ignore_fields]
+
+        sql = f'SELECT {"DISTINCT " if self._distinct else ""}{",".join(select_fields)} FROM {self._table}'
         args = ()
         tree = self._where.tree()
+        exps: List[str] = []
         if len(tree.conditions) > 0:
             exp, args = tree.parse()
-            sql += " WHERE " + exp
+            exps.append(exp)
+        if self._seek_after is not None:
+            exp, seek_args = self._build_seek()
+            exps.append(exp)
+            args += seek_args
+        if len(exps) > 0:
+            sql += " WHERE " + " and ".join(exps)
         if self._order_by is not None:
             sql += f' ORDER BY {",".join(self._order_by)}'
         if self._limit is not None:
-            sql += f" LIMIT {self._limit}"
+            sql += " LIMIT ?"
+            args += (self._limit,)
         if self._offset is not None:
-            sql += f" OFFSET {self._offset}"
+            sql += " OFFSET ?"
+            args += (self._offset,)
 
         return sql, args
 
@@ -0,0 +1,198 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Sequence, Set, Tuple, Type
+
+from . import settings
+from .protocols import ResultCacheBackend
+
+
+class MemoryResultCacheBackend:
+    """进程内的结果缓存后端，按值的字节数限制总大小并按LRU淘汰"""
+
+    def __init__(self, max_bytes: int = settings.result_cache_max_bytes):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (值, 过期时间, 标签)
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _remove(self, key: str) -> None:
+        value, _, tags = self._entries.pop(key)
+        self._bytes -= len(value)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if len(keys) == 0:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ttl: float, tags: Sequence[str]) -> None:
+        if len(value) > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tuple(tags))
+            self._bytes += len(value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._bytes > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, tags: Sequence[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def resize(self, max_bytes: int):
+        with self._lock:
+            self._max_bytes = max_bytes
+            while self._bytes > max(max_bytes, 0) and self._entries:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+class ResultCache:
+    """
+    查询结果缓存，键为 (数据源, 编译后的SQL, 参数)，值以 pickle 序列化保存，命中时返回副本
+
+    只缓存配置了 TTL 的实体：实体类的 __cache_ttl__ 属性（秒），或 ttl 作为所有实体的默认值。
+    通过 Dorm 写入表时按 数据源ID:表名 标签失效
+    """
+
+    def __init__(self, backend: ResultCacheBackend | None = None, ttl: float | None = None):
+        self._backend: ResultCacheBackend = backend if backend is not None else MemoryResultCacheBackend()
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        # 每个标签的失效次数，加载期间发生失效时不写入缓存，避免缓存失效前读到的旧结果
+        self._generations: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_backend(self) -> ResultCacheBackend:
+        return self._backend
+
+    def get_ttl(self, entity_type: Type[Any]) -> float | None:
+        ttl = getattr(entity_type, "__cache_ttl__", self._ttl)
+        return ttl if ttl is not None and ttl > 0 else None
+
+    @staticmethod
+    def make_tag(data_source_id: str, table: str) -> str:
+        return f"{data_source_id}:{table}"
+
+    def get_or_load(
+        self,
+        data_source_id: str,
+        entity_type: Type[Any],
+        table: str,
+        kind: str,
+        sql: str,
+        args: Any,
+        load: Callable[[], Any],
+    ) -> Any:
+        """
+        读取缓存，未命中时调用 load 查询并写入缓存
+
+        Args:
+            data_source_id: 数据源ID
+            entity_type: 实体类，用于确定 TTL
+            table: 查询的表，用于失效
+            kind: 结果的形式，相同SQL的不同形式分别缓存
+            sql: 编译后的SQL
+            args: 参数
+            load: 查询函数
+
+        Returns:
+            查询结果
+        """
+        ttl = self.get_ttl(entity_type)
+        if ttl is None:
+            return load()
+
+        key_source: Hashable = (data_source_id, kind, str(sql), args)
+        key = hashlib.blake2b(pickle.dumps(key_source, pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+        value = self._backend.get(key)
+        if value is not None:
+            with self._lock:
+                self._hits += 1
+            return pickle.loads(value)
+
+        tag = self.make_tag(data_source_id, table)
+        with self._lock:
+            self._misses += 1
+            generation = self._generations.get(tag, 0)
+        result = load()
+        value = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._generations.get(tag, 0) == generation:
+                self._backend.set(key, value, ttl, (tag,))
+        return result
+
+    def invalidate(self, data_source_id: str, table: str) -> None:
+        """使数据源中一张表的查询结果失效"""
+        tag = self.make_tag(data_source_id, table)
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            self._invalidations += 1
+        self._backend.invalidate([tag])
+
+    def clear(self) -> None:
+        self._backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            包含命中、未命中、命中率、失效次数及后端统计（大小、字节数、淘汰次数等）的字典
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            stats = {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / total if total else 0.0,
+                "invalidations": self._invalidations,
+            }
+        stats.update(self._backend.stats())
+        return stats
@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from . import settings
+
+
+class CompiledSql(str):
+    """已转换为驱动占位符的SQL，执行器不再做占位符替换"""
+
+    __slots__ = ()
+
+
+class SqlCache:
+    """按语句结构缓存编译后SQL的有界LRU缓存"""
+
+    def __init__(self, max_size: int = 1024):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CompiledSql]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def compile(
+        self,
+        key: Hashable,
+        placeholder: str,
+        build: Callable[[], Tuple[str, Any]],
+        build_args: Callable[[], Any],
+    ) -> Tuple[CompiledSql, Any]:
+        """
+        获取编译后的SQL
+
+        Args:
+            key: 语句结构，相同结构的语句只有参数不同
+            placeholder: 驱动使用的占位符
+            build: 未命中时生成 (使用?占位符的SQL, 参数)
+            build_args: 命中时只生成参数
+
+        Returns:
+            (编译后的SQL, 参数)
+        """
+        cache_key = (placeholder, key)
+        with self._lock:
+            sql = self._entries.get(cache_key)
+            if sql is not None:
+                self._entries.move_to_end(cache_key)
+                self._hits += 1
+        if sql is not None:
+            return sql, build_args()
+
+        raw_sql, args = build()
+        sql = CompiledSql(raw_sql.replace("?", placeholder) if placeholder != "?" else raw_sql)
+        with self._lock:
+            self._misses += 1
+            if self._max_size > 0:
+                self._entries[cache_key] = sql
+                if len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return sql, args
+
+    def resize(self, max_size: int):
+        with self._lock:
+            self._max_size = max_size
+            while len(self._entries) > max(max_size, 0):
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            包含命中、未命中、淘汰次数和当前大小的字典
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
+
+
+sql_cache = SqlCache(settings.sql_cache_max_size)
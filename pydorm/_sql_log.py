@@ -0,0 +1,238 @@
+import atexit
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from loguru import logger
+
+from . import settings
+
+_SEQUENCE_TYPES = (tuple, list, set, frozenset)
+
+_ARGS_MODES = ("off", "redact", "truncate")
+
+
+def summarize_args(args: Any, max_items: int = 10, max_length: int = 64) -> List[str] | None:
+    """参数摘要，每个参数转为 repr 并截断，序列参数只保留长度和前几项"""
+    if args is None:
+        return None
+    summary: List[str] = []
+    for arg in list(args)[:max_items]:
+        if isinstance(arg, _SEQUENCE_TYPES):
+            head = ", ".join(repr(item)[:max_length] for item in list(arg)[:3])
+            text = f"[{head}{', ...' if len(arg) > 3 else ''}] ({len(arg)} items)"
+        else:
+            text = repr(arg)
+            if len(text) > max_length:
+                text = f"{text[:max_length]}...({len(text)} chars)"
+        summary.append(text)
+    if len(args) > max_items:
+        summary.append(f"... ({len(args)} args)")
+    return summary
+
+
+def redact_args(args: Any, max_items: int = 10) -> List[str] | None:
+    """脱敏的参数摘要，只保留类型和长度"""
+    if args is None:
+        return None
+    summary: List[str] = []
+    for arg in list(args)[:max_items]:
+        if arg is None:
+            summary.append("None")
+        elif isinstance(arg, (str, bytes, bytearray) + _SEQUENCE_TYPES):
+            summary.append(f"<{type(arg).__name__}:{len(arg)}>")
+        else:
+            summary.append(f"<{type(arg).__name__}>")
+    if len(args) > max_items:
+        summary.append(f"... ({len(args)} args)")
+    return summary
+
+
+class SqlLogPolicy:
+    """
+    一个数据源的SQL日志策略
+
+    slow_ms 大于 0 时只记录执行时间不低于该值的语句，之后再按 sample_every 每 N 条记录一条
+    """
+
+    __slots__ = ("level", "sample_every", "slow", "args", "max_arg_length", "max_sql_length", "_counter")
+
+    def __init__(
+        self,
+        level: str | None = "DEBUG",
+        sample_every: int = 1,
+        slow_ms: float = 0,
+        args: str = "off",
+        max_arg_length: int = 64,
+        max_sql_length: int = 2000,
+    ):
+        """
+        Args:
+            level: loguru 的日志级别，为 None 或 off 时不记录
+            sample_every: 每 N 条语句记录一条
+            slow_ms: 只记录执行时间不低于该毫秒数的语句，0 为不限制
+            args: 参数的记录方式，off 不记录，redact 只记录类型和长度，truncate 记录截断后的值
+            max_arg_length: truncate 时每个参数的最大长度
+            max_sql_length: SQL的最大长度，超出部分截断
+        """
+        if sample_every <= 0:
+            raise ValueError("sample_every must be positive")
+        if args not in _ARGS_MODES:
+            raise ValueError(f"unsupported sql log args mode: {args}, expected one of {', '.join(_ARGS_MODES)}")
+        self.level = None if level is None or str(level).lower() == "off" else str(level).upper()
+        if self.level is not None:
+            try:
+                logger.level(self.level)
+            except ValueError:
+                raise ValueError(f"unsupported sql log level: {level}") from None
+        self.sample_every = sample_every
+        self.slow = slow_ms / 1000
+        self.args = args
+        self.max_arg_length = max_arg_length
+        self.max_sql_length = max_sql_length
+        self._counter = itertools.count()
+
+    def accept(self, duration: float | None) -> bool:
+        if self.level is None:
+            return False
+        if self.slow > 0 and (duration is None or duration < self.slow):
+            return False
+        return self.sample_every == 1 or next(self._counter) % self.sample_every == 0
+
+    def format(
+        self,
+        data_source_id: str,
+        conn_id: int,
+        sql: str,
+        args: Any,
+        duration: float | None,
+        error: BaseException | None,
+    ) -> str:
+        text = str(sql)
+        if len(text) > self.max_sql_length:
+            text = f"{text[:self.max_sql_length]}...({len(text)} chars)"
+        message = f"[{data_source_id}][{conn_id}] {text}"
+        if duration is not None:
+            message += f" | {duration * 1000:.3f}ms"
+        if self.args == "redact" and args is not None:
+            message += f" | args={redact_args(args)}"
+        elif self.args == "truncate" and args is not None:
+            message += f" | args={summarize_args(args, max_length=self.max_arg_length)}"
+        if error is not None:
+            message += f" | failed: {type(error).__name__}: {error}"
+        return message
+
+
+class SqlLog:
+    """
+    SQL日志，执行器只在队列中追加记录，由后台线程格式化后写入 loguru
+
+    队列满时丢弃新的记录，不阻塞执行线程。未配置的数据源使用默认策略，副本使用主库的策略
+    """
+
+    def __init__(self, max_queue_size: int = settings.sql_log_queue_size, flush_interval: float = 0.05):
+        self._default = SqlLogPolicy()
+        self._policies: Dict[str, SqlLogPolicy] = {}
+        self._resolved: Dict[str, SqlLogPolicy] = {}
+        self._max_queue_size = max_queue_size
+        self._flush_interval = flush_interval
+        self._records: Deque[Tuple[Any, ...]] = deque()
+        self._dropped = 0
+        self._emitted = 0
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+
+    def configure(self, config: Dict[str, Any] | None):
+        """
+        按配置设置日志策略
+
+        Args:
+            config: 默认策略的参数（见 SqlLogPolicy），queue_size 为队列长度，
+                data_sources 为各数据源的策略，未配置的项继承默认策略
+        """
+        config = dict(config or {})
+        data_sources: Dict[str, Dict[str, Any]] = config.pop("data_sources", None) or {}
+        max_queue_size = config.pop("queue_size", self._max_queue_size)
+        # 全部策略校验通过后再替换，配置有误时保留原来的策略
+        default = SqlLogPolicy(**config)
+        policies = {
+            data_source_id: SqlLogPolicy(**{**config, **(overrides or {})})
+            for data_source_id, overrides in data_sources.items()
+        }
+        self._max_queue_size = max_queue_size
+        self._default = default
+        self._policies = policies
+        self._resolved = {}
+
+    def get_policy(self, data_source_id: str) -> SqlLogPolicy:
+        policy = self._resolved.get(data_source_id)
+        if policy is None:
+            # 副本的 ID 为 主库ID:replica-N
+            policy = self._policies.get(data_source_id) or self._policies.get(
+                data_source_id.split(":", 1)[0], self._default
+            )
+            self._resolved[data_source_id] = policy
+        return policy
+
+    def emit(
+        self,
+        data_source_id: str,
+        conn_id: int,
+        sql: str,
+        args: Any,
+        duration: float | None = None,
+        error: BaseException | None = None,
+    ):
+        """
+        记录一条语句，未被采样或队列已满时直接返回，格式化在后台线程中进行
+
+        Args:
+            duration: 执行时间（秒），为 None 时表示执行前记录，配置了 slow_ms 的策略不记录
+        """
+        policy = self.get_policy(data_source_id)
+        if not policy.accept(duration):
+            return
+        if len(self._records) >= self._max_queue_size:
+            self._dropped += 1
+            return
+        self._records.append((policy, data_source_id, conn_id, sql, args, duration, error))
+        if self._worker is None:
+            self._start_worker()
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, name="pydorm-sql-log", daemon=True)
+            self._worker.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self.flush()
+            time.sleep(self._flush_interval)
+
+    def flush(self):
+        """将队列中的记录写入日志"""
+        records = self._records
+        with self._lock:
+            while records:
+                policy, data_source_id, conn_id, sql, args, duration, error = records.popleft()
+                try:
+                    logger.log(policy.level, policy.format(data_source_id, conn_id, sql, args, duration, error))
+                except Exception as e:
+                    logger.error(f"sql log failed: {e}")
+                self._emitted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._records),
+            "max_queue_size": self._max_queue_size,
+            "emitted": self._emitted,
+            "dropped": self._dropped,
+        }
+
+
+sql_log = SqlLog()
@@ -0,0 +1,251 @@
+import hashlib
+import math
+import re
+import threading
+from typing import Any, Dict, List, Tuple
+
+from . import settings
+from ._instrumentation import QueryEvent
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])(?:0x[0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_normalized: Dict[str, str] = {}
+_NORMALIZED_MAX_SIZE = 4096
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    将SQL归一化为语句结构：字面量和占位符替换为 ?，占位符列表（IN、多行 VALUES）折叠为 (...)，合并空白
+
+    相同结构、不同参数或不同 IN 列表长度的语句归一化后相同
+    """
+    normalized = _normalized.get(sql)
+    if normalized is not None:
+        return normalized
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    normalized = _REPEATED_LIST.sub("(...)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    if len(_normalized) >= _NORMALIZED_MAX_SIZE:
+        _normalized.clear()
+    _normalized[str(sql)] = normalized
+    return normalized
+
+
+class LatencyHistogram:
+    """
+    对数分桶的耗时直方图，桶的上下界之比为 growth，分位数的相对误差不超过 (growth - 1) / 2
+
+    只保存非空的桶，常见的耗时分布只占用几十个桶
+    """
+
+    __slots__ = ("_min", "_log_growth", "_growth", "_buckets", "_count")
+
+    def __init__(self, min_value: float = 1e-6, growth: float = 1.05):
+        self._min = min_value
+        self._growth = growth
+        self._log_growth = math.log(growth)
+        self._buckets: Dict[int, int] = {}
+        self._count = 0
+
+    def add(self, value: float) -> None:
+        index = int(math.log(value / self._min) / self._log_growth) if value > self._min else 0
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self._count += 1
+
+    def quantile(self, q: float) -> float:
+        """返回分位数所在桶的几何中点，没有数据时返回 0"""
+        if self._count == 0:
+            return 0.0
+        rank = q * self._count
+        seen = 0
+        index = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                break
+        return self._min * self._growth ** (index + 0.5)
+
+
+class _StatementEntry:
+    __slots__ = (
+        "data_source_id",
+        "operation",
+        "statement",
+        "calls",
+        "errors",
+        "total_time",
+        "max_time",
+        "rows",
+        "row_affected",
+        "histogram",
+    )
+
+    def __init__(self, data_source_id: str | None, operation: str, statement: str):
+        self.data_source_id = data_source_id
+        self.operation = operation
+        self.statement = statement
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.row_affected = 0
+        self.histogram = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        histogram = self.histogram
+        return {
+            "query_id": query_id(self.data_source_id, self.operation, self.statement),
+            "data_source": self.data_source_id,
+            "operation": self.operation,
+            "statement": self.statement,
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            # 分桶的近似值不超过实际的最大值
+            "p50": min(histogram.quantile(0.5), self.max_time),
+            "p95": min(histogram.quantile(0.95), self.max_time),
+            "p99": min(histogram.quantile(0.99), self.max_time),
+            "max_time": self.max_time,
+            "rows": self.rows,
+            "row_affected": self.row_affected,
+        }
+
+
+def query_id(data_source_id: str | None, operation: str, statement: str) -> str:
+    """语句结构的短标识，与 data_source、operation、statement 一一对应"""
+    source = f"{data_source_id}\0{operation}\0{statement}".encode("utf-8")
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
+
+
+class StatementStats:
+    """
+    按 (数据源, 操作, 归一化的SQL) 汇总的语句统计，类似 pg_stat_statements
+
+    作为 query listener 注册，记录每种语句结构的调用次数、总/平均/最大耗时、p50/p95/p99、行数和失败次数。
+    耗时为整个操作的耗时（含等待连接和构造实体），命中结果缓存、未访问数据库的操作不计入。
+    语句结构超过 max_statements 时移除调用次数最少的 5%
+    """
+
+    def __init__(self, max_statements: int = settings.statement_stats_max_size):
+        if max_statements <= 0:
+            raise ValueError("max_statements must be positive")
+        self._max_statements = max_statements
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str | None, str, str], _StatementEntry] = {}
+        self._evicted = 0
+
+    def __call__(self, event: QueryEvent) -> None:
+        if event.sql is None:
+            return
+        statement = normalize_sql(event.sql)
+        key = (event.data_source_id, event.operation, statement)
+        duration = event.duration
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self._max_statements:
+                    self._evict()
+                entry = _StatementEntry(event.data_source_id, event.operation, statement)
+                self._entries[key] = entry
+            entry.calls += 1
+            if event.error is not None:
+                entry.errors += 1
+            entry.total_time += duration
+            if duration > entry.max_time:
+                entry.max_time = duration
+            entry.rows += event.rows
+            entry.row_affected += event.row_affected
+            entry.histogram.add(duration)
+
+    def _evict(self) -> None:
+        count = max(1, len(self._entries) // 20)
+        for key in sorted(self._entries, key=lambda k: self._entries[k].calls)[:count]:
+            del self._entries[key]
+        self._evicted += count
+
+    def snapshot(self, reset: bool = False) -> List[Dict[str, Any]]:
+        """
+        获取统计快照，按总耗时从高到低排序
+
+        Args:
+            reset: 是否在获取后清空统计
+        """
+        with self._lock:
+            entries = [entry.to_dict() for entry in self._entries.values()]
+            if reset:
+                self._entries.clear()
+        entries.sort(key=lambda entry: entry["total_time"], reverse=True)
+        return entries
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._evicted = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "max_statements": self._max_statements, "evicted": self._evicted}
+
+    def to_prometheus(self, prefix: str = "pydorm_statement") -> str:
+        """以 Prometheus 文本格式导出统计，耗时为秒"""
+        entries = self.snapshot()
+        lines: List[str] = []
+
+        def metric(name: str, metric_type: str, help_text: str, samples: List[Tuple[Dict[str, Any], str, Any]]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for entry, suffix, value in samples:
+                labels = _labels(entry)
+                lines.append(f"{prefix}_{name}{suffix}{{{labels}}} {value}")
+
+        metric("calls_total", "counter", "Number of executions.", [(e, "", e["calls"]) for e in entries])
+        metric("errors_total", "counter", "Number of failed executions.", [(e, "", e["errors"]) for e in entries])
+        metric("rows_total", "counter", "Number of rows fetched.", [(e, "", e["rows"]) for e in entries])
+        metric(
+            "affected_rows_total", "counter", "Number of rows affected.", [(e, "", e["row_affected"]) for e in entries]
+        )
+        samples: List[Tuple[Dict[str, Any], str, Any]] = []
+        for e in entries:
+            samples.extend(
+                [
+                    ({**e, "quantile": "0.5"}, "", repr(e["p50"])),
+                    ({**e, "quantile": "0.95"}, "", repr(e["p95"])),
+                    ({**e, "quantile": "0.99"}, "", repr(e["p99"])),
+                    (e, "_sum", repr(e["total_time"])),
+                    (e, "_count", e["calls"]),
+                ]
+            )
+        metric("duration_seconds", "summary", "Execution time in seconds.", samples)
+        metric(
+            "max_duration_seconds",
+            "gauge",
+            "Maximum execution time in seconds.",
+            [(e, "", repr(e["max_time"])) for e in entries],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(entry: Dict[str, Any]) -> str:
+    labels = [
+        f'query_id="{entry["query_id"]}"',
+        f'data_source="{_escape_label(entry["data_source"])}"',
+        f'operation="{_escape_label(entry["operation"])}"',
+        f'statement="{_escape_label(entry["statement"])}"',
+    ]
+    if "quantile" in entry:
+        labels.append(f'quantile="{entry["quantile"]}"')
+    return ",".join(labels)
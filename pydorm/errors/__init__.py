@@ -1,3 +1,4 @@
+from ._batch_aborted_exception import BatchAbortedException
 from ._connection_exception import ConnectionException
 
-__all__ = ["ConnectionException"]
+__all__ = ["BatchAbortedException", "ConnectionException"]
@@ -0,0 +1,6 @@
+class BatchAbortedException(Exception):
+    """批量执行中之前的语句失败，该语句未执行"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
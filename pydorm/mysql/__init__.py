@@ -1,4 +1,15 @@
+from ._async_mysql_connection_pool import AsyncMysqlConnectionPool
+from ._async_mysql_data_source import AsyncMysqlDataSource
+from ._async_reusable_mysql_connection import AsyncReusableMysqlConnection
+from ._mysql_connection_pool import MysqlConnectionPool
 from ._mysql_data_source import MysqlDataSource
 from ._reusable_mysql_connection import ReusableMysqlConnection
 
-__all__ = ["MysqlDataSource", "ReusableMysqlConnection"]
+__all__ = [
+    "AsyncMysqlConnectionPool",
+    "AsyncMysqlDataSource",
+    "AsyncReusableMysqlConnection",
+    "MysqlConnectionPool",
+    "MysqlDataSource",
+    "ReusableMysqlConnection",
+]
@@ -0,0 +1,330 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict
+
+from loguru import logger
+from pymysql import MySQLError
+
+from ..errors import ConnectionException
+
+
+class AsyncPooledConnection:
+    """异步连接池中的物理连接及其元数据"""
+
+    __slots__ = ("raw", "created_at", "last_used_at", "broken")
+
+    def __init__(self, raw: Any):
+        self.raw: Any = raw
+        self.created_at: float = time.monotonic()
+        self.last_used_at: float = self.created_at
+        self.broken: bool = False
+
+
+class _AsyncWaiter:
+    __slots__ = ("future", "may_create")
+
+    def __init__(self, future: "asyncio.Future[AsyncPooledConnection | None]"):
+        self.future = future
+        self.may_create = False
+
+
+class AsyncMysqlConnectionPool:
+    """
+    基于 asyncio 的有界连接池
+
+    与 MysqlConnectionPool 的策略一致：FIFO 公平分配、借出时校验、统计等待耗时。
+    连接池绑定在首次使用它的事件循环上，空闲回收在借出和归还时顺带进行。
+    """
+
+    def __init__(
+        self,
+        data_source_id: str,
+        create_connection: Callable[[], Awaitable[Any]],
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float = 300,
+        max_lifetime: float = 3600,
+        acquire_timeout: float = 5,
+        validation_interval: float = 30,
+        **_: Any,
+    ):
+        """
+        初始化异步连接池
+
+        Args:
+            data_source_id: 数据源ID
+            create_connection: 创建物理连接的协程函数
+            min_size: 空闲回收时最少保留的连接数
+            max_size: 最大连接数
+            max_idle: 连接最大空闲秒数
+            max_lifetime: 连接最大存活秒数
+            acquire_timeout: 默认的获取连接超时秒数
+            validation_interval: 空闲超过该秒数的连接在借出前会先 ping 校验
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self._data_source_id = data_source_id
+        self._create_connection = create_connection
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_idle = max_idle
+        self._max_lifetime = max_lifetime
+        self._acquire_timeout = acquire_timeout
+        self._validation_interval = validation_interval
+
+        self._idle: Deque[AsyncPooledConnection] = deque()
+        self._waiters: Deque[_AsyncWaiter] = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+
+        self._acquire_count = 0
+        self._wait_count = 0
+        self._timeout_count = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._hold_time_ewma = 0.0
+        self._created_count = 0
+        self._closed_count = 0
+
+    @property
+    def acquire_timeout(self) -> float:
+        return self._acquire_timeout
+
+    @property
+    def hold_time_ewma(self) -> float:
+        return self._hold_time_ewma
+
+    def outstanding(self) -> int:
+        """借出和等待中的连接数"""
+        return self._in_use + len(self._waiters)
+
+    async def acquire(self, timeout: float | None = None) -> AsyncPooledConnection:
+        """
+        借出一个连接
+
+        Args:
+            timeout: 等待超时秒数，None 时使用连接池默认值
+
+        Returns:
+            借出的连接
+        """
+        if timeout is None:
+            timeout = self._acquire_timeout
+        if self._closed:
+            raise ConnectionException(f"[{self._data_source_id}] Connection pool is closed.")
+
+        start = time.monotonic()
+        self._evict_idle(start)
+
+        pooled: AsyncPooledConnection | None = None
+        create = False
+        if not self._waiters and self._idle:
+            pooled = self._idle.pop()
+        elif not self._waiters and self._size < self._max_size:
+            self._size += 1
+            create = True
+        else:
+            waiter = _AsyncWaiter(asyncio.get_running_loop().create_future())
+            self._waiters.append(waiter)
+            try:
+                pooled = await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            except asyncio.TimeoutError:
+                if not waiter.future.done():
+                    waiter.future.cancel()
+                    self._waiters.remove(waiter)
+                    self._timeout_count += 1
+                    raise ConnectionException(
+                        f"[{self._data_source_id}] Failed to acquire connection within {timeout} seconds."
+                    )
+                pooled = waiter.future.result()
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+            create = waiter.may_create
+            wait_time = time.monotonic() - start
+            self._wait_count += 1
+            self._total_wait_time += wait_time
+            if wait_time > self._max_wait_time:
+                self._max_wait_time = wait_time
+
+        self._acquire_count += 1
+        self._in_use += 1
+        try:
+            if create:
+                return await self._open()
+            assert pooled is not None
+            return await self._validate(pooled)
+        except BaseException:
+            self._in_use -= 1
+            raise
+
+    async def release(self, pooled: AsyncPooledConnection, hold_time: float | None = None):
+        """
+        归还连接
+
+        Args:
+            pooled: 借出的连接
+            hold_time: 本次借用时长，用于统计
+        """
+        now = time.monotonic()
+        pooled.last_used_at = now
+        self._in_use -= 1
+        if hold_time is not None:
+            self._hold_time_ewma = (
+                hold_time if self._hold_time_ewma == 0 else self._hold_time_ewma * 0.9 + hold_time * 0.1
+            )
+
+        discard = (
+            pooled.broken
+            or self._closed
+            or (self._max_lifetime > 0 and now - pooled.created_at > self._max_lifetime)
+        )
+        if discard:
+            self._size -= 1
+            self._hand_over_slot()
+            await self._close_raw(pooled)
+            return
+
+        self._put(pooled)
+
+    def _put(self, pooled: AsyncPooledConnection):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.future.done():
+                waiter.future.set_result(pooled)
+                return
+        self._idle.append(pooled)
+
+    def _abandon(self, waiter: _AsyncWaiter):
+        """等待中的任务被取消时，退还已经移交给它的连接或新建名额"""
+        if not waiter.future.done():
+            waiter.future.cancel()
+            self._waiters.remove(waiter)
+        elif waiter.may_create:
+            self._size -= 1
+            self._hand_over_slot()
+        else:
+            self._put(waiter.future.result())  # type: ignore
+
+    def _hand_over_slot(self):
+        """连接被丢弃后，允许最早的等待者新建连接"""
+        while self._waiters and self._size < self._max_size:
+            waiter = self._waiters.popleft()
+            if waiter.future.done():
+                continue
+            self._size += 1
+            waiter.may_create = True
+            waiter.future.set_result(None)
+            return
+
+    async def _open(self) -> AsyncPooledConnection:
+        try:
+            raw = await self._create_connection()
+        except Exception as e:
+            self._size -= 1
+            self._hand_over_slot()
+            raise ConnectionException(f"Failed to create connection: {e}")
+        self._created_count += 1
+        return AsyncPooledConnection(raw)
+
+    async def _validate(self, pooled: AsyncPooledConnection) -> AsyncPooledConnection:
+        now = time.monotonic()
+        expired = (self._max_lifetime > 0 and now - pooled.created_at > self._max_lifetime) or (
+            self._max_idle > 0 and now - pooled.last_used_at > self._max_idle
+        )
+        if not expired and now - pooled.last_used_at > self._validation_interval:
+            try:
+                await pooled.raw.ping(reconnect=False)
+            except MySQLError as e:
+                logger.warning(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] validation failed: {e}")
+                expired = True
+        if not expired:
+            return pooled
+
+        await self._close_raw(pooled)
+        try:
+            pooled.raw = await self._create_connection()
+        except Exception as e:
+            self._size -= 1
+            self._hand_over_slot()
+            raise ConnectionException(f"Failed to create connection: {e}")
+        pooled.created_at = time.monotonic()
+        pooled.last_used_at = pooled.created_at
+        pooled.broken = False
+        self._created_count += 1
+        return pooled
+
+    async def replace(self, pooled: AsyncPooledConnection):
+        """关闭并重建借出中的物理连接"""
+        old_conn_id = id(pooled.raw)
+        await self._close_raw(pooled)
+        try:
+            pooled.raw = await self._create_connection()
+        except Exception as e:
+            pooled.broken = True
+            logger.error(f"[{self._data_source_id}] Failed to recreate connection: {e}")
+            raise ConnectionException(f"Connection recreation failed: {e}")
+        pooled.created_at = time.monotonic()
+        pooled.broken = False
+        self._created_count += 1
+        logger.info(f"[{self._data_source_id}] Connection[{old_conn_id}] -> [{id(pooled.raw)}] recreated.")
+
+    def _evict_idle(self, now: float):
+        while len(self._idle) > self._min_size:
+            oldest = self._idle[0]
+            idle_too_long = self._max_idle > 0 and now - oldest.last_used_at > self._max_idle
+            if not idle_too_long:
+                return
+            self._idle.popleft()
+            self._size -= 1
+            oldest.raw.close()
+            self._closed_count += 1
+
+    async def _close_raw(self, pooled: AsyncPooledConnection):
+        try:
+            await pooled.raw.ensure_closed()
+            logger.info(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] closed.")
+        except Exception as e:
+            pooled.raw.close()
+            logger.warning(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] close failed: {e}")
+        self._closed_count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取连接池统计信息
+
+        Returns:
+            包含连接数、等待次数、等待耗时等指标的字典
+        """
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "waiting": len(self._waiters),
+            "min_size": self._min_size,
+            "max_size": self._max_size,
+            "acquire_count": self._acquire_count,
+            "wait_count": self._wait_count,
+            "timeout_count": self._timeout_count,
+            "total_wait_time": self._total_wait_time,
+            "avg_wait_time": self._total_wait_time / self._wait_count if self._wait_count else 0.0,
+            "max_wait_time": self._max_wait_time,
+            "hold_time_ewma": self._hold_time_ewma,
+            "created_count": self._created_count,
+            "closed_count": self._closed_count,
+        }
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        idle = list(self._idle)
+        self._idle.clear()
+        self._size -= len(idle)
+        for pooled in idle:
+            await self._close_raw(pooled)
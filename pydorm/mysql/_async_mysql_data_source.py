@@ -0,0 +1,173 @@
+import math
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from ._async_mysql_connection_pool import AsyncMysqlConnectionPool
+from ._mysql_dialect import MysqlDialect, mysql_dialect
+from ._async_mysql_executor import AsyncMysqlExecutor, async_mysql_executor
+from ._async_reusable_mysql_connection import AsyncReusableMysqlConnection
+from ._replica_set import ReplicaSet, build_replica_configs
+
+
+class AsyncMysqlDataSource:
+    """基于 aiomysql 的异步数据源"""
+
+    def __init__(
+        self,
+        data_source_id: str,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        database: str | None = None,
+        pool: Dict[str, Any] | None = None,
+        replicas: List[Dict[str, Any]] | None = None,
+        read_strategy: str = "round_robin",
+        read_your_writes: float = 1.0,
+        read_mode: str = "transaction",
+        **options: Any,
+    ):
+        """
+        Args:
+            pool: 连接池配置
+            replicas: 只读副本配置，未配置的项继承主库
+            read_strategy: 副本选择策略，round_robin、least_outstanding 或 latency_weighted
+            read_your_writes: 当前上下文写入后的该秒数内，读请求仍然访问主库
+            read_mode: 单条读语句的执行方式，transaction 在事务中执行，
+                autocommit 使用 autocommit 连接直接执行，省去 BEGIN/COMMIT 两次往返
+            options: 传递给驱动的其他连接参数
+        """
+        if host is None or host == "":
+            raise ValueError("host is required")
+        if port is None or port <= 0:
+            raise ValueError("port is required and must be greater than 0")
+        if user is None or user == "":
+            raise ValueError("user is required")
+        if password is None:
+            raise ValueError("password is required")
+        if database is None or database == "":
+            raise ValueError("database is required")
+        if read_mode not in ("transaction", "autocommit"):
+            raise ValueError(f"unsupported read_mode: {read_mode}")
+        self._data_source_id: str = data_source_id
+        self._dialect: str = "mysql"
+        self._host: str = host
+        self._port: int = port
+        self._user: str = user
+        self._password: str = password
+        self._database: str = database
+        self._read_mode: str = read_mode
+        self._pool: AsyncMysqlConnectionPool = AsyncMysqlConnectionPool(
+            self._data_source_id,
+            self.create_connection,
+            **(pool or {}),
+        )
+        self._executor: AsyncMysqlExecutor = async_mysql_executor
+        self._options: Dict[str, Any] = options
+
+        self._replica_set: ReplicaSet[AsyncMysqlDataSource] | None = None
+        if replicas:
+            primary = dict(
+                port=port,
+                user=user,
+                password=password,
+                database=database,
+                pool=pool,
+                read_mode=read_mode,
+                options=options,
+            )
+            self._replica_set = ReplicaSet(
+                [AsyncMysqlDataSource(**config) for config in build_replica_configs(data_source_id, primary, replicas)],
+                read_strategy,
+            )
+        self._read_your_writes = read_your_writes
+        self._last_write_at: ContextVar[float] = ContextVar(f"pydorm_last_write_{data_source_id}", default=-math.inf)
+
+    def get_id(self) -> str:
+        return self._data_source_id
+
+    def get_dialect(self) -> str:
+        return self._dialect
+
+    def get_database(self) -> str:
+        return self._database
+
+    def get_sql_dialect(self) -> MysqlDialect:
+        return mysql_dialect
+
+    def get_placeholder(self) -> str:
+        return mysql_dialect.placeholder
+
+    async def create_connection(self) -> Any:
+        try:
+            import aiomysql
+        except ImportError:
+            raise ImportError("aiomysql is required for AsyncDorm, please install it with `pip install aiomysql`")
+
+        try:
+            conn = await aiomysql.connect(
+                host=self._host,
+                port=self._port,
+                user=self._user,
+                password=self._password,
+                db=self._database,
+                cursorclass=aiomysql.DictCursor,
+                charset="utf8mb4",
+                autocommit=self._read_mode == "autocommit",
+                **self._options,
+            )
+            logger.info(f"[{self._data_source_id}] create async connection [{id(conn)}]")
+            return conn
+        except Exception as e:
+            logger.error(f"[{self._data_source_id}] Failed to create async connection: {e}")
+            raise
+
+    def get_reusable_connection(self, for_read: bool = False) -> AsyncReusableMysqlConnection:
+        """
+        获取连接
+
+        Args:
+            for_read: 是否为只读请求。配置了副本时，只读请求路由到副本，
+                但当前上下文刚写入过主库时仍访问主库
+        """
+        if (
+            for_read
+            and self._replica_set is not None
+            and time.monotonic() - self._last_write_at.get() > self._read_your_writes
+        ):
+            return self._replica_set.choose().get_reusable_connection()
+        return AsyncReusableMysqlConnection(self._data_source_id, self._pool, self._read_mode == "autocommit")
+
+    def mark_write(self):
+        """记录当前上下文对主库的写入，用于写后读一致"""
+        if self._replica_set is not None:
+            self._last_write_at.set(time.monotonic())
+
+    def get_read_mode(self) -> str:
+        return self._read_mode
+
+    def get_pool(self):
+        return self._pool
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息，配置了副本时包含各副本的统计"""
+        stats = self._pool.stats()
+        if self._replica_set is not None:
+            stats["replicas"] = {
+                replica.get_id(): replica.get_pool_stats() for replica in self._replica_set.get_replicas()
+            }
+        return stats
+
+    async def close(self):
+        """关闭数据源和相关连接"""
+        await self._pool.close()
+        if self._replica_set is not None:
+            for replica in self._replica_set.get_replicas():
+                await replica.close()
+        logger.info(f"[{self._data_source_id}] DataSource closed")
+
+    def get_executor(self) -> AsyncMysqlExecutor:
+        return self._executor
@@ -0,0 +1,181 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Tuple
+
+from .._sql_cache import CompiledSql
+from .._sql_log import sql_log
+from ..errors import ConnectionException
+from ._async_reusable_mysql_connection import AsyncReusableMysqlConnection
+from ._mysql_driver import PyMysqlDriver, get_mysql_driver
+
+
+class AsyncMysqlExecutor:
+    """MySQL异步执行器，与 MysqlExecutor 提供相同的操作方法"""
+
+    def __init__(self, log_sql: bool = True):
+        """
+        初始化MySQL异步执行器
+
+        Args:
+            log_sql: 是否记录SQL日志
+        """
+        self.log_sql = log_sql
+
+    def _log_execution(
+        self,
+        conn: AsyncReusableMysqlConnection,
+        sql: str,
+        args: Any,
+        duration: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """记录SQL执行日志，按数据源的日志策略采样，格式化在后台线程中进行"""
+        if not self.log_sql:
+            return
+
+        sql_log.emit(conn.get_data_source_id(), id(conn), sql, args, duration, error)
+
+    # noinspection PyMethodMayBeStatic
+    def _prepare_sql(self, sql: str) -> str:
+        """将占位符从?转换为%s，已编译的SQL直接使用"""
+        if isinstance(sql, CompiledSql):
+            return sql
+        return sql.replace("?", "%s")
+
+    # noinspection PyMethodMayBeStatic
+    def _is_broken(self, e: BaseException) -> bool:
+        """
+        异常后连接是否不可复用
+
+        语句被取消（CancelledError）时服务端的响应还没有读取，连接的协议状态已不可用；aiomysql 使用 PyMySQL 的异常类型
+        """
+        return not isinstance(e, Exception) or get_mysql_driver(PyMysqlDriver.name).is_disconnect(e)
+
+    def _handle_error(self, conn: AsyncReusableMysqlConnection, e: BaseException):
+        """语句被取消或连接断开时废弃连接，连接断开时转换为 ConnectionException，其他异常原样抛出"""
+        if not self._is_broken(e):
+            return
+        conn.invalidate()
+        if isinstance(e, Exception):
+            raise ConnectionException(f"[{conn.get_data_source_id()}] Connection lost: {e}") from e
+
+    @asynccontextmanager
+    async def _get_cursor(self, conn: AsyncReusableMysqlConnection, sql: str | None = None, args: Any = None):
+        """
+        获取游标的上下文管理器
+
+        Args:
+            sql: 传入时计时，执行后记录日志，耗时包含读取结果
+            args: 记录的参数
+        """
+        timed = sql is not None and self.log_sql
+        start = time.perf_counter() if timed else 0.0
+        error: BaseException | None = None
+        cursor = await conn.cursor()
+        try:
+            yield cursor
+        except BaseException as e:
+            error = e
+            self._handle_error(conn, e)
+            raise
+        finally:
+            # 废弃的连接不再读取剩余的结果，归还时由连接池关闭
+            if error is None or not self._is_broken(error):
+                await cursor.close()
+            if timed:
+                self._log_execution(conn, sql, args, time.perf_counter() - start, error)
+
+    async def select_one(
+        self,
+        conn: AsyncReusableMysqlConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> Dict[str, Any] | None:
+        """
+        执行查询并返回单行结果
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            查询结果字典或None
+        """
+        async with self._get_cursor(conn, sql, args) as cursor:
+            await cursor.execute(self._prepare_sql(sql), args)
+
+            if cursor.rowcount == 0:
+                return None
+            return await cursor.fetchone()
+
+    async def select_many(
+        self,
+        conn: AsyncReusableMysqlConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        执行查询并返回多行结果
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            查询结果列表
+        """
+        async with self._get_cursor(conn, sql, args) as cursor:
+            await cursor.execute(self._prepare_sql(sql), args)
+
+            if cursor.rowcount == 0:
+                return []
+
+            rows = await cursor.fetchall()
+            return list(rows) if rows else []
+
+    async def execute(
+        self,
+        conn: AsyncReusableMysqlConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> Tuple[int, int]:
+        """
+        执行SQL语句（INSERT、UPDATE、DELETE）
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            (受影响的行数, 最后插入的行ID)
+        """
+        async with self._get_cursor(conn, sql, args) as cursor:
+            row_affected = await cursor.execute(self._prepare_sql(sql), args)
+            return row_affected, cursor.lastrowid
+
+    async def executemany(
+        self,
+        conn: AsyncReusableMysqlConnection,
+        sql: str,
+        args: List[Tuple[Any, ...]],
+    ) -> int:
+        """
+        批量执行SQL语句
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数列表
+
+        Returns:
+            受影响的总行数
+        """
+        async with self._get_cursor(conn, sql, args) as cursor:
+            row_affected = await cursor.executemany(self._prepare_sql(sql), args)
+            return row_affected or 0
+
+
+async_mysql_executor = AsyncMysqlExecutor()
@@ -0,0 +1,131 @@
+import time
+from typing import Any
+
+from loguru import logger
+from pymysql import MySQLError
+
+from .. import settings
+from ..errors import ConnectionException
+from ._async_mysql_connection_pool import AsyncMysqlConnectionPool, AsyncPooledConnection
+
+
+class AsyncReusableMysqlConnection:
+    """
+    异步连接池借用凭证
+
+    与 ReusableMysqlConnection 对应，acquire 时从异步连接池借出物理连接，release 时归还。
+    """
+
+    def __init__(self, data_source_id: str, pool: AsyncMysqlConnectionPool, autocommit: bool = False):
+        self._data_source_id = data_source_id
+        self._pool = pool
+        self._autocommit = autocommit
+        self._pooled: AsyncPooledConnection | None = None
+        self._acquired_at = 0.0
+        self._in_transaction = False
+
+    def get_data_source_id(self) -> str:
+        return self._data_source_id
+
+    def is_locked(self) -> bool:
+        return self._pooled is not None
+
+    async def acquire(self, timeout: float | None = None, operation_id: str | None = None):
+        if self._pooled is not None:
+            raise ConnectionException(f"[{self._data_source_id}] Connection already acquired.")
+        if settings.enable_connection_lock_log:
+            logger.debug(
+                "[{}] try to acquire connection with timeout {} seconds.",
+                operation_id,
+                timeout or self._pool.acquire_timeout,
+            )
+        self._pooled = await self._pool.acquire(timeout)
+        self._acquired_at = time.monotonic()
+        if settings.enable_connection_lock_log:
+            logger.debug("[{}] Connection[{}] acquired.", operation_id, id(self._pooled.raw))
+
+    async def release(self, operation_id: str | None = None):
+        pooled = self._pooled
+        if pooled is None:
+            return
+        self._pooled = None
+        if self._in_transaction and not pooled.broken:
+            # 未提交的事务不能带回连接池
+            self._in_transaction = False
+            try:
+                await pooled.raw.rollback()
+            except MySQLError as e:
+                logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] rollback on release failed: {e}")
+                pooled.broken = True
+        self._in_transaction = False
+        await self._pool.release(pooled, hold_time=time.monotonic() - self._acquired_at)
+        if settings.enable_connection_lock_log:
+            logger.debug("[{}] Connection[{}] released.", operation_id, id(pooled.raw))
+
+    def invalidate(self):
+        """标记当前连接不可复用，release 时由连接池关闭"""
+        if self._pooled is not None:
+            self._pooled.broken = True
+
+    def _check_connection(self) -> AsyncPooledConnection:
+        if self._pooled is None:
+            raise ConnectionException(
+                f"[{self._data_source_id}] Connection must be acquired before use."
+            )
+        return self._pooled
+
+    async def cursor(self) -> Any:
+        pooled = self._check_connection()
+        try:
+            return await pooled.raw.cursor()
+        except MySQLError as e:
+            logger.error(
+                f"[{self._data_source_id}] Connection[{id(pooled.raw)}] cursor creation failed: {e}"
+            )
+            await self._pool.replace(pooled)
+            return await pooled.raw.cursor()
+
+    async def begin(self):
+        pooled = self._check_connection()
+        try:
+            await pooled.raw.begin()
+            self._in_transaction = True
+        except MySQLError as e:
+            logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] begin failed: {e}")
+            await self._pool.replace(pooled)
+            raise ConnectionException(f"Transaction begin failed: {e}")
+
+    async def begin_read(self, consistent: bool = False):
+        """
+        开始只读操作，连接为 autocommit 时单条读语句不需要事务
+
+        Args:
+            consistent: 是否需要多条读语句看到同一快照，为 True 时总是开启事务
+        """
+        if consistent or not self._autocommit:
+            await self.begin()
+
+    async def end_read(self):
+        """结束 begin_read 开始的只读操作"""
+        if self._in_transaction:
+            await self.commit()
+
+    async def commit(self):
+        pooled = self._check_connection()
+        try:
+            await pooled.raw.commit()
+            self._in_transaction = False
+        except MySQLError as e:
+            logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] commit failed: {e}")
+            pooled.broken = True
+            raise ConnectionException(f"Transaction commit failed: {e}")
+
+    async def rollback(self):
+        pooled = self._check_connection()
+        try:
+            await pooled.raw.rollback()
+            self._in_transaction = False
+        except MySQLError as e:
+            logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] rollback failed: {e}")
+            pooled.broken = True
+            raise ConnectionException(f"Transaction rollback failed: {e}")
@@ -0,0 +1,405 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from loguru import logger
+
+from ..errors import ConnectionException
+from ._mysql_driver import MysqlDriver, get_mysql_driver
+
+
+class PooledConnection:
+    """连接池中的物理连接及其元数据"""
+
+    __slots__ = ("raw", "created_at", "last_used_at", "last_validated_at", "broken", "statements")
+
+    def __init__(self, raw: Any):
+        self.raw: Any = raw
+        self.created_at: float = time.monotonic()
+        self.last_used_at: float = self.created_at
+        self.last_validated_at: float = self.created_at
+        self.broken: bool = False
+        # 连接上缓存的预处理语句，SQL -> (SQL, 游标)，按最近使用排序
+        self.statements: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+
+
+class _Waiter:
+    __slots__ = ("event", "conn", "may_create")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn: PooledConnection | None = None
+        self.may_create = False
+
+
+class MysqlConnectionPool:
+    """
+    有界连接池
+
+    - 按 FIFO 顺序公平分配连接，连接释放时直接移交给最早等待的线程
+    - 借出时校验空闲过久或超过生命周期的连接
+    - 后台维护线程回收空闲连接并补足 min_size
+    """
+
+    def __init__(
+        self,
+        data_source_id: str,
+        create_connection: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float = 300,
+        max_lifetime: float = 3600,
+        acquire_timeout: float = 5,
+        validation_interval: float = 30,
+        maintenance_interval: float = 30,
+        driver: MysqlDriver | None = None,
+    ):
+        """
+        初始化连接池
+
+        Args:
+            data_source_id: 数据源ID
+            create_connection: 创建物理连接的函数
+            min_size: 最少保持的连接数
+            max_size: 最大连接数
+            max_idle: 连接最大空闲秒数，超过后被关闭（保留 min_size 个）
+            max_lifetime: 连接最大存活秒数，超过后在归还或借出时被关闭
+            acquire_timeout: 默认的获取连接超时秒数
+            validation_interval: 空闲超过该秒数的连接在借出前会先 ping 校验
+            maintenance_interval: 后台维护线程的运行间隔秒数
+            driver: 连接使用的驱动，用于校验连接和识别驱动异常，默认 PyMySQL
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self._data_source_id = data_source_id
+        self._create_connection = create_connection
+        self._driver: MysqlDriver = driver or get_mysql_driver("pymysql")
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_idle = max_idle
+        self._max_lifetime = max_lifetime
+        self._acquire_timeout = acquire_timeout
+        self._validation_interval = validation_interval
+
+        self._lock = threading.Lock()
+        self._idle: Deque[PooledConnection] = deque()
+        self._waiters: Deque[_Waiter] = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+
+        self._acquire_count = 0
+        self._wait_count = 0
+        self._timeout_count = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._hold_time_ewma = 0.0
+        self._created_count = 0
+        self._closed_count = 0
+
+        self._stop_event = threading.Event()
+        self._maintenance_interval = maintenance_interval
+        self._maintenance_thread = threading.Thread(target=self._maintenance_worker, daemon=True)
+        self._maintenance_thread.start()
+
+    @property
+    def driver(self) -> MysqlDriver:
+        return self._driver
+
+    @property
+    def acquire_timeout(self) -> float:
+        return self._acquire_timeout
+
+    @property
+    def hold_time_ewma(self) -> float:
+        return self._hold_time_ewma
+
+    def outstanding(self) -> int:
+        """借出和等待中的连接数"""
+        return self._in_use + len(self._waiters)
+
+    def acquire(self, timeout: float | None = None) -> PooledConnection:
+        """
+        借出一个连接
+
+        Args:
+            timeout: 等待超时秒数，None 时使用连接池默认值
+
+        Returns:
+            借出的连接
+        """
+        if timeout is None:
+            timeout = self._acquire_timeout
+
+        start = time.monotonic()
+        waited = False
+        pooled: PooledConnection | None = None
+        create = False
+
+        with self._lock:
+            if self._closed:
+                raise ConnectionException(f"[{self._data_source_id}] Connection pool is closed.")
+            if not self._waiters and self._idle:
+                pooled = self._idle.pop()
+            elif not self._waiters and self._size < self._max_size:
+                self._size += 1
+                create = True
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                waited = True
+
+        if waited:
+            pooled, create = self._wait(waiter, timeout)
+
+        wait_time = time.monotonic() - start
+        with self._lock:
+            self._acquire_count += 1
+            self._in_use += 1
+            if waited:
+                self._wait_count += 1
+                self._total_wait_time += wait_time
+                if wait_time > self._max_wait_time:
+                    self._max_wait_time = wait_time
+
+        try:
+            if create:
+                return self._open()
+            assert pooled is not None
+            return self._validate(pooled)
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+
+    def _wait(self, waiter: _Waiter, timeout: float):
+        if not waiter.event.wait(timeout):
+            with self._lock:
+                # 超时与移交可能同时发生，以锁内状态为准
+                if waiter.conn is None and not waiter.may_create:
+                    self._waiters.remove(waiter)
+                    self._timeout_count += 1
+                    raise ConnectionException(
+                        f"[{self._data_source_id}] Failed to acquire connection within {timeout} seconds."
+                    )
+        return waiter.conn, waiter.may_create
+
+    def release(self, pooled: PooledConnection, hold_time: float | None = None, touch: bool = True):
+        """
+        归还连接
+
+        Args:
+            pooled: 借出的连接
+            hold_time: 本次借用时长，用于统计
+            touch: 是否刷新最后使用时间，后台保活归还时为 False
+        """
+        now = time.monotonic()
+        discard = (
+            pooled.broken
+            or self._closed
+            or (self._max_lifetime > 0 and now - pooled.created_at > self._max_lifetime)
+        )
+        if touch:
+            pooled.last_used_at = now
+
+        with self._lock:
+            self._in_use -= 1
+            if hold_time is not None:
+                self._hold_time_ewma = (
+                    hold_time if self._hold_time_ewma == 0 else self._hold_time_ewma * 0.9 + hold_time * 0.1
+                )
+            if discard:
+                self._size -= 1
+                self._hand_over_slot()
+            elif self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.conn = pooled
+                waiter.event.set()
+                return
+            else:
+                self._idle.append(pooled)
+                return
+
+        self._close_raw(pooled)
+
+    def _hand_over_slot(self):
+        """连接被丢弃后，允许最早的等待者新建连接（需持有锁）"""
+        if self._waiters and self._size < self._max_size:
+            self._size += 1
+            waiter = self._waiters.popleft()
+            waiter.may_create = True
+            waiter.event.set()
+
+    def _open(self) -> PooledConnection:
+        try:
+            raw = self._create_connection()
+        except Exception as e:
+            with self._lock:
+                self._size -= 1
+                self._hand_over_slot()
+            raise ConnectionException(f"Failed to create connection: {e}")
+        with self._lock:
+            self._created_count += 1
+        return PooledConnection(raw)
+
+    def _validate(self, pooled: PooledConnection) -> PooledConnection:
+        now = time.monotonic()
+        expired = (self._max_lifetime > 0 and now - pooled.created_at > self._max_lifetime) or (
+            self._max_idle > 0 and now - pooled.last_used_at > self._max_idle
+        )
+        if not expired and now - max(pooled.last_used_at, pooled.last_validated_at) > self._validation_interval:
+            try:
+                self._driver.ping(pooled.raw)
+                pooled.last_validated_at = now
+            except self._driver.error as e:
+                logger.warning(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] validation failed: {e}")
+                expired = True
+        if not expired:
+            return pooled
+
+        self._close_raw(pooled)
+        try:
+            pooled.raw = self._create_connection()
+        except Exception as e:
+            with self._lock:
+                self._size -= 1
+                self._hand_over_slot()
+            raise ConnectionException(f"Failed to create connection: {e}")
+        pooled.created_at = time.monotonic()
+        pooled.last_used_at = pooled.created_at
+        pooled.last_validated_at = pooled.created_at
+        pooled.broken = False
+        with self._lock:
+            self._created_count += 1
+        return pooled
+
+    def replace(self, pooled: PooledConnection):
+        """关闭并重建借出中的物理连接"""
+        old_conn_id = id(pooled.raw)
+        self._close_raw(pooled)
+        try:
+            pooled.raw = self._create_connection()
+        except Exception as e:
+            pooled.broken = True
+            logger.error(f"[{self._data_source_id}] Failed to recreate connection: {e}")
+            raise ConnectionException(f"Connection recreation failed: {e}")
+        pooled.created_at = time.monotonic()
+        pooled.broken = False
+        with self._lock:
+            self._created_count += 1
+        logger.info(f"[{self._data_source_id}] Connection[{old_conn_id}] -> [{id(pooled.raw)}] recreated.")
+
+    def _close_raw(self, pooled: PooledConnection):
+        # 预处理语句属于物理连接，连接关闭后服务端自动释放，只需丢弃游标
+        pooled.statements.clear()
+        try:
+            pooled.raw.close()
+            logger.info(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] closed.")
+        except Exception as e:
+            logger.warning(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] close failed: {e}")
+        with self._lock:
+            self._closed_count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取连接池统计信息
+
+        Returns:
+            包含连接数、等待次数、等待耗时等指标的字典
+        """
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": len(self._waiters),
+                "min_size": self._min_size,
+                "max_size": self._max_size,
+                "acquire_count": self._acquire_count,
+                "wait_count": self._wait_count,
+                "timeout_count": self._timeout_count,
+                "total_wait_time": self._total_wait_time,
+                "avg_wait_time": self._total_wait_time / self._wait_count if self._wait_count else 0.0,
+                "max_wait_time": self._max_wait_time,
+                "hold_time_ewma": self._hold_time_ewma,
+                "created_count": self._created_count,
+                "closed_count": self._closed_count,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+
+        self._stop_event.set()
+        self._maintenance_thread.join(timeout=5)
+
+        for pooled in idle:
+            self._close_raw(pooled)
+
+    def _maintenance_worker(self):
+        while not self._stop_event.wait(self._maintenance_interval):
+            try:
+                self._evict_idle()
+                self._fill_min_size()
+            except Exception as e:
+                logger.error(f"[{self._data_source_id}] pool maintenance failed: {e}")
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            keep: Deque[PooledConnection] = deque()
+            for pooled in self._idle:
+                idle_too_long = self._max_idle > 0 and now - pooled.last_used_at > self._max_idle
+                too_old = self._max_lifetime > 0 and now - pooled.created_at > self._max_lifetime
+                if too_old or (idle_too_long and self._size - len(evicted) > self._min_size):
+                    evicted.append(pooled)
+                else:
+                    keep.append(pooled)
+            self._idle = keep
+            self._size -= len(evicted)
+
+        for pooled in evicted:
+            self._close_raw(pooled)
+
+        # 空闲连接保活，避免被服务端 wait_timeout 断开；不刷新 last_used_at，以免影响空闲回收
+        with self._lock:
+            stale = [
+                p for p in self._idle if now - max(p.last_used_at, p.last_validated_at) > self._validation_interval
+            ]
+            for pooled in stale:
+                self._idle.remove(pooled)
+            self._in_use += len(stale)
+        for pooled in stale:
+            try:
+                self._driver.ping(pooled.raw)
+                pooled.last_validated_at = time.monotonic()
+            except self._driver.error as e:
+                logger.error(f"[{self._data_source_id}] ping failed: {e}")
+                pooled.broken = True
+            self.release(pooled, touch=False)
+
+    def _fill_min_size(self):
+        while True:
+            with self._lock:
+                if self._closed or self._size >= self._min_size:
+                    return
+                self._size += 1
+                self._in_use += 1
+            try:
+                pooled = self._open()
+            except ConnectionException as e:
+                with self._lock:
+                    self._in_use -= 1
+                logger.error(f"[{self._data_source_id}] {e}")
+                return
+            self.release(pooled)
@@ -1,26 +1,71 @@
-from dataclasses import field, make_dataclass
+import math
+import time
+from contextvars import ContextVar
 from dataclasses import field, make_dataclass
 from typing import Dict, List, Any, Type
 
 from loguru import logger
-from pymysql.connections import Connection
 
 from pydorm.mysql._reusable_mysql_connection import ReusableMysqlConnection
+from ._mysql_connection_pool import MysqlConnectionPool
+from ._mysql_dialect import MysqlDialect, mysql_dialect
+from ._mysql_driver import MysqlDriver, get_mysql_driver
 from ._mysql_executor import mysql_executor, MysqlExecutor
 from ._mysql_table_inspector import mysql_table_inspector
+from ._replica_set import ReplicaSet, build_replica_configs
+from ._slow_query_log import SlowQueryLog
 
 
 class MysqlDataSource:
     def __init__(
         self,
         data_source_id: str,
-        host: str,
-        port: int,
-        user: str,
-        password: str,
-        database: str,
+        host: str | None = None,
+        port: int | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        database: str | None = None,
+        pool: Dict[str, Any] | None = None,
+        replicas: List[Dict[str, Any]] | None = None,
+        read_strategy: str = "round_robin",
+        read_your_writes: float = 1.0,
+        read_mode: str = "transaction",
+        driver: str = "pymysql",
+        prepared_statements: int = 0,
+        multi_statements: bool = False,
+        slow_query: Dict[str, Any] | SlowQueryLog | None = None,
         **options: Any,
     ):
+        """
+        Args:
+            pool: 连接池配置
+            replicas: 只读副本配置，未配置的项继承主库
+            read_strategy: 副本选择策略，round_robin、least_outstanding 或 latency_weighted
+            read_your_writes: 当前上下文写入后的该秒数内，读请求仍然访问主库
+            read_mode: 单条读语句的执行方式，transaction 在事务中执行，
+                autocommit 使用 autocommit 连接直接执行，省去 BEGIN/COMMIT 两次往返
+            driver: 驱动，pymysql、mysqlclient 或 mysql-connector。mysqlclient 的协议解析和行构造在 C 中完成，大结果集的 CPU 开销更低
+            prepared_statements: 每个连接缓存的服务端预处理语句数，0 为不使用。开启后由 Dorm 生成的语句
+                通过二进制协议执行，同一连接上相同结构的语句只解析一次，超过数量时关闭最久未使用的语句。
+                需要 mysql-connector 驱动
+            multi_statements: 是否允许一次发送多条语句，开启后 dorm.batch() 中的语句在一次往返中执行
+            slow_query: 慢查询记录配置，参数见 SlowQueryLog，副本与主库共用同一个记录
+            options: 传递给驱动的其他连接参数
+        """
+        if host is None or host == "":
+            raise ValueError("host is required")
+        if port is None or port <= 0:
+            raise ValueError("port is required and must be greater than 0")
+        if user is None or user == "":
+            raise ValueError("user is required")
+        if password is None:
+            raise ValueError("password is required")
+        if database is None or database == "":
+            raise ValueError("database is required")
+        if read_mode not in ("transaction", "autocommit"):
+            raise ValueError(f"unsupported read_mode: {read_mode}")
+        if prepared_statements < 0:
+            raise ValueError("prepared_statements must not be negative")
         self._data_source_id: str = data_source_id
         self._dialect: str = "mysql"
         self._host: str = host
@@ -28,14 +73,48 @@ class MysqlDataSource:
         self._user: str = user
         self._password: str = password
         self._database: str = database
-        self._reusable_connection: ReusableMysqlConnection = ReusableMysqlConnection(
+        self._read_mode: str = read_mode
+        self._driver: MysqlDriver = get_mysql_driver(driver)
+        if prepared_statements > 0 and self._driver.prepared_cursor is None:
+            raise ValueError(f"driver {driver} does not support prepared_statements, use driver mysql-connector")
+        self._prepared_statements: int = prepared_statements
+        self._multi_statements: bool = multi_statements
+        self._slow_query_log: SlowQueryLog | None = (
+            SlowQueryLog(self, **slow_query) if isinstance(slow_query, dict) else slow_query
+        )
+        self._pool: MysqlConnectionPool = MysqlConnectionPool(
             self._data_source_id,
             self.create_connection,
+            driver=self._driver,
+            **(pool or {}),
         )
         self._executor: MysqlExecutor = mysql_executor
         self._models: Dict[str, Type[Any]] = {}
+        self._max_allowed_packet: int | None = None
         self._options: Dict[str, Any] = options
 
+        self._replica_set: ReplicaSet[MysqlDataSource] | None = None
+        if replicas:
+            primary = dict(
+                port=port,
+                user=user,
+                password=password,
+                database=database,
+                pool=pool,
+                read_mode=read_mode,
+                driver=driver,
+                prepared_statements=prepared_statements,
+                multi_statements=multi_statements,
+                slow_query=self._slow_query_log,
+                options=options,
+            )
+            self._replica_set = ReplicaSet(
+                [MysqlDataSource(**config) for config in build_replica_configs(data_source_id, primary, replicas)],
+                read_strategy,
+            )
+        self._read_your_writes = read_your_writes
+        self._last_write_at: ContextVar[float] = ContextVar(f"pydorm_last_write_{data_source_id}", default=-math.inf)
+
     def get_id(self) -> str:
         return self._data_source_id
 
@@ -45,45 +124,108 @@ class MysqlDataSource:
     def get_database(self) -> str:
         return self._database
 
-    def create_connection(self) -> Connection:
-        import pymysql
-        from pymysql.cursors import DictCursor
+    def get_sql_dialect(self) -> MysqlDialect:
+        return mysql_dialect
 
+    def get_placeholder(self) -> str:
+        return mysql_dialect.placeholder
+
+    def create_connection(self) -> Any:
+        options = self._driver.enable_multi_statements(self._options) if self._multi_statements else self._options
         try:
-            conn = pymysql.connect(
+            conn = self._driver.connect(
                 host=self._host,
                 port=self._port,
                 user=self._user,
-                password=self._password,  # 移除编码
+                password=self._password,
                 database=self._database,
-                cursorclass=DictCursor,
-                charset="utf8mb4",  # 添加字符集
-                autocommit=False,  # 设置自动提交为False,
-                **self._options,  # 传递其他选项
+                autocommit=self._read_mode == "autocommit",
+                **options,  # 传递其他选项
             )
-            logger.info(f"[{self._data_source_id}] create connection [{id(conn)}]")
+            logger.info(f"[{self._data_source_id}] create {self._driver.name} connection [{id(conn)}]")
             return conn
         except Exception as e:
             logger.error(f"[{self._data_source_id}] Failed to create connection: {e}")
             raise
 
-    def get_reusable_connection(self) -> ReusableMysqlConnection:
-        return self._reusable_connection
+    def get_reusable_connection(self, for_read: bool = False) -> ReusableMysqlConnection:
+        """
+        获取连接
+
+        Args:
+            for_read: 是否为只读请求。配置了副本时，只读请求路由到副本，
+                但当前上下文刚写入过主库时仍访问主库
+        """
+        if (
+            for_read
+            and self._replica_set is not None
+            and time.monotonic() - self._last_write_at.get() > self._read_your_writes
+        ):
+            return self._replica_set.choose().get_reusable_connection()
+        return ReusableMysqlConnection(
+            self._data_source_id,
+            self._pool,
+            self._read_mode == "autocommit",
+            prepared_statements=self._prepared_statements,
+            multi_statements=self._multi_statements,
+            slow_query_log=self._slow_query_log,
+        )
+
+    def mark_write(self):
+        """记录当前上下文对主库的写入，用于写后读一致"""
+        if self._replica_set is not None:
+            self._last_write_at.set(time.monotonic())
+
+    def get_read_mode(self) -> str:
+        return self._read_mode
+
+    def get_driver(self) -> MysqlDriver:
+        return self._driver
+
+    def get_pool(self):
+        return self._pool
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息，配置了副本时包含各副本的统计"""
+        stats = self._pool.stats()
+        if self._replica_set is not None:
+            stats["replicas"] = {
+                replica.get_id(): replica.get_pool_stats() for replica in self._replica_set.get_replicas()
+            }
+        return stats
+
+    def get_slow_queries(self, clear: bool = False) -> List[Dict[str, Any]]:
+        """获取慢查询记录，按时间从旧到新，包含副本上的慢查询；未开启时返回空列表"""
+        if self._slow_query_log is None:
+            return []
+        return self._slow_query_log.entries(clear)
 
     def close(self):
         """关闭数据源和相关连接"""
-        if self._reusable_connection:
-            self._reusable_connection.close()
-            logger.info(f"[{self._data_source_id}] DataSource closed")
+        self._pool.close()
+        if self._replica_set is not None:
+            for replica in self._replica_set.get_replicas():
+                replica.close()
+        logger.info(f"[{self._data_source_id}] DataSource closed")
 
     def get_executor(self) -> MysqlExecutor:
         return self._executor
 
+    def is_local_infile_enabled(self) -> bool:
+        return bool(self._options.get("local_infile"))
+
+    def get_max_allowed_packet(self, conn: ReusableMysqlConnection) -> int:
+        """查询并缓存服务端的 max_allowed_packet"""
+        if self._max_allowed_packet is None:
+            row = self._executor.select_one(conn, "SELECT @@max_allowed_packet AS max_allowed_packet")
+            self._max_allowed_packet = int(row["max_allowed_packet"]) if row else 4 * 1024 * 1024
+        return self._max_allowed_packet
+
     def get_model(self, database: str | None, table: str) -> Type[Any]:
         key = f"{database or self._database}.{table}"
         if key not in self._models:
             table_structure: List[Dict] = mysql_table_inspector.load_structure(
-                self._reusable_connection, database or self._database, table
+                self.get_reusable_connection(), database or self._database, table
             )
             fields = [
                 (table_field["field_"], any, field(default=None)) for table_field in table_structure
@@ -104,5 +246,5 @@ class MysqlDataSource:
         if not table:
             raise ValueError("Table name must be provided to load structure")
         return mysql_table_inspector.load_structure(
-            self._reusable_connection, database or self._database, table
+            self.get_reusable_connection(), database or self._database, table
         )
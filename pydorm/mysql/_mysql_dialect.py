@@ -0,0 +1,15 @@
+from typing import Sequence
+
+
+class MysqlDialect:
+    """MySQL 语法"""
+
+    name = "mysql"
+    placeholder = "%s"
+
+    # noinspection PyMethodMayBeStatic
+    def upsert_clause(self, keys: Sequence[str], update_keys: Sequence[str]) -> str:
+        return f' ON DUPLICATE KEY UPDATE {",".join([f"{k}=VALUES({k})" for k in update_keys])}'
+
+
+mysql_dialect = MysqlDialect()
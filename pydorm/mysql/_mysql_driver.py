@@ -0,0 +1,262 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, Type
+
+# 连接已断开的客户端错误码：CR_SERVER_GONE_ERROR、CR_SERVER_LOST、CR_SERVER_LOST_EXTENDED
+_DISCONNECT_CODES = frozenset((2006, 2013, 2055))
+
+
+def _hex_literal(value: bytes | bytearray) -> str:
+    """二进制值转为十六进制字面量，语句可以按连接的字符集编码，不受 NO_BACKSLASH_ESCAPES 影响"""
+    return f"X'{bytes(value).hex()}'"
+
+
+class MysqlDriver(ABC):
+    """MySQL 驱动适配，屏蔽不同驱动在连接、游标、转义和异常上的差异"""
+
+    name: str = ""
+    # 驱动所有异常的基类
+    error: Type[Exception] = Exception
+    cursor: Any = None
+    dict_cursor: Any = None
+    ss_dict_cursor: Any = None
+    # 服务端预处理语句的游标类型，None 表示驱动不支持
+    prepared_cursor: Any = None
+    # 驱动能否将元组参数转义为 (v1,v2,...)，不能时由执行器展开 IN 条件的占位符
+    binds_sequences: bool = True
+
+    def __init__(self, module: Any, multi_statements_flag: int = 0):
+        self._module = module
+        self._multi_statements_flag = multi_statements_flag
+
+    @abstractmethod
+    def connect(
+        self, host: str, port: int, user: str, password: str, database: str, autocommit: bool, **options: Any
+    ) -> Any: ...
+
+    @abstractmethod
+    def ping(self, raw: Any):
+        """校验连接，连接已断开时抛出驱动异常，不自动重连"""
+
+    def open_cursor(self, raw: Any, cursor_type: Any) -> Any:
+        """按游标类型创建游标，cursor_type 为 None 时使用连接默认的字典游标"""
+        return raw.cursor(cursor_type)
+
+    def begin(self, raw: Any):
+        raw.begin()
+
+    def enable_multi_statements(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """返回允许一次发送多条语句的连接参数"""
+        return {**options, "client_flag": options.get("client_flag", 0) | self._multi_statements_flag}
+
+    def execute_multi(self, cursor: Any, sql: str) -> Iterator[Any]:
+        """执行以分号分隔的多条语句，依次返回位于每个结果上的游标"""
+        cursor.execute(sql)
+        yield cursor
+        while cursor.nextset():
+            yield cursor
+
+    @abstractmethod
+    def escape(self, raw: Any, value: Any) -> str:
+        """按连接的字符集转义参数，元组会转义为 (v1,v2,...)"""
+
+    def is_disconnect(self, e: BaseException) -> bool:
+        """异常是否表示连接已不可用"""
+        if isinstance(e, self._module.InterfaceError):
+            return True
+        return isinstance(e, self._module.OperationalError) and bool(e.args) and e.args[0] in _DISCONNECT_CODES
+
+
+class PyMysqlDriver(MysqlDriver):
+    """纯 Python 实现的 PyMySQL"""
+
+    name = "pymysql"
+
+    def __init__(self):
+        import pymysql
+        from pymysql.constants import CLIENT
+        from pymysql.cursors import Cursor, DictCursor, SSDictCursor
+
+        super().__init__(pymysql, CLIENT.MULTI_STATEMENTS)
+        self.error = pymysql.MySQLError
+        self.cursor = Cursor
+        self.dict_cursor = DictCursor
+        self.ss_dict_cursor = SSDictCursor
+
+    def connect(
+        self, host: str, port: int, user: str, password: str, database: str, autocommit: bool, **options: Any
+    ) -> Any:
+        return self._module.connect(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+            cursorclass=self.dict_cursor,
+            charset="utf8mb4",
+            autocommit=autocommit,
+            **options,
+        )
+
+    def ping(self, raw: Any):
+        raw.ping(reconnect=False)
+
+    def escape(self, raw: Any, value: Any) -> str:
+        return raw.escape(value)
+
+
+class MysqlclientDriver(MysqlDriver):
+    """基于 libmysqlclient 的 mysqlclient（MySQLdb），协议解析和行构造在 C 中完成"""
+
+    name = "mysqlclient"
+
+    def __init__(self):
+        try:
+            import MySQLdb
+            from MySQLdb.constants import CLIENT
+            from MySQLdb.cursors import Cursor, DictCursor, SSDictCursor
+        except ImportError:
+            raise ImportError(
+                "mysqlclient is required for driver 'mysqlclient', please install it with `pip install mysqlclient`"
+            )
+
+        super().__init__(MySQLdb, CLIENT.MULTI_STATEMENTS)
+        self.error = MySQLdb.MySQLError
+        self.cursor = Cursor
+        self.dict_cursor = DictCursor
+        self.ss_dict_cursor = SSDictCursor
+
+    def connect(
+        self, host: str, port: int, user: str, password: str, database: str, autocommit: bool, **options: Any
+    ) -> Any:
+        return self._module.connect(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+            cursorclass=self.dict_cursor,
+            charset="utf8mb4",
+            autocommit=autocommit,
+            **options,
+        )
+
+    def ping(self, raw: Any):
+        raw.ping()
+
+    def escape(self, raw: Any, value: Any) -> str:
+        if isinstance(value, (tuple, list)):
+            return f'({",".join(self.escape(raw, v) for v in value)})'
+        # literal 将二进制值转为包含原始字节的 _binary'...'，不能按字符集解码
+        if isinstance(value, (bytes, bytearray)):
+            return _hex_literal(value)
+        literal = raw.literal(value)
+        return literal.decode(getattr(raw, "encoding", "utf-8")) if isinstance(literal, bytes) else literal
+
+
+class MysqlConnectorDriver(MysqlDriver):
+    """
+    Oracle 官方的 mysql-connector-python，支持通过二进制协议执行服务端预处理语句
+
+    预处理语句只需在服务端解析一次，执行时参数和结果按二进制格式传输，不做文本转义和解析
+    """
+
+    name = "mysql-connector"
+    cursor = "tuple"
+    dict_cursor = "dict"
+    ss_dict_cursor = "ss_dict"
+    prepared_cursor = "prepared"
+    binds_sequences = False
+
+    def __init__(self):
+        try:
+            import mysql.connector
+        except ImportError:
+            raise ImportError(
+                "mysql-connector-python is required for driver 'mysql-connector', "
+                "please install it with `pip install mysql-connector-python`"
+            )
+
+        super().__init__(mysql.connector)
+        self.error = mysql.connector.Error
+
+    def connect(
+        self, host: str, port: int, user: str, password: str, database: str, autocommit: bool, **options: Any
+    ) -> Any:
+        return self._module.connect(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+            charset="utf8mb4",
+            autocommit=autocommit,
+            **options,
+        )
+
+    def ping(self, raw: Any):
+        raw.ping(reconnect=False)
+
+    def open_cursor(self, raw: Any, cursor_type: Any) -> Any:
+        if cursor_type is None or cursor_type == self.dict_cursor:
+            return raw.cursor(buffered=True, dictionary=True)
+        if cursor_type == self.cursor:
+            return raw.cursor(buffered=True)
+        if cursor_type == self.ss_dict_cursor:
+            return raw.cursor(dictionary=True)
+        if cursor_type == self.prepared_cursor:
+            return raw.cursor(prepared=True)
+        raise ValueError(f"unsupported cursor type: {cursor_type}")
+
+    def begin(self, raw: Any):
+        raw.start_transaction()
+
+    def enable_multi_statements(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        # 在 execute 时通过 multi=True 开启，不需要连接参数
+        return options
+
+    def execute_multi(self, cursor: Any, sql: str) -> Iterator[Any]:
+        yield from cursor.execute(sql, multi=True)
+
+    def escape(self, raw: Any, value: Any) -> str:
+        if isinstance(value, (tuple, list)):
+            return f'({",".join(self.escape(raw, v) for v in value)})'
+        if isinstance(value, (bytes, bytearray)):
+            return _hex_literal(value)
+        # 使用连接自身的转换器，按连接的字符集和 sql_mode（NO_BACKSLASH_ESCAPES）转义；
+        # C 扩展的连接没有转换器，由 prepare_for_mysql 转义
+        converter = getattr(raw, "converter", None)
+        if converter is not None:
+            literal = converter.quote(converter.escape(converter.to_mysql(value), raw.sql_mode))
+        else:
+            literal = raw.prepare_for_mysql((value,))[0]
+        return literal.decode(raw.python_charset) if isinstance(literal, (bytes, bytearray)) else str(literal)
+
+    def is_disconnect(self, e: BaseException) -> bool:
+        if isinstance(e, self._module.InterfaceError):
+            return True
+        return isinstance(e, self._module.Error) and getattr(e, "errno", None) in _DISCONNECT_CODES
+
+
+_driver_types: Dict[str, Type[MysqlDriver]] = {
+    PyMysqlDriver.name: PyMysqlDriver,
+    MysqlclientDriver.name: MysqlclientDriver,
+    MysqlConnectorDriver.name: MysqlConnectorDriver,
+}
+_drivers: Dict[str, MysqlDriver] = {}
+
+
+def get_mysql_driver(name: str) -> MysqlDriver:
+    """
+    获取驱动适配，首次使用时导入驱动
+
+    Args:
+        name: pymysql、mysqlclient 或 mysql-connector
+    """
+    driver = _drivers.get(name)
+    if driver is None:
+        driver_type = _driver_types.get(name)
+        if driver_type is None:
+            raise ValueError(f"unsupported mysql driver: {name}")
+        driver = driver_type()
+        _drivers[name] = driver
+    return driver
@@ -1,10 +1,15 @@
+import time
 from contextlib import contextmanager
-from typing import Any, Dict, List, Tuple
-
-from loguru import logger
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
 
+from .._instrumentation import current_event
+from .._sql_cache import CompiledSql
+from .._sql_log import sql_log
+from ..errors import ConnectionException
 from ._reusable_mysql_connection import ReusableMysqlConnection
 
+_SEQUENCE_TYPES = (tuple, list, set, frozenset)
+
 
 class MysqlExecutor:
     """MySQL数据库执行器，提供常用的数据库操作方法"""
@@ -18,28 +23,158 @@ class MysqlExecutor:
         """
         self.log_sql = log_sql
 
-    def _log_execution(self, conn: ReusableMysqlConnection, sql: str, args: Any) -> None:
-        """记录SQL执行日志"""
+    def _log_execution(
+        self,
+        conn: ReusableMysqlConnection,
+        sql: str,
+        args: Any,
+        duration: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """记录SQL执行日志，按数据源的日志策略采样，格式化在后台线程中进行"""
         if not self.log_sql:
             return
 
-        logger.debug(f"[{id(conn)}] {sql}")
-        # if args is not None and len(args) > 0:
-        #     logger.debug(f"### {args}")
+        sql_log.emit(conn.get_data_source_id(), id(conn), sql, args, duration, error)
+
+    def _observe(
+        self,
+        conn: ReusableMysqlConnection,
+        sql: str,
+        args: Any,
+        start: float,
+        error: BaseException | None,
+        explainable: bool = True,
+    ) -> None:
+        """语句执行后记录日志和慢查询"""
+        duration = time.perf_counter() - start
+        self._log_execution(conn, sql, args, duration, error)
+        slow_query_log = conn.get_slow_query_log()
+        if slow_query_log is not None:
+            slow_query_log.observe(conn.get_data_source_id(), sql, args, duration, error, explainable)
 
     # noinspection PyMethodMayBeStatic
     def _prepare_sql(self, sql: str) -> str:
-        """将占位符从?转换为%s"""
+        """将占位符从?转换为%s，已编译的SQL直接使用"""
+        if isinstance(sql, CompiledSql):
+            return sql
         return sql.replace("?", "%s")
 
+    def _bind(self, conn: ReusableMysqlConnection, sql: str, args: Any) -> Tuple[str, Any]:
+        """
+        转换占位符，驱动不能绑定序列参数时将 IN 条件的 %s 展开为 (%s,%s,...) 并展开对应的参数
+
+        Returns:
+            (SQL, 参数)
+        """
+        prepared_sql = self._prepare_sql(sql)
+        if (
+            not args
+            or conn.get_driver().binds_sequences
+            or not any(isinstance(arg, _SEQUENCE_TYPES) for arg in args)
+        ):
+            return prepared_sql, args
+
+        parts = prepared_sql.split("%s")
+        if len(parts) != len(args) + 1:
+            raise ValueError(f"placeholder count {len(parts) - 1} does not match argument count {len(args)}")
+        pieces: List[str] = [parts[0]]
+        flat_args: List[Any] = []
+        for arg, part in zip(args, parts[1:]):
+            if isinstance(arg, _SEQUENCE_TYPES):
+                if len(arg) == 0:
+                    raise ValueError("empty sequence is not allowed in IN condition")
+                pieces.append(f'({",".join(["%s"] * len(arg))})')
+                flat_args.extend(arg)
+            else:
+                pieces.append("%s")
+                flat_args.append(arg)
+            pieces.append(part)
+        return "".join(pieces), tuple(flat_args)
+
+    # noinspection PyMethodMayBeStatic
+    def _use_prepared(self, conn: ReusableMysqlConnection, sql: str, args: Any) -> bool:
+        """连接开启了预处理语句时，编译缓存中的语句且参数均为标量时使用预处理语句执行"""
+        return (
+            conn.get_prepared_statements() > 0
+            and isinstance(sql, CompiledSql)
+            and not any(isinstance(arg, _SEQUENCE_TYPES) for arg in args)
+        )
+
+    def _execute_prepared(
+        self, conn: ReusableMysqlConnection, sql: str, args: Tuple[Any, ...]
+    ) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]], int, int]:
+        """
+        使用二进制协议执行预处理语句，同一连接上相同结构的语句只在第一次执行时由服务端解析
+
+        Returns:
+            (列名, 每行的值, 受影响的行数, 最后插入的行ID)
+        """
+        event = current_event()
+        start = time.perf_counter()
+        error: BaseException | None = None
+        statement, cursor = conn.prepared_cursor(sql)
+        try:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(statement, args)
+            if cursor.description is None:
+                if event is not None:
+                    event.after_execute(cursor.rowcount)
+                return (), [], cursor.rowcount, cursor.lastrowid
+            if event is not None:
+                event.after_execute()
+            columns = tuple(column[0] for column in cursor.description)
+            rows = list(cursor.fetchall())
+            if event is not None:
+                event.after_fetch(len(rows))
+            return columns, rows, cursor.rowcount, cursor.lastrowid
+        except conn.get_driver().error as e:
+            error = e
+            conn.discard_prepared(sql)
+            self._handle_error(conn, e)
+            raise
+        finally:
+            self._observe(conn, sql, args, start, error)
+
+    # noinspection PyMethodMayBeStatic
+    def _handle_error(self, conn: ReusableMysqlConnection, e: BaseException):
+        """连接断开时废弃连接并转换为 ConnectionException，其他驱动异常原样抛出"""
+        if conn.get_driver().is_disconnect(e):
+            conn.invalidate()
+            raise ConnectionException(f"[{conn.get_data_source_id()}] Connection lost: {e}") from e
+
     @contextmanager
-    def _get_cursor(self, conn: ReusableMysqlConnection):
-        """获取游标的上下文管理器"""
-        cursor = conn.cursor()
+    def _get_cursor(
+        self,
+        conn: ReusableMysqlConnection,
+        cursor_type: Any = None,
+        sql: str | None = None,
+        args: Any = None,
+        explainable: bool = True,
+    ):
+        """
+        获取游标的上下文管理器
+
+        Args:
+            sql: 传入时计时，执行后记录日志和慢查询，耗时包含读取结果。应为使用占位符的SQL，
+                参数由日志策略决定是否脱敏
+            args: 记录的参数，为 None 时表示没有可记录的参数
+            explainable: 慢查询能否执行 EXPLAIN，多条语句拼接的SQL不能
+        """
+        start = time.perf_counter()
+        error: BaseException | None = None
+        cursor = conn.cursor(cursor_type)
         try:
             yield cursor
+        except conn.get_driver().error as e:
+            error = e
+            self._handle_error(conn, e)
+            raise
         finally:
             cursor.close()
+            if sql is not None:
+                self._observe(conn, sql, args, start, error, explainable)
 
     def select_one(
         self,
@@ -58,15 +193,24 @@ class MysqlExecutor:
         Returns:
             查询结果字典或None
         """
-        self._log_execution(conn, sql, args)
+        if self._use_prepared(conn, sql, args):
+            columns, rows, _, _ = self._execute_prepared(conn, sql, args)
+            return dict(zip(columns, rows[0])) if rows else None
 
-        with self._get_cursor(conn) as cursor:
-            prepared_sql = self._prepare_sql(sql)
-            cursor.execute(prepared_sql, args)
+        event = current_event()
+        with self._get_cursor(conn, sql=sql, args=args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(*self._bind(conn, sql, args))
+            if event is not None:
+                event.after_execute()
 
             if cursor.rowcount == 0:
                 return None
-            return cursor.fetchone()
+            row = cursor.fetchone()
+            if event is not None:
+                event.after_fetch(0 if row is None else 1)
+            return row
 
     def select_many(
         self,
@@ -85,18 +229,103 @@ class MysqlExecutor:
         Returns:
             查询结果列表
         """
-        self._log_execution(conn, sql, args)
+        if self._use_prepared(conn, sql, args):
+            columns, rows, _, _ = self._execute_prepared(conn, sql, args)
+            return [dict(zip(columns, row)) for row in rows]
 
-        with self._get_cursor(conn) as cursor:
-            prepared_sql = self._prepare_sql(sql)
-            cursor.execute(prepared_sql, args)
+        event = current_event()
+        with self._get_cursor(conn, sql=sql, args=args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(*self._bind(conn, sql, args))
+            if event is not None:
+                event.after_execute()
 
             if cursor.rowcount == 0:
                 return []
 
             rows = cursor.fetchall()
+            if event is not None:
+                event.after_fetch(len(rows))
             return list(rows) if rows else []
 
+    def select_tuples(
+        self,
+        conn: ReusableMysqlConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        """
+        执行查询并以元组返回多行结果，不为每行构造字典
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            (列名, 每行的值)
+        """
+        if self._use_prepared(conn, sql, args):
+            columns, rows, _, _ = self._execute_prepared(conn, sql, args)
+            return columns, rows
+
+        event = current_event()
+        with self._get_cursor(conn, conn.get_driver().cursor, sql, args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(*self._bind(conn, sql, args))
+            if event is not None:
+                event.after_execute()
+            columns = tuple(column[0] for column in cursor.description or ())
+            rows = cursor.fetchall()
+            if event is not None:
+                event.after_fetch(len(rows))
+            return columns, list(rows) if rows else []
+
+    def select_iter(
+        self,
+        conn: ReusableMysqlConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+        batch_size: int = 1000,
+        discard_on_close: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        使用无缓冲的服务端游标执行查询，逐行返回结果
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+            batch_size: 每次从网络读取的行数
+            discard_on_close: 未读完就关闭时是否废弃连接。无缓冲结果集必须读完才能复用连接，
+                对大结果集直接废弃连接的代价更小
+
+        Returns:
+            查询结果迭代器
+        """
+        self._log_execution(conn, sql, args)
+
+        cursor = conn.cursor(conn.get_driver().ss_dict_cursor)
+        exhausted = False
+        try:
+            cursor.execute(*self._bind(conn, sql, args))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    exhausted = True
+                    break
+                yield from rows
+        except conn.get_driver().error as e:
+            self._handle_error(conn, e)
+            raise
+        finally:
+            if exhausted or not discard_on_close:
+                cursor.close()
+            else:
+                conn.invalidate()
+
     def execute(
         self,
         conn: ReusableMysqlConnection,
@@ -114,11 +343,20 @@ class MysqlExecutor:
         Returns:
             (受影响的行数, 最后插入的行ID)
         """
-        self._log_execution(conn, sql, args)
+        if self._use_prepared(conn, sql, args):
+            _, _, row_affected, last_row_id = self._execute_prepared(conn, sql, args)
+            return row_affected, last_row_id
 
-        with self._get_cursor(conn) as cursor:
-            prepared_sql = self._prepare_sql(sql)
-            row_affected = cursor.execute(prepared_sql, args)
+        event = current_event()
+        with self._get_cursor(conn, sql=sql, args=args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            row_affected = cursor.execute(*self._bind(conn, sql, args))
+            if row_affected is None:
+                # mysql-connector 的 execute 不返回受影响的行数
+                row_affected = cursor.rowcount
+            if event is not None:
+                event.after_execute(row_affected)
             last_row_id = cursor.lastrowid
             return row_affected, last_row_id
 
@@ -139,12 +377,158 @@ class MysqlExecutor:
         Returns:
             受影响的总行数
         """
-        self._log_execution(conn, sql, args)
-
-        with self._get_cursor(conn) as cursor:
+        with self._get_cursor(conn, sql=sql) as cursor:
             prepared_sql = self._prepare_sql(sql)
+            event = current_event()
+            if event is not None:
+                event.before_execute(sql)
             row_affected = cursor.executemany(prepared_sql, args)
-            return row_affected or 0
+            if row_affected is None:
+                row_affected = cursor.rowcount
+            if event is not None:
+                event.after_execute(row_affected)
+            return max(row_affected, 0)
+
+    def execute_batch(
+        self,
+        conn: ReusableMysqlConnection,
+        statements: Sequence[Tuple[str, Tuple[Any, ...]]],
+    ) -> Iterator[Tuple[Tuple[str, ...], List[Tuple[Any, ...]], int]]:
+        """
+        执行多条语句，连接开启了 multi_statements 时参数在客户端转义后以分号拼接，一次往返发送
+
+        任一语句失败时抛出异常，服务端不再执行之后的语句
+
+        Args:
+            conn: 数据库连接
+            statements: (SQL, 参数) 列表
+
+        Returns:
+            按语句顺序返回 (列名, 每行的值, 受影响的行数) 的迭代器
+        """
+        if not conn.is_multi_statements() or len(statements) == 1:
+            for sql, args in statements:
+                if self._use_prepared(conn, sql, args):
+                    columns, rows, row_affected, _ = self._execute_prepared(conn, sql, args)
+                    yield columns, rows, row_affected
+                    continue
+                with self._get_cursor(conn, conn.get_driver().cursor, sql, args) as cursor:
+                    event = current_event()
+                    if event is not None:
+                        event.before_execute(sql)
+                    cursor.execute(*self._bind(conn, sql, args))
+                    if event is not None:
+                        event.after_execute()
+                    yield self._read_result(cursor, event)
+            return
+
+        multi_sql = ";\n".join(self._interpolate(conn, sql, args) for sql, args in statements)
+        # 记录使用占位符的SQL和全部参数，参数已嵌入 multi_sql，直接记录会绕过日志策略的脱敏
+        logged_sql = ";\n".join(str(sql) for sql, _ in statements)
+        logged_args = tuple(arg for _, args in statements for arg in args)
+        with self._get_cursor(conn, conn.get_driver().cursor, logged_sql, logged_args, explainable=False) as cursor:
+            event = current_event()
+            if event is not None:
+                event.before_execute(statements[0][0])
+                event.statements += len(statements) - 1
+            for result in conn.get_driver().execute_multi(cursor, multi_sql):
+                if event is not None:
+                    event.after_execute()
+                yield self._read_result(result, event)
+                if event is not None:
+                    event.lap()
+
+    def _interpolate(self, conn: ReusableMysqlConnection, sql: str, args: Tuple[Any, ...]) -> str:
+        """将转义后的参数嵌入SQL，与驱动在客户端绑定参数的方式一致"""
+        prepared_sql = self._prepare_sql(sql)
+        if not args:
+            return prepared_sql
+        return prepared_sql % tuple(conn.escape(arg) for arg in args)
+
+    # noinspection PyMethodMayBeStatic
+    def _read_result(self, cursor: Any, event: Any = None) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]], int]:
+        if cursor.description is None:
+            row_affected = max(cursor.rowcount, 0)
+            if event is not None:
+                event.row_affected += row_affected
+            return (), [], row_affected
+        columns = tuple(column[0] for column in cursor.description)
+        rows = list(cursor.fetchall())
+        if event is not None:
+            event.after_fetch(len(rows))
+        return columns, rows, len(rows)
+
+    def explain(self, conn: ReusableMysqlConnection, sql: str, args: Tuple[Any, ...] = ()) -> str:
+        """
+        执行 EXPLAIN FORMAT=JSON，不计入慢查询记录
+
+        Returns:
+            JSON 格式的执行计划
+        """
+        bound_sql, bound_args = self._bind(conn, sql, args)
+        with self._get_cursor(conn, conn.get_driver().cursor) as cursor:
+            cursor.execute(f"EXPLAIN FORMAT=JSON {bound_sql}", bound_args)
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"EXPLAIN returned no plan: {sql}")
+            return row[0]
+
+    def insert_values(
+        self,
+        conn: ReusableMysqlConnection,
+        prefix: str,
+        suffix: str,
+        rows: Sequence[Tuple[Any, ...]],
+        chunk_rows: int,
+        max_packet_bytes: int,
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        将数据分块为多行 VALUES 的插入语句依次执行，每块执行后返回一次，便于调用方分块提交
+
+        Args:
+            conn: 数据库连接
+            prefix: INSERT ... VALUES 前缀
+            suffix: ON DUPLICATE KEY UPDATE 后缀
+            rows: 每行的参数
+            chunk_rows: 每块最多的行数
+            max_packet_bytes: 每条语句的最大字节数，不应超过服务端的 max_allowed_packet
+
+        Returns:
+            每块的 (行数, 受影响的行数) 迭代器
+        """
+        fixed_bytes = len(prefix.encode("utf-8")) + len(suffix.encode("utf-8"))
+        if fixed_bytes >= max_packet_bytes:
+            raise ValueError(f"max_packet_bytes {max_packet_bytes} is too small for the statement")
+
+        values: List[str] = []
+        size = fixed_bytes
+        for row in rows:
+            value = conn.escape(row)
+            value_bytes = len(value.encode("utf-8")) + 1
+            if values and (len(values) >= chunk_rows or size + value_bytes > max_packet_bytes):
+                yield len(values), self._execute_values(conn, prefix, values, suffix)
+                values = []
+                size = fixed_bytes
+            if size + value_bytes > max_packet_bytes:
+                raise ValueError(f"row is larger than max_packet_bytes {max_packet_bytes}")
+            values.append(value)
+            size += value_bytes
+        if values:
+            yield len(values), self._execute_values(conn, prefix, values, suffix)
+
+    def _execute_values(self, conn: ReusableMysqlConnection, prefix: str, values: List[str], suffix: str) -> int:
+        sql = f'{prefix}{",".join(values)}{suffix}'
+        summary = f"{prefix}... ({len(values)} rows){suffix}"
+
+        event = current_event()
+        with self._get_cursor(conn, sql=summary) as cursor:
+            if event is not None:
+                event.before_execute(f"{prefix}...{suffix}")
+            row_affected = cursor.execute(sql)
+            row_affected = max(cursor.rowcount if row_affected is None else row_affected, 0)
+            if event is not None:
+                event.after_execute(row_affected)
+            return row_affected
 
 
 mysql_executor = MysqlExecutor()
@@ -0,0 +1,80 @@
+import itertools
+import random
+from typing import Any, Dict, Generic, List, Protocol, TypeVar
+
+
+class _PooledDataSource(Protocol):
+    def get_id(self) -> str: ...
+
+    def get_pool(self) -> Any: ...
+
+
+D = TypeVar("D", bound=_PooledDataSource)
+
+
+class ReplicaSet(Generic[D]):
+    """
+    只读副本集合，按策略为读请求选择副本
+
+    - round_robin: 轮询
+    - least_outstanding: 选择借出和等待中的连接最少的副本
+    - latency_weighted: 按连接平均占用时长的倒数加权随机选择
+    """
+
+    STRATEGIES = ("round_robin", "least_outstanding", "latency_weighted")
+
+    def __init__(self, replicas: List[D], strategy: str = "round_robin"):
+        if len(replicas) == 0:
+            raise ValueError("replicas must not be empty")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"unsupported read strategy: {strategy}")
+        self._replicas = replicas
+        self._strategy = strategy
+        self._counter = itertools.count()
+
+    def get_replicas(self) -> List[D]:
+        return self._replicas
+
+    def choose(self) -> D:
+        if len(self._replicas) == 1:
+            return self._replicas[0]
+        if self._strategy == "least_outstanding":
+            return min(self._replicas, key=lambda replica: replica.get_pool().outstanding())
+        if self._strategy == "latency_weighted":
+            # 尚无统计的副本按最快处理，保证能被选中并积累统计
+            latencies = [replica.get_pool().hold_time_ewma for replica in self._replicas]
+            known = [latency for latency in latencies if latency > 0]
+            fastest = min(known) if known else 1.0
+            weights = [1.0 / (latency if latency > 0 else fastest) for latency in latencies]
+            return random.choices(self._replicas, weights=weights)[0]
+        return self._replicas[next(self._counter) % len(self._replicas)]
+
+
+def build_replica_configs(
+    data_source_id: str, primary: Dict[str, Any], replicas: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    生成副本数据源的构造参数，副本未配置的项继承主库配置
+
+    Args:
+        data_source_id: 主库数据源ID
+        primary: 主库除 host 外的构造参数，其中 options 为驱动连接参数
+        replicas: 副本配置列表
+
+    Returns:
+        副本数据源的构造参数列表
+    """
+    inherited = {k: v for k, v in primary.items() if k != "options"}
+    configs: List[Dict[str, Any]] = []
+    for index, replica in enumerate(replicas):
+        if "host" not in replica:
+            raise ValueError(f"host is required for replica {index} of data source {data_source_id}")
+        overrides = {k: v for k, v in replica.items() if k != "options"}
+        configs.append(
+            dict(
+                **{**inherited, **overrides},
+                data_source_id=f"{data_source_id}:replica-{index}",
+                **{**primary["options"], **replica.get("options", {})},
+            )
+        )
+    return configs
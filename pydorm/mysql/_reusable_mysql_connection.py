@@ -1,187 +1,214 @@
-import threading
-from typing import Callable
+import time
+from typing import Any, Tuple
 
 from loguru import logger
-from pymysql import MySQLError
-from pymysql.connections import Connection
-from pymysql.cursors import DictCursor
 from ..errors import ConnectionException
 
 from .. import settings
+from .._instrumentation import PHASE_ACQUIRE, current_event
+from ._mysql_connection_pool import MysqlConnectionPool, PooledConnection
+from ._mysql_driver import MysqlDriver
+from ._slow_query_log import SlowQueryLog
 
 
 class ReusableMysqlConnection:
-    def __init__(self, data_source_id: str, create_connection: Callable[[], Connection]):
+    """
+    连接池借用凭证
+
+    每次操作通过数据源获取一个新的凭证，acquire 时从连接池借出物理连接，release 时归还。
+    """
+
+    def __init__(
+        self,
+        data_source_id: str,
+        pool: MysqlConnectionPool,
+        autocommit: bool = False,
+        prepared_statements: int = 0,
+        multi_statements: bool = False,
+        slow_query_log: SlowQueryLog | None = None,
+    ):
         self._data_source_id = data_source_id
-        self._lock = threading.Lock()
-        self._create_connection = create_connection
-        self._conn: Connection | None = None
-        self._active = False
-        self._closed = False
-        self._in_use = False  # 添加使用中标记
-
-        self._stop_event = threading.Event()  # 添加停止事件
-        # 其他初始化代码
-        self._keep_alive_thread = threading.Thread(target=self._keep_alive_worker, daemon=True)
-        self._keep_alive_thread.start()
+        self._pool = pool
+        self._autocommit = autocommit
+        self._prepared_statements = prepared_statements
+        self._multi_statements = multi_statements
+        self._slow_query_log = slow_query_log
+        self._pooled: PooledConnection | None = None
+        self._acquired_at = 0.0
+        self._in_transaction = False
+
+    def get_data_source_id(self) -> str:
+        return self._data_source_id
+
+    def get_driver(self) -> MysqlDriver:
+        return self._pool.driver
+
+    def get_prepared_statements(self) -> int:
+        """每个物理连接最多缓存的预处理语句数，0 表示不使用预处理语句"""
+        return self._prepared_statements
+
+    def is_multi_statements(self) -> bool:
+        """连接是否允许一次发送多条语句"""
+        return self._multi_statements
+
+    def get_slow_query_log(self) -> SlowQueryLog | None:
+        """数据源的慢查询记录，未开启时为 None"""
+        return self._slow_query_log
 
     def is_locked(self) -> bool:
         """
-        检查锁是否已经被占用。
+        检查是否已经借出连接。
 
         Returns:
-            bool: 如果锁被占用，返回 True；否则返回 False。
+            bool: 如果已借出连接，返回 True；否则返回 False。
         """
-        return self._lock.locked()
+        return self._pooled is not None
 
-    def acquire(self, timeout: float = 5, operation_id: str | None = None):
+    def acquire(self, timeout: float | None = None, operation_id: str | None = None):
+        if self._pooled is not None:
+            raise ConnectionException(f"[{self._data_source_id}] Connection already acquired.")
         if settings.enable_connection_lock_log:
             logger.debug(
-                f"[{operation_id}] try to lock connection[{id(self._conn)}] with timeout {timeout} seconds."
+                "[{}] try to acquire connection with timeout {} seconds.",
+                operation_id,
+                timeout or self._pool.acquire_timeout,
             )
-        if self._lock.acquire(timeout=timeout):
-            try:
-                self._in_use = True
-                if not self._active:
-                    self._conn = self._create_connection()
-                    self._active = True
-                    logger.info(f"[{self._data_source_id}] Connection created.")
-                if settings.enable_connection_lock_log:
-                    logger.debug(f"'[{operation_id}] Connection[{id(self._conn)}] locked.")
-            except Exception as e:
-                self._in_use = False  # 添加这行
-                self._lock.release()  # 添加这行
-                raise ConnectionException(f"Failed to create connection: {e}")
-        else:
-            raise ConnectionException(f"Failed to acquire connection within {timeout} seconds.")
+        event = current_event()
+        if event is not None:
+            event.lap()
+        self._pooled = self._pool.acquire(timeout)
+        if event is not None:
+            event.lap(PHASE_ACQUIRE)
+        self._acquired_at = time.monotonic()
+        if settings.enable_connection_lock_log:
+            logger.debug("[{}] Connection[{}] acquired.", operation_id, id(self._pooled.raw))
 
     def release(self, operation_id: str | None = None):
-        self._in_use = False  # 取消使用中标记
-        self._lock.release()
+        pooled = self._pooled
+        if pooled is None:
+            return
+        self._pooled = None
+        if self._in_transaction and not pooled.broken:
+            # 未提交的事务不能带回连接池
+            self._in_transaction = False
+            try:
+                pooled.raw.rollback()
+            except self._pool.driver.error as e:
+                logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] rollback on release failed: {e}")
+                pooled.broken = True
+        self._pool.release(pooled, hold_time=time.monotonic() - self._acquired_at)
+        self._in_transaction = False
         if settings.enable_connection_lock_log:
-            logger.debug(f"[{operation_id}] Connection[{id(self._conn)}] released.")
+            logger.debug("[{}] Connection[{}] released.", operation_id, id(pooled.raw))
 
-    def _check_connection(self):
-        if not self._in_use:
+    def invalidate(self):
+        """标记当前连接不可复用，release 时由连接池关闭"""
+        if self._pooled is not None:
+            self._pooled.broken = True
+
+    def _check_connection(self) -> PooledConnection:
+        if self._pooled is None:
             raise ConnectionException(
                 f"[{self._data_source_id}] Connection must be acquired before use."
             )
-        if self._closed:
-            raise ConnectionException(f"[{self._data_source_id}] Connection is closed.")
-        if not self._active:
-            raise ConnectionException(f"[{self._data_source_id}] Connection is not active.")
+        return self._pooled
 
-    def cursor(self) -> DictCursor:
-        self._check_connection()
+    def cursor(self, cursor_type: Any = None) -> Any:
+        pooled = self._check_connection()
+        driver = self._pool.driver
         try:
-            if self._conn is None:
-                raise ConnectionException(
-                    f"[{self._data_source_id}] Connection is not initialized."
-                )
-            return self._conn.cursor()  # type: ignore
-        except MySQLError as e:
+            return driver.open_cursor(pooled.raw, cursor_type)
+        except driver.error as e:
             logger.error(
-                f"[{self._data_source_id}] Connection[{id(self._conn)}] cursor creation failed: {e}"
+                f"[{self._data_source_id}] Connection[{id(pooled.raw)}] cursor creation failed: {e}"
             )
-            try:
-                self._conn = self._create_connection()
-                logger.info(
-                    f"[{self._data_source_id}] Connection[{id(self._conn)}] recreated after cursor failure."
-                )
-                return self._conn.cursor()  # type: ignore
-            except Exception as recreate_error:
-                logger.error(
-                    f"[{self._data_source_id}] Failed to recreate connection: {recreate_error}"
-                )
-                self._active = False
-                raise ConnectionException(f"Connection recreation failed: {recreate_error}")
+            self._pool.replace(pooled)
+            return driver.open_cursor(pooled.raw, cursor_type)
+
+    def prepared_cursor(self, sql: str) -> Tuple[str, Any]:
+        """
+        获取 SQL 在当前物理连接上的预处理语句游标，超过上限时关闭最久未使用的语句
+
+        Returns:
+            (SQL, 游标)。驱动按 SQL 对象的同一性判断是否复用预处理语句，执行时应使用返回的 SQL 对象
+        """
+        pooled = self._check_connection()
+        statements = pooled.statements
+        entry = statements.get(sql)
+        if entry is not None:
+            statements.move_to_end(sql)
+            return entry
+        entry = (sql, self.cursor(self._pool.driver.prepared_cursor))
+        statements[sql] = entry
+        while len(statements) > self._prepared_statements:
+            _, (_, cursor) = statements.popitem(last=False)
+            self._close_statement(pooled, cursor)
+        return entry
+
+    def discard_prepared(self, sql: str):
+        """关闭并移除 SQL 的预处理语句，执行失败后调用，下次执行时重新预处理"""
+        pooled = self._pooled
+        if pooled is None:
+            return
+        entry = pooled.statements.pop(sql, None)
+        if entry is not None:
+            self._close_statement(pooled, entry[1])
+
+    def _close_statement(self, pooled: PooledConnection, cursor: Any):
+        try:
+            cursor.close()
+        except self._pool.driver.error as e:
+            logger.warning(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] close statement failed: {e}")
+
+    def escape(self, value: Any) -> str:
+        """按当前连接的字符集转义参数，元组会转义为 (v1,v2,...)"""
+        return self._pool.driver.escape(self._check_connection().raw, value)
 
     def begin(self):
-        self._check_connection()
+        pooled = self._check_connection()
         try:
-            if self._conn is None:
-                raise ConnectionException(
-                    f"[{self._data_source_id}] Connection is not initialized."
-                )
-            self._conn.begin()
-        except MySQLError as e:
-            logger.error(f"[{self._data_source_id}] Connection[{id(self._conn)}] begin failed: {e}")
-            self._recreate_connection()
+            self._pool.driver.begin(pooled.raw)
+            self._in_transaction = True
+        except self._pool.driver.error as e:
+            logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] begin failed: {e}")
+            self._pool.replace(pooled)
             raise ConnectionException(f"Transaction begin failed: {e}")
 
+    def begin_read(self, consistent: bool = False):
+        """
+        开始只读操作，连接为 autocommit 时单条读语句不需要事务
+
+        Args:
+            consistent: 是否需要多条读语句看到同一快照，为 True 时总是开启事务
+        """
+        if consistent or not self._autocommit:
+            self.begin()
+
+    def end_read(self):
+        """结束 begin_read 开始的只读操作"""
+        if self._in_transaction:
+            self.commit()
+
     def commit(self):
-        self._check_connection()
+        pooled = self._check_connection()
         try:
-            if self._conn is None:
-                raise ConnectionException(
-                    f"[{self._data_source_id}] Connection is not initialized."
-                )
-            self._conn.commit()
-        except MySQLError as e:
+            pooled.raw.commit()
+            self._in_transaction = False
+        except self._pool.driver.error as e:
             logger.error(
-                f"[{self._data_source_id}] Connection[{id(self._conn)}] commit failed: {e}"
+                f"[{self._data_source_id}] Connection[{id(pooled.raw)}] commit failed: {e}"
             )
-            self._recreate_connection()
+            pooled.broken = True
             raise ConnectionException(f"Transaction commit failed: {e}")
 
     def rollback(self):
-        self._check_connection()
+        pooled = self._check_connection()
         try:
-            self._conn.rollback()
-        except MySQLError as e:
+            pooled.raw.rollback()
+            self._in_transaction = False
+        except self._pool.driver.error as e:
             logger.error(
-                f"[{self._data_source_id}] Connection[{id(self._conn)}] rollback failed: {e}"
+                f"[{self._data_source_id}] Connection[{id(pooled.raw)}] rollback failed: {e}"
             )
-            self._recreate_connection()
+            pooled.broken = True
             raise ConnectionException(f"Transaction rollback failed: {e}")
-
-    def _recreate_connection(self):
-        try:
-            old_conn_id = id(self._conn) if self._conn else None
-            self._conn = self._create_connection()
-            logger.info(
-                f"[{self._data_source_id}] Connection[{old_conn_id}] -> [{id(self._conn)}] recreated."
-            )
-        except Exception as recreate_error:
-            logger.error(
-                f"[{self._data_source_id}] Failed to recreate connection: {recreate_error}"
-            )
-            self._active = False
-            raise ConnectionException(f"Connection recreation failed: {recreate_error}")
-
-    def close(self):
-        if self._closed:
-            return
-        self._closed = True
-        self._stop_event.set()  # 通知保活线程停止
-
-        # 等待保活线程结束
-        if hasattr(self, "_keep_alive_thread"):
-            self._keep_alive_thread.join(timeout=5)
-
-        with self._lock:
-            try:
-                if self._conn:
-                    self._conn.close()
-                    logger.info(f"[{self._data_source_id}] Connection[{id(self._conn)}] closed.")
-            except MySQLError as e:
-                logger.error(
-                    f"[{self._data_source_id}] Connection[{id(self._conn)}] close failed: {e}"
-                )
-            finally:
-                self._active = False
-
-    def _keep_alive_worker(self):
-        while not self._stop_event.wait(30):
-            if self._closed:
-                break
-            if self._active and not self._in_use:  # 添加使用中检查
-                if self._lock.acquire(timeout=1):  # 使用超时避免阻塞
-                    try:
-                        if self._conn and not self._in_use:  # 双重检查
-                            self._conn.ping(reconnect=True)
-                    except MySQLError as e:
-                        logger.error(f"[{self._data_source_id}] ping failed: {e}")
-                        self._recreate_connection()
-                    finally:
-                        self._lock.release()
@@ -0,0 +1,238 @@
+import contextlib
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from loguru import logger
+
+from .._sql_log import summarize_args
+from .._statement_stats import normalize_sql
+from ..utils.random_utils import generate_random_string
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CONTEXTLIB_FILE = contextlib.__file__
+
+# 支持 EXPLAIN 的语句，INSERT ... VALUES 的执行计划没有参考价值
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+_EXPLAIN_CACHE_MAX_SIZE = 256
+
+
+def find_plan_issues(plan: Any) -> List[str]:
+    """从 EXPLAIN FORMAT=JSON 的执行计划中找出全表扫描、全索引扫描、文件排序和临时表"""
+    issues: List[str] = []
+
+    def walk(node: Any):
+        if isinstance(node, dict):
+            access_type = node.get("access_type")
+            if access_type == "ALL":
+                issues.append(f"full_table_scan:{node.get('table_name')}")
+            elif access_type == "index":
+                issues.append(f"full_index_scan:{node.get('table_name')}")
+            if node.get("using_filesort"):
+                issues.append("filesort")
+            if node.get("using_temporary_table"):
+                issues.append("temporary_table")
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(plan)
+    return list(dict.fromkeys(issues))
+
+
+def _capture_stack(limit: int) -> List[str]:
+    """调用方的栈，去掉 pydorm 和 contextlib 内部的帧，最内层在最后"""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if not frame.filename.startswith(_PACKAGE_DIR) and frame.filename != _CONTEXTLIB_FILE
+    ]
+    return [f"{frame.filename}:{frame.lineno} in {frame.name}: {frame.line}" for frame in frames[-limit:]]
+
+
+class SlowQuery:
+    """一条慢查询记录，开启 explain 时执行计划由后台线程补充"""
+
+    __slots__ = (
+        "data_source_id",
+        "sql",
+        "args",
+        "duration",
+        "started_at",
+        "stack",
+        "error",
+        "explain_status",
+        "plan",
+        "issues",
+    )
+
+    def __init__(
+        self,
+        data_source_id: str,
+        sql: str,
+        args: List[str] | None,
+        duration: float,
+        stack: List[str],
+        error: BaseException | None,
+    ):
+        self.data_source_id = data_source_id
+        self.sql = sql
+        self.args = args
+        self.duration = duration
+        self.started_at = time.time() - duration
+        self.stack = stack
+        self.error = None if error is None else f"{type(error).__name__}: {error}"
+        # None 未开启或语句不支持，pending 等待执行，done 完成，cached 复用相同结构语句的结果，
+        # skipped 因限流跳过，failed 执行失败
+        self.explain_status: str | None = None
+        self.plan: Dict[str, Any] | None = None
+        self.issues: List[str] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "data_source": self.data_source_id,
+            "sql": self.sql,
+            "args": self.args,
+            "duration": self.duration,
+            "started_at": self.started_at,
+            "stack": self.stack,
+            "error": self.error,
+            "explain_status": self.explain_status,
+            "plan": self.plan,
+            "issues": self.issues,
+        }
+
+
+class SlowQueryLog:
+    """
+    慢查询记录，执行时间超过阈值的语句连同参数摘要和调用栈保存在环形缓冲区中
+
+    开启 explain 时由后台线程在单独的连接上执行 EXPLAIN FORMAT=JSON，并找出全表扫描、文件排序和临时表。
+    EXPLAIN 之间至少间隔 explain_interval 秒，相同结构的语句在 explain_cache_ttl 秒内复用之前的结果，
+    等待执行的 EXPLAIN 超过队列长度时跳过
+    """
+
+    def __init__(
+        self,
+        data_source: Any,
+        threshold_ms: float = 1000,
+        buffer_size: int = 100,
+        stack_limit: int = 8,
+        explain: bool = False,
+        explain_interval: float = 1.0,
+        explain_cache_ttl: float = 600.0,
+        explain_queue_size: int = 16,
+    ):
+        if threshold_ms < 0:
+            raise ValueError("threshold_ms must not be negative")
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be positive")
+        self._data_source = data_source
+        self._threshold = threshold_ms / 1000
+        self._stack_limit = stack_limit
+        self._explain = explain
+        self._explain_interval = explain_interval
+        self._explain_cache_ttl = explain_cache_ttl
+        self._lock = threading.Lock()
+        self._records: Deque[SlowQuery] = deque(maxlen=buffer_size)
+        self._explained: "OrderedDict[str, Tuple[float, Dict[str, Any] | None, List[str]]]" = OrderedDict()
+        self._queue: "queue.Queue[Tuple[SlowQuery, str, Any]]" = queue.Queue(maxsize=explain_queue_size)
+        self._worker: threading.Thread | None = None
+
+    def get_threshold(self) -> float:
+        """阈值（秒）"""
+        return self._threshold
+
+    def observe(
+        self,
+        data_source_id: str,
+        sql: str,
+        args: Any,
+        duration: float,
+        error: BaseException | None = None,
+        explainable: bool = True,
+    ):
+        """
+        记录执行时间超过阈值的语句
+
+        Args:
+            args: 参数，为 None 时表示参数已嵌入SQL（批量插入），不执行 EXPLAIN
+            explainable: 能否执行 EXPLAIN，多条语句拼接的SQL不能
+        """
+        if duration < self._threshold:
+            return
+        record = SlowQuery(
+            data_source_id, str(sql), summarize_args(args), duration, _capture_stack(self._stack_limit), error
+        )
+        logger.warning(f"[{data_source_id}] slow query ({duration * 1000:.1f}ms): {record.sql}")
+        with self._lock:
+            self._records.append(record)
+        if self._explain and explainable and args is not None and str(sql).lstrip().upper().startswith(_EXPLAINABLE):
+            self._submit_explain(record, sql, args)
+
+    def _submit_explain(self, record: SlowQuery, sql: str, args: Any):
+        shape = normalize_sql(sql)
+        with self._lock:
+            cached = self._explained.get(shape)
+            if cached is not None and time.monotonic() - cached[0] < self._explain_cache_ttl:
+                record.explain_status = "cached"
+                record.plan, record.issues = cached[1], cached[2]
+                return
+            record.explain_status = "pending"
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_explain, name="pydorm-explain", daemon=True)
+                self._worker.start()
+        try:
+            self._queue.put_nowait((record, sql, args))
+        except queue.Full:
+            record.explain_status = "skipped"
+
+    def _run_explain(self):
+        while True:
+            record, sql, args = self._queue.get()
+            started = time.monotonic()
+            try:
+                plan = self._explain_plan(sql, args)
+                issues = find_plan_issues(plan)
+                with self._lock:
+                    record.plan, record.issues = plan, issues
+                    record.explain_status = "done"
+                    self._explained[normalize_sql(sql)] = (time.monotonic(), plan, issues)
+                    if len(self._explained) > _EXPLAIN_CACHE_MAX_SIZE:
+                        self._explained.popitem(last=False)
+            except Exception as e:
+                logger.warning(f"[{record.data_source_id}] explain slow query failed: {e}")
+                record.explain_status = "failed"
+            time.sleep(max(0.0, self._explain_interval - (time.monotonic() - started)))
+
+    def _explain_plan(self, sql: str, args: Any) -> Dict[str, Any]:
+        operation_id = generate_random_string("E-", 10)
+        conn = self._data_source.get_reusable_connection(for_read=True)
+        try:
+            conn.acquire(operation_id=operation_id)
+            conn.begin_read()
+            plan = self._data_source.get_executor().explain(conn, sql, args)
+            conn.end_read()
+        finally:
+            conn.release(operation_id=operation_id)
+        return json.loads(plan)
+
+    def entries(self, clear: bool = False) -> List[Dict[str, Any]]:
+        """慢查询记录，按时间从旧到新"""
+        with self._lock:
+            records = [record.to_dict() for record in self._records]
+            if clear:
+                self._records.clear()
+        return records
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
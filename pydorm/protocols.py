@@ -1,5 +1,161 @@
-from typing import Protocol
+from typing import Any, Dict, Iterator, List, Protocol, Sequence, Tuple, Type
 
 
 class EntityProtocol(Protocol):
     __table_name__: str
+
+
+class SqlDialect(Protocol):
+    """方言相关的SQL语法，由包装器生成SQL时使用"""
+
+    # 方言名称，同时作为SQL缓存键的一部分
+    name: str
+    # 驱动使用的参数占位符
+    placeholder: str
+
+    def upsert_clause(self, keys: Sequence[str], update_keys: Sequence[str]) -> str:
+        """
+        生成插入语句的冲突更新子句
+
+        Args:
+            keys: 插入的字段
+            update_keys: 冲突时更新的字段
+
+        Returns:
+            追加在 VALUES 之后的子句，以空格开头
+        """
+        ...
+
+
+class ReusableConnection(Protocol):
+    """连接池借用凭证"""
+
+    def get_data_source_id(self) -> str: ...
+
+    def is_locked(self) -> bool: ...
+
+    def acquire(self, timeout: float | None = None, operation_id: str | None = None) -> Any: ...
+
+    def release(self, operation_id: str | None = None) -> Any: ...
+
+    def invalidate(self) -> None: ...
+
+    def begin(self) -> Any: ...
+
+    def begin_read(self, consistent: bool = False) -> Any: ...
+
+    def end_read(self) -> Any: ...
+
+    def commit(self) -> Any: ...
+
+    def rollback(self) -> Any: ...
+
+
+class Executor(Protocol):
+    """SQL执行器，SQL使用 ? 占位符或方言占位符编译后的 CompiledSql"""
+
+    def select_one(self, conn: Any, sql: str, args: Tuple[Any, ...] = ()) -> Dict[str, Any] | None: ...
+
+    def select_many(self, conn: Any, sql: str, args: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]: ...
+
+    def select_tuples(
+        self, conn: Any, sql: str, args: Tuple[Any, ...] = ()
+    ) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]: ...
+
+    def select_iter(
+        self,
+        conn: Any,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+        batch_size: int = 1000,
+        discard_on_close: bool = False,
+    ) -> Iterator[Dict[str, Any]]: ...
+
+    def execute(self, conn: Any, sql: str, args: Tuple[Any, ...] = ()) -> Tuple[int, int]: ...
+
+    def executemany(self, conn: Any, sql: str, args: List[Tuple[Any, ...]]) -> int: ...
+
+    def execute_batch(
+        self, conn: Any, statements: Sequence[Tuple[str, Tuple[Any, ...]]]
+    ) -> Iterator[Tuple[Tuple[str, ...], List[Tuple[Any, ...]], int]]:
+        """按语句顺序返回 (列名, 每行的值, 受影响的行数)，任一语句失败时抛出异常，之后的语句不执行"""
+        ...
+
+    def insert_values(
+        self,
+        conn: Any,
+        prefix: str,
+        suffix: str,
+        rows: Sequence[Tuple[Any, ...]],
+        chunk_rows: int,
+        max_packet_bytes: int,
+    ) -> Iterator[Tuple[int, int]]: ...
+
+
+class TableInspector(Protocol):
+    def load_structure(self, conn: Any, database: str, table: str) -> List[Dict[str, str]]:
+        """
+        读取表结构
+
+        Returns:
+            字段列表，每个字段包含 field_、type_、null_、key_、default_、extra、comment
+        """
+        ...
+
+
+class DataSource(Protocol):
+    """
+    数据源，每种方言实现一个并通过 DataSourceStorage.register 按名称注册
+
+    构造函数的第一个参数为 data_source_id，其余参数来自数据源配置
+    """
+
+    def get_id(self) -> str: ...
+
+    def get_dialect(self) -> str: ...
+
+    def get_sql_dialect(self) -> SqlDialect: ...
+
+    def get_database(self) -> str: ...
+
+    def get_placeholder(self) -> str: ...
+
+    def get_read_mode(self) -> str: ...
+
+    def get_reusable_connection(self, for_read: bool = False) -> Any: ...
+
+    def mark_write(self) -> None: ...
+
+    def get_pool_stats(self) -> Dict[str, Any]: ...
+
+    def get_slow_queries(self, clear: bool = False) -> List[Dict[str, Any]]: ...
+
+    def close(self) -> Any: ...
+
+    def get_executor(self) -> Any: ...
+
+    def is_local_infile_enabled(self) -> bool: ...
+
+    def get_max_allowed_packet(self, conn: Any) -> int: ...
+
+    def get_model(self, database: str | None, table: str) -> Type[Any]: ...
+
+    def remove_model(self, database: str | None, table: str) -> None: ...
+
+    def load_structure(self, database: str, table: str = "") -> List[Dict[str, Any]]: ...
+
+
+class ResultCacheBackend(Protocol):
+    """查询结果缓存的存储后端，值为序列化后的字节串，标签为 数据源ID:表名"""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float, tags: Sequence[str]) -> None: ...
+
+    def invalidate(self, tags: Sequence[str]) -> int:
+        """删除带有任一标签的缓存，返回删除的条数"""
+        ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> Dict[str, Any]: ...
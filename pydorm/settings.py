@@ -1 +1,5 @@
 enable_connection_lock_log = False
+sql_cache_max_size = 1024
+result_cache_max_bytes = 64 * 1024 * 1024
+statement_stats_max_size = 1000
+sql_log_queue_size = 10000
@@ -0,0 +1,9 @@
+from ._reusable_sqlite_connection import ReusableSqliteConnection
+from ._sqlite_connection_pool import SqliteConnectionPool
+from ._sqlite_data_source import SqliteDataSource
+
+__all__ = [
+    "ReusableSqliteConnection",
+    "SqliteConnectionPool",
+    "SqliteDataSource",
+]
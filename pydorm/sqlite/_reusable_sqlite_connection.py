@@ -0,0 +1,125 @@
+import sqlite3
+import time
+
+from loguru import logger
+
+from .. import settings
+from .._instrumentation import PHASE_ACQUIRE, current_event
+from ..errors import ConnectionException
+from ._sqlite_connection_pool import PooledSqliteConnection, SqliteConnectionPool
+
+
+class ReusableSqliteConnection:
+    """
+    SQLite 连接池借用凭证
+
+    与 ReusableMysqlConnection 的接口一致。写凭证借出唯一的写连接，事务以 BEGIN IMMEDIATE 开始，
+    在事务开始时即取得写锁；读凭证借出只读连接，单条读语句不需要事务。
+    """
+
+    def __init__(self, data_source_id: str, pool: SqliteConnectionPool, for_write: bool = True):
+        self._data_source_id = data_source_id
+        self._pool = pool
+        self._for_write = for_write
+        self._pooled: PooledSqliteConnection | None = None
+        self._acquired_at = 0.0
+        self._in_transaction = False
+
+    def get_data_source_id(self) -> str:
+        return self._data_source_id
+
+    def is_locked(self) -> bool:
+        return self._pooled is not None
+
+    def acquire(self, timeout: float | None = None, operation_id: str | None = None):
+        if self._pooled is not None:
+            raise ConnectionException(f"[{self._data_source_id}] Connection already acquired.")
+        if settings.enable_connection_lock_log:
+            logger.debug(
+                "[{}] try to acquire connection with timeout {} seconds.",
+                operation_id,
+                timeout or self._pool.acquire_timeout,
+            )
+        event = current_event()
+        if event is not None:
+            event.lap()
+        self._pooled = self._pool.acquire(self._for_write, timeout)
+        if event is not None:
+            event.lap(PHASE_ACQUIRE)
+        self._acquired_at = time.monotonic()
+        if settings.enable_connection_lock_log:
+            logger.debug("[{}] Connection[{}] acquired.", operation_id, id(self._pooled.raw))
+
+    def release(self, operation_id: str | None = None):
+        pooled = self._pooled
+        if pooled is None:
+            return
+        self._pooled = None
+        if self._in_transaction and not pooled.broken:
+            # 未提交的事务不能带回连接池
+            try:
+                pooled.raw.rollback()
+            except sqlite3.Error as e:
+                logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] rollback on release failed: {e}")
+                pooled.broken = True
+        self._in_transaction = False
+        self._pool.release(pooled, hold_time=time.monotonic() - self._acquired_at)
+        if settings.enable_connection_lock_log:
+            logger.debug("[{}] Connection[{}] released.", operation_id, id(pooled.raw))
+
+    def invalidate(self):
+        """标记当前连接不可复用，release 时由连接池关闭"""
+        if self._pooled is not None:
+            self._pooled.broken = True
+
+    def _check_connection(self) -> PooledSqliteConnection:
+        if self._pooled is None:
+            raise ConnectionException(f"[{self._data_source_id}] Connection must be acquired before use.")
+        return self._pooled
+
+    def cursor(self) -> sqlite3.Cursor:
+        return self._check_connection().raw.cursor()
+
+    def begin(self):
+        pooled = self._check_connection()
+        try:
+            pooled.raw.execute("BEGIN IMMEDIATE" if pooled.for_write else "BEGIN")
+            self._in_transaction = True
+        except sqlite3.Error as e:
+            logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] begin failed: {e}")
+            raise ConnectionException(f"Transaction begin failed: {e}")
+
+    def begin_read(self, consistent: bool = False):
+        """
+        开始只读操作，单条读语句不需要事务
+
+        Args:
+            consistent: 是否需要多条读语句看到同一快照，为 True 时开启事务
+        """
+        if consistent:
+            self.begin()
+
+    def end_read(self):
+        """结束 begin_read 开始的只读操作"""
+        if self._in_transaction:
+            self.commit()
+
+    def commit(self):
+        pooled = self._check_connection()
+        try:
+            pooled.raw.commit()
+            self._in_transaction = False
+        except sqlite3.Error as e:
+            logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] commit failed: {e}")
+            pooled.broken = True
+            raise ConnectionException(f"Transaction commit failed: {e}")
+
+    def rollback(self):
+        pooled = self._check_connection()
+        try:
+            pooled.raw.rollback()
+            self._in_transaction = False
+        except sqlite3.Error as e:
+            logger.error(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] rollback failed: {e}")
+            pooled.broken = True
+            raise ConnectionException(f"Transaction rollback failed: {e}")
@@ -0,0 +1,274 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict
+
+from loguru import logger
+
+from ..errors import ConnectionException
+
+
+class PooledSqliteConnection:
+    """SQLite 连接池中的连接及其元数据"""
+
+    __slots__ = ("raw", "for_write", "created_at", "broken")
+
+    def __init__(self, raw: sqlite3.Connection, for_write: bool):
+        self.raw: sqlite3.Connection = raw
+        self.for_write: bool = for_write
+        self.created_at: float = time.monotonic()
+        self.broken: bool = False
+
+
+class SqliteConnectionPool:
+    """
+    SQLite 连接池，由一个写连接和多个只读连接组成
+
+    SQLite 同一时刻只允许一个写事务，写操作在唯一的写连接上串行执行，避免多个连接争抢写锁时的 busy 重试；
+    WAL 模式下读连接不会被写入阻塞，可以并发读取。max_readers 为 0 时（如内存数据库）读写都使用写连接。
+    """
+
+    def __init__(
+        self,
+        data_source_id: str,
+        create_connection: Callable[[bool], sqlite3.Connection],
+        max_readers: int = 4,
+        acquire_timeout: float = 5,
+        **_: Any,
+    ):
+        """
+        初始化连接池
+
+        Args:
+            data_source_id: 数据源ID
+            create_connection: 创建连接的函数，参数表示是否为写连接
+            max_readers: 最大只读连接数
+            acquire_timeout: 默认的获取连接超时秒数
+        """
+        if max_readers < 0:
+            raise ValueError("max_readers must not be negative")
+
+        self._data_source_id = data_source_id
+        self._create_connection = create_connection
+        self._max_readers = max_readers
+        self._acquire_timeout = acquire_timeout
+
+        self._writer_lock = threading.Lock()
+        self._writer: PooledSqliteConnection | None = None
+
+        self._lock = threading.Lock()
+        self._reader_available = threading.Condition(self._lock)
+        self._idle_readers: Deque[PooledSqliteConnection] = deque()
+        self._reader_count = 0
+        self._reader_waiting = 0
+        self._closed = False
+
+        self._acquire_count = 0
+        self._wait_count = 0
+        self._timeout_count = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._hold_time_ewma = 0.0
+        self._created_count = 0
+        self._closed_count = 0
+
+    @property
+    def acquire_timeout(self) -> float:
+        return self._acquire_timeout
+
+    @property
+    def hold_time_ewma(self) -> float:
+        return self._hold_time_ewma
+
+    def acquire(self, for_write: bool = True, timeout: float | None = None) -> PooledSqliteConnection:
+        """
+        借出一个连接
+
+        Args:
+            for_write: 是否借出写连接，未配置只读连接时总是借出写连接
+            timeout: 等待超时秒数，None 时使用连接池默认值
+
+        Returns:
+            借出的连接
+        """
+        if timeout is None:
+            timeout = self._acquire_timeout
+        if self._closed:
+            raise ConnectionException(f"[{self._data_source_id}] Connection pool is closed.")
+        if for_write or self._max_readers == 0:
+            return self._acquire_writer(timeout)
+        return self._acquire_reader(timeout)
+
+    def _acquire_writer(self, timeout: float) -> PooledSqliteConnection:
+        start = time.monotonic()
+        if not self._writer_lock.acquire(blocking=False):
+            if not self._writer_lock.acquire(timeout=timeout):
+                with self._lock:
+                    self._timeout_count += 1
+                raise ConnectionException(
+                    f"[{self._data_source_id}] Failed to acquire writer connection within {timeout} seconds."
+                )
+            self._record_wait(time.monotonic() - start)
+
+        try:
+            if self._writer is None:
+                self._writer = PooledSqliteConnection(self._open(True), True)
+        except BaseException:
+            self._writer_lock.release()
+            raise
+        with self._lock:
+            self._acquire_count += 1
+        return self._writer
+
+    def _acquire_reader(self, timeout: float) -> PooledSqliteConnection:
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+        with self._lock:
+            while not self._idle_readers and self._reader_count >= self._max_readers:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeout_count += 1
+                    raise ConnectionException(
+                        f"[{self._data_source_id}] Failed to acquire reader connection within {timeout} seconds."
+                    )
+                waited = True
+                self._reader_waiting += 1
+                try:
+                    self._reader_available.wait(remaining)
+                finally:
+                    self._reader_waiting -= 1
+            self._acquire_count += 1
+            if self._idle_readers:
+                pooled = self._idle_readers.pop()
+            else:
+                self._reader_count += 1
+                pooled = None
+        if waited:
+            self._record_wait(time.monotonic() - start)
+        if pooled is not None:
+            return pooled
+
+        try:
+            return PooledSqliteConnection(self._open(False), False)
+        except BaseException:
+            with self._lock:
+                self._reader_count -= 1
+                self._reader_available.notify()
+            raise
+
+    def _record_wait(self, wait_time: float):
+        with self._lock:
+            self._wait_count += 1
+            self._total_wait_time += wait_time
+            if wait_time > self._max_wait_time:
+                self._max_wait_time = wait_time
+
+    def _open(self, for_write: bool) -> sqlite3.Connection:
+        try:
+            raw = self._create_connection(for_write)
+        except Exception as e:
+            raise ConnectionException(f"Failed to create connection: {e}")
+        with self._lock:
+            self._created_count += 1
+        return raw
+
+    def release(self, pooled: PooledSqliteConnection, hold_time: float | None = None):
+        """
+        归还连接
+
+        Args:
+            pooled: 借出的连接
+            hold_time: 本次借用时长，用于统计
+        """
+        discard = pooled.broken or self._closed
+        if discard:
+            self._close_raw(pooled)
+
+        with self._lock:
+            if hold_time is not None:
+                self._hold_time_ewma = (
+                    hold_time if self._hold_time_ewma == 0 else self._hold_time_ewma * 0.9 + hold_time * 0.1
+                )
+            if not pooled.for_write:
+                if discard:
+                    self._reader_count -= 1
+                else:
+                    self._idle_readers.append(pooled)
+                self._reader_available.notify()
+
+        if pooled.for_write:
+            if discard:
+                self._writer = None
+            self._writer_lock.release()
+
+    def replace(self, pooled: PooledSqliteConnection):
+        """关闭并重建借出中的连接"""
+        old_conn_id = id(pooled.raw)
+        self._close_raw(pooled)
+        try:
+            pooled.raw = self._open(pooled.for_write)
+        except ConnectionException as e:
+            pooled.broken = True
+            logger.error(f"[{self._data_source_id}] Failed to recreate connection: {e}")
+            raise
+        pooled.created_at = time.monotonic()
+        pooled.broken = False
+        logger.info(f"[{self._data_source_id}] Connection[{old_conn_id}] -> [{id(pooled.raw)}] recreated.")
+
+    def _close_raw(self, pooled: PooledSqliteConnection):
+        try:
+            pooled.raw.close()
+            logger.info(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] closed.")
+        except sqlite3.Error as e:
+            logger.warning(f"[{self._data_source_id}] Connection[{id(pooled.raw)}] close failed: {e}")
+        with self._lock:
+            self._closed_count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取连接池统计信息
+
+        Returns:
+            包含连接数、等待次数、等待耗时等指标的字典
+        """
+        with self._lock:
+            idle_readers = len(self._idle_readers)
+            return {
+                "writer_in_use": self._writer_lock.locked(),
+                "readers": self._reader_count,
+                "idle_readers": idle_readers,
+                "in_use_readers": self._reader_count - idle_readers,
+                "waiting_readers": self._reader_waiting,
+                "max_readers": self._max_readers,
+                "acquire_count": self._acquire_count,
+                "wait_count": self._wait_count,
+                "timeout_count": self._timeout_count,
+                "total_wait_time": self._total_wait_time,
+                "avg_wait_time": self._total_wait_time / self._wait_count if self._wait_count else 0.0,
+                "max_wait_time": self._max_wait_time,
+                "hold_time_ewma": self._hold_time_ewma,
+                "created_count": self._created_count,
+                "closed_count": self._closed_count,
+            }
+
+    def close(self):
+        """关闭连接池，借出中的连接在归还时关闭"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            idle = list(self._idle_readers)
+            self._idle_readers.clear()
+            self._reader_count -= len(idle)
+            self._reader_available.notify_all()
+        for pooled in idle:
+            self._close_raw(pooled)
+        if self._writer_lock.acquire(blocking=False):
+            try:
+                if self._writer is not None:
+                    self._close_raw(self._writer)
+                    self._writer = None
+            finally:
+                self._writer_lock.release()
@@ -0,0 +1,165 @@
+import sqlite3
+from dataclasses import field, make_dataclass
+from typing import Any, Dict, List, Type
+
+from loguru import logger
+
+from ._reusable_sqlite_connection import ReusableSqliteConnection
+from ._sqlite_connection_pool import SqliteConnectionPool
+from ._sqlite_dialect import SqliteDialect, sqlite_dialect
+from ._sqlite_executor import SqliteExecutor, sqlite_executor
+from ._sqlite_table_inspector import sqlite_table_inspector
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+class SqliteDataSource:
+    def __init__(
+        self,
+        data_source_id: str,
+        database: str,
+        pool: Dict[str, Any] | None = None,
+        journal_mode: str = "wal",
+        pragmas: Dict[str, Any] | None = None,
+        busy_timeout: float = 5.0,
+        **options: Any,
+    ):
+        """
+        Args:
+            database: 数据库文件路径，":memory:" 或 file: 开头的 URI
+            pool: 连接池配置，见 SqliteConnectionPool
+            journal_mode: 日志模式，默认 wal，读连接不会被写入阻塞
+            pragmas: 每个连接建立后执行的 PRAGMA，默认 synchronous=NORMAL
+            busy_timeout: 等待其他进程释放数据库锁的秒数
+            options: 传递给 sqlite3.connect 的其他参数
+        """
+        self._data_source_id: str = data_source_id
+        self._dialect: str = "sqlite"
+        self._database: str = database
+        self._journal_mode: str = journal_mode
+        self._pragmas: Dict[str, Any] = {"synchronous": "NORMAL", **(pragmas or {})}
+        self._busy_timeout: float = busy_timeout
+        self._options: Dict[str, Any] = options
+
+        pool_config = dict(pool or {})
+        if self.is_memory():
+            # 内存数据库不能跨连接共享，读写都使用写连接
+            pool_config["max_readers"] = 0
+        self._pool: SqliteConnectionPool = SqliteConnectionPool(
+            self._data_source_id,
+            self.create_connection,
+            **pool_config,
+        )
+        self._executor: SqliteExecutor = sqlite_executor
+        self._models: Dict[str, Type[Any]] = {}
+
+    def get_id(self) -> str:
+        return self._data_source_id
+
+    def get_dialect(self) -> str:
+        return self._dialect
+
+    def get_database(self) -> str:
+        return self._database
+
+    def get_sql_dialect(self) -> SqliteDialect:
+        return sqlite_dialect
+
+    def get_placeholder(self) -> str:
+        return sqlite_dialect.placeholder
+
+    def get_read_mode(self) -> str:
+        return "autocommit"
+
+    def is_memory(self) -> bool:
+        return self._database == ":memory:" or "mode=memory" in self._database
+
+    def create_connection(self, for_write: bool = True) -> sqlite3.Connection:
+        try:
+            conn = sqlite3.connect(
+                self._database,
+                timeout=self._busy_timeout,
+                isolation_level=None,  # 由 ReusableSqliteConnection 显式管理事务
+                check_same_thread=False,  # 连接由连接池在线程间传递，同一时刻只有一个线程使用
+                uri=self._database.startswith("file:"),
+                **self._options,
+            )
+            conn.row_factory = _dict_row
+            if for_write and not self.is_memory():
+                conn.execute(f"PRAGMA journal_mode={self._journal_mode}")
+            for name, value in self._pragmas.items():
+                conn.execute(f"PRAGMA {name}={value}")
+            if not for_write:
+                conn.execute("PRAGMA query_only=1")
+            logger.info(f"[{self._data_source_id}] create {'writer' if for_write else 'reader'} connection [{id(conn)}]")
+            return conn
+        except Exception as e:
+            logger.error(f"[{self._data_source_id}] Failed to create connection: {e}")
+            raise
+
+    def get_reusable_connection(self, for_read: bool = False) -> ReusableSqliteConnection:
+        """
+        获取连接
+
+        Args:
+            for_read: 是否为只读请求，只读请求使用读连接，其余使用唯一的写连接
+        """
+        return ReusableSqliteConnection(self._data_source_id, self._pool, not for_read)
+
+    def mark_write(self):
+        """SQLite 没有副本，读写始终一致"""
+
+    def get_pool(self):
+        return self._pool
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息"""
+        return self._pool.stats()
+
+    def get_slow_queries(self, clear: bool = False) -> List[Dict[str, Any]]:
+        """SQLite 数据源不记录慢查询"""
+        return []
+
+    def close(self):
+        """关闭数据源和相关连接"""
+        self._pool.close()
+        logger.info(f"[{self._data_source_id}] DataSource closed")
+
+    def get_executor(self) -> SqliteExecutor:
+        return self._executor
+
+    def is_local_infile_enabled(self) -> bool:
+        return False
+
+    # noinspection PyMethodMayBeStatic
+    def get_max_allowed_packet(self, conn: ReusableSqliteConnection) -> int:
+        """SQLite 按参数个数分块，返回默认的 SQLITE_MAX_SQL_LENGTH"""
+        return 1_000_000_000
+
+    def get_model(self, database: str | None, table: str) -> Type[Any]:
+        key = f"{database or self._database}.{table}"
+        if key not in self._models:
+            table_structure: List[Dict] = sqlite_table_inspector.load_structure(
+                self.get_reusable_connection(for_read=True), self._database, table
+            )
+            fields = [(table_field["field_"], any, field(default=None)) for table_field in table_structure]
+            self._models[key] = make_dataclass(table, fields=fields)
+        return self._models[key]
+
+    def remove_model(self, database: str | None, table: str):
+        key = f"{database or self._database}.{table}"
+        if key in self._models:
+            del self._models[key]
+            logger.info(f"[{self._data_source_id}] Model {key} removed")
+        else:
+            logger.warning(f"[{self._data_source_id}] Model {key} not found")
+
+    def load_structure(self, database: str, table: str = "") -> List[Dict[str, Any]]:
+        """加载数据源的表结构，SQLite 忽略 database"""
+        if not table:
+            raise ValueError("Table name must be provided to load structure")
+        return sqlite_table_inspector.load_structure(
+            self.get_reusable_connection(for_read=True), database or self._database, table
+        )
@@ -0,0 +1,16 @@
+from typing import Sequence
+
+
+class SqliteDialect:
+    """SQLite 语法"""
+
+    name = "sqlite"
+    placeholder = "?"
+
+    # noinspection PyMethodMayBeStatic
+    def upsert_clause(self, keys: Sequence[str], update_keys: Sequence[str]) -> str:
+        # 省略冲突目标时任一唯一约束冲突都会更新，与 ON DUPLICATE KEY UPDATE 一致，需要 SQLite 3.35+
+        return f' ON CONFLICT DO UPDATE SET {",".join([f"{k}=excluded.{k}" for k in update_keys])}'
+
+
+sqlite_dialect = SqliteDialect()
@@ -0,0 +1,344 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .._instrumentation import current_event
+from .._sql_log import sql_log
+from ._reusable_sqlite_connection import ReusableSqliteConnection
+
+# 单条语句允许的最大参数个数，3.32.0 之前为 999
+MAX_VARIABLE_NUMBER = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+_SEQUENCE_TYPES = (tuple, list, set, frozenset)
+
+
+class SqliteExecutor:
+    """SQLite数据库执行器，与 MysqlExecutor 的接口一致"""
+
+    def __init__(self, log_sql: bool = True):
+        """
+        初始化SQLite执行器
+
+        Args:
+            log_sql: 是否记录SQL日志
+        """
+        self.log_sql = log_sql
+
+    def _log_execution(
+        self,
+        conn: ReusableSqliteConnection,
+        sql: str,
+        args: Any,
+        duration: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """记录SQL执行日志，按数据源的日志策略采样，格式化在后台线程中进行"""
+        if not self.log_sql:
+            return
+
+        sql_log.emit(conn.get_data_source_id(), id(conn), sql, args, duration, error)
+
+    # noinspection PyMethodMayBeStatic
+    def _prepare_sql(self, sql: str, args: Sequence[Any]) -> Tuple[str, Sequence[Any]]:
+        """
+        sqlite3 不能绑定序列参数，将 IN 条件的 ? 展开为 (?,?,...) 并展开对应的参数
+
+        Returns:
+            (SQL, 参数)
+        """
+        if not any(isinstance(arg, _SEQUENCE_TYPES) for arg in args):
+            return sql, args
+
+        parts = sql.split("?")
+        if len(parts) != len(args) + 1:
+            raise ValueError(f"placeholder count {len(parts) - 1} does not match argument count {len(args)}")
+        pieces: List[str] = [parts[0]]
+        flat_args: List[Any] = []
+        for arg, part in zip(args, parts[1:]):
+            if isinstance(arg, _SEQUENCE_TYPES):
+                if len(arg) == 0:
+                    raise ValueError("empty sequence is not allowed in IN condition")
+                pieces.append(f'({",".join(["?"] * len(arg))})')
+                flat_args.extend(arg)
+            else:
+                pieces.append("?")
+                flat_args.append(arg)
+            pieces.append(part)
+        return "".join(pieces), flat_args
+
+    @contextmanager
+    def _get_cursor(self, conn: ReusableSqliteConnection, sql: str | None = None, args: Any = None):
+        """
+        获取游标的上下文管理器
+
+        Args:
+            sql: 传入时计时，执行后记录日志，耗时包含读取结果
+            args: 记录的参数，为 None 时表示参数已嵌入SQL
+        """
+        timed = sql is not None and self.log_sql
+        start = time.perf_counter() if timed else 0.0
+        error: BaseException | None = None
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        except sqlite3.Error as e:
+            error = e
+            raise
+        finally:
+            cursor.close()
+            if timed:
+                self._log_execution(conn, sql, args, time.perf_counter() - start, error)
+
+    def select_one(
+        self,
+        conn: ReusableSqliteConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> Dict[str, Any] | None:
+        """
+        执行查询并返回单行结果
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            查询结果字典或None
+        """
+        event = current_event()
+        with self._get_cursor(conn, sql, args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(*self._prepare_sql(sql, args))
+            if event is not None:
+                event.after_execute()
+            row = cursor.fetchone()
+            if event is not None:
+                event.after_fetch(0 if row is None else 1)
+            return row
+
+    def select_many(
+        self,
+        conn: ReusableSqliteConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        执行查询并返回多行结果
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            查询结果列表
+        """
+        event = current_event()
+        with self._get_cursor(conn, sql, args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(*self._prepare_sql(sql, args))
+            if event is not None:
+                event.after_execute()
+            rows = cursor.fetchall()
+            if event is not None:
+                event.after_fetch(len(rows))
+            return rows
+
+    def select_tuples(
+        self,
+        conn: ReusableSqliteConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        """
+        执行查询并以元组返回多行结果，不为每行构造字典
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            (列名, 每行的值)
+        """
+        with self._get_cursor(conn, sql, args) as cursor:
+            cursor.row_factory = None
+            event = current_event()
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(*self._prepare_sql(sql, args))
+            if event is not None:
+                event.after_execute()
+            columns = tuple(column[0] for column in cursor.description or ())
+            rows = cursor.fetchall()
+            if event is not None:
+                event.after_fetch(len(rows))
+            return columns, rows
+
+    def select_iter(
+        self,
+        conn: ReusableSqliteConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+        batch_size: int = 1000,
+        discard_on_close: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐行返回查询结果，SQLite 的游标本身按需读取，提前关闭不需要废弃连接
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+            batch_size: 每次读取的行数
+            discard_on_close: 为兼容 MysqlExecutor 保留，不生效
+
+        Returns:
+            查询结果迭代器
+        """
+        self._log_execution(conn, sql, args)
+
+        with self._get_cursor(conn) as cursor:
+            cursor.execute(*self._prepare_sql(sql, args))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def execute(
+        self,
+        conn: ReusableSqliteConnection,
+        sql: str,
+        args: Tuple[Any, ...] = (),
+    ) -> Tuple[int, int]:
+        """
+        执行SQL语句（INSERT、UPDATE、DELETE）
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数元组
+
+        Returns:
+            (受影响的行数, 最后插入的行ID)
+        """
+        event = current_event()
+        with self._get_cursor(conn, sql, args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.execute(*self._prepare_sql(sql, args))
+            row_affected = max(cursor.rowcount, 0)
+            if event is not None:
+                event.after_execute(row_affected)
+            return row_affected, cursor.lastrowid or 0
+
+    def executemany(
+        self,
+        conn: ReusableSqliteConnection,
+        sql: str,
+        args: List[Tuple[Any, ...]],
+    ) -> int:
+        """
+        批量执行SQL语句
+
+        Args:
+            conn: 数据库连接
+            sql: SQL语句
+            args: 参数列表
+
+        Returns:
+            受影响的总行数
+        """
+        event = current_event()
+        with self._get_cursor(conn, sql, args) as cursor:
+            if event is not None:
+                event.before_execute(sql)
+            cursor.executemany(sql, args)
+            row_affected = max(cursor.rowcount, 0)
+            if event is not None:
+                event.after_execute(row_affected)
+            return row_affected
+
+    def execute_batch(
+        self,
+        conn: ReusableSqliteConnection,
+        statements: Sequence[Tuple[str, Tuple[Any, ...]]],
+    ) -> Iterator[Tuple[Tuple[str, ...], List[Tuple[Any, ...]], int]]:
+        """
+        依次执行多条语句，与 MysqlExecutor 的接口一致。SQLite 在进程内执行，没有网络往返，逐条执行即可
+
+        Returns:
+            按语句顺序返回 (列名, 每行的值, 受影响的行数) 的迭代器
+        """
+        for sql, args in statements:
+            with self._get_cursor(conn, sql, args) as cursor:
+                cursor.row_factory = None
+                event = current_event()
+                if event is not None:
+                    event.before_execute(sql)
+                cursor.execute(*self._prepare_sql(sql, args))
+                if cursor.description is None:
+                    row_affected = max(cursor.rowcount, 0)
+                    if event is not None:
+                        event.after_execute(row_affected)
+                    yield (), [], row_affected
+                    continue
+                if event is not None:
+                    event.after_execute()
+                columns = tuple(column[0] for column in cursor.description)
+                rows = cursor.fetchall()
+                if event is not None:
+                    event.after_fetch(len(rows))
+                yield columns, rows, len(rows)
+
+    def insert_values(
+        self,
+        conn: ReusableSqliteConnection,
+        prefix: str,
+        suffix: str,
+        rows: Sequence[Tuple[Any, ...]],
+        chunk_rows: int,
+        max_packet_bytes: int,
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        将数据分块为多行 VALUES 的插入语句依次执行，每块执行后返回一次
+
+        SQLite 使用参数绑定，每块的大小受 chunk_rows 和单条语句的参数个数上限限制，max_packet_bytes 不生效
+
+        Args:
+            conn: 数据库连接
+            prefix: INSERT ... VALUES 前缀
+            suffix: ON CONFLICT 后缀
+            rows: 每行的参数
+            chunk_rows: 每块最多的行数
+            max_packet_bytes: 为兼容 MysqlExecutor 保留
+
+        Returns:
+            每块的 (行数, 受影响的行数) 迭代器
+        """
+        if len(rows) == 0:
+            return
+        column_count = len(rows[0])
+        chunk_rows = max(1, min(chunk_rows, MAX_VARIABLE_NUMBER // column_count))
+        row_placeholder = f'({",".join(["?"] * column_count)})'
+
+        for start in range(0, len(rows), chunk_rows):
+            chunk = rows[start : start + chunk_rows]
+            sql = f'{prefix}{",".join([row_placeholder] * len(chunk))}{suffix}'
+            with self._get_cursor(conn, f"{prefix}... ({len(chunk)} rows){suffix}") as cursor:
+                event = current_event()
+                if event is not None:
+                    event.before_execute(f"{prefix}...{suffix}")
+                cursor.execute(sql, [value for row in chunk for value in row])
+                row_affected = max(cursor.rowcount, 0)
+                if event is not None:
+                    event.after_execute(row_affected)
+                yield len(chunk), row_affected
+
+
+sqlite_executor = SqliteExecutor()
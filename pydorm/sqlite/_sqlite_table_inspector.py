@@ -0,0 +1,41 @@
+from typing import Dict, List
+
+from ._reusable_sqlite_connection import ReusableSqliteConnection
+
+
+class SqliteTableInspector:
+
+    # noinspection PyMethodMayBeStatic
+    def load_structure(self, conn: ReusableSqliteConnection, database: str, table: str) -> List[Dict[str, str]]:
+        """通过 PRAGMA table_info 读取表结构，返回与 MysqlTableInspector 相同的格式，database 不生效"""
+        need_acquire = not conn.is_locked()
+        if need_acquire:
+            conn.acquire()
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"PRAGMA table_info({table})")
+                rows = cursor.fetchall()
+                if len(rows) == 0:
+                    raise ValueError(f"table {table} not found")
+                table_fields: List[Dict[str, str]] = []
+                for row in rows:
+                    table_field = dict(
+                        field_=row["name"],
+                        type_=row["type"],
+                        null_="NO" if row["notnull"] else "YES",
+                        key_="PRI" if row["pk"] else "",
+                        default_=row["dflt_value"],
+                        extra="",
+                        comment="",
+                    )
+                    table_fields.append(table_field)
+                return table_fields
+            finally:
+                cursor.close()
+        finally:
+            if need_acquire:
+                conn.release()
+
+
+sqlite_table_inspector = SqliteTableInspector()
@@ -0,0 +1,37 @@
+import base64
+import json
+from typing import Any, Tuple
+
+
+def encode_cursor(values: Tuple[Any, ...]) -> str:
+    """
+    将分页键值编码为不透明的游标字符串。
+
+    Args:
+        values (Tuple[Any, ...]): 最后一行的分页键值。
+
+    Returns:
+        str: URL 安全的游标字符串。
+    """
+    raw = json.dumps(list(values), default=str, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ...]:
+    """
+    解析 encode_cursor 生成的游标字符串。
+
+    Args:
+        cursor (str): 游标字符串。
+
+    Returns:
+        Tuple[Any, ...]: 分页键值。
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"invalid cursor: {cursor}")
+    return tuple(values)
@@ -0,0 +1,55 @@
+import datetime
+import decimal
+import json
+from typing import Any, Iterable
+
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+
+def encode_tsv_value(value: Any) -> bytes:
+    """
+    将值编码为 LOAD DATA 默认格式（制表符分隔、反斜杠转义）的字段。
+
+    Args:
+        value (Any): 字段值，None 编码为 \\N。
+
+    Returns:
+        bytes: UTF-8 编码的字段内容。
+    """
+    if value is None:
+        return b"\\N"
+    if isinstance(value, bool):
+        return b"1" if value else b"0"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value).encode("ascii")
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+        return (
+            raw.replace(b"\\", b"\\\\")
+            .replace(b"\t", b"\\t")
+            .replace(b"\n", b"\\n")
+            .replace(b"\r", b"\\r")
+            .replace(b"\0", b"\\0")
+        )
+    if isinstance(value, datetime.datetime):
+        text = value.isoformat(" ")
+    elif isinstance(value, (datetime.date, datetime.time)):
+        text = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        text = json.dumps(value, ensure_ascii=False, default=str)
+    else:
+        text = str(value)
+    return text.translate(_ESCAPE_TABLE).encode("utf-8")
+
+
+def encode_tsv_row(values: Iterable[Any]) -> bytes:
+    """
+    将一行数据编码为以换行结尾的 TSV 行。
+
+    Args:
+        values (Iterable[Any]): 一行的字段值。
+
+    Returns:
+        bytes: 编码后的行。
+    """
+    return b"\t".join([encode_tsv_value(value) for value in values]) + b"\n"
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+
+import pytest
+
+from pydorm import dorm
+
+
+@dataclass
+class User:
+    __table_name__ = "user"
+    __primary_key__ = "id"
+
+    id: int | None = None
+    name: str | None = None
+    age: int | None = None
+
+
+@pytest.fixture(scope="session")
+def sqlite_dorm(tmp_path_factory: pytest.TempPathFactory):
+    database = tmp_path_factory.mktemp("pydorm") / "test.db"
+    dorm.init(
+        {
+            "data_source": {"default": {"dialect": "sqlite", "database": str(database)}},
+            "sql_log": {"level": "off"},
+        }
+    )
+    return dorm
+
+
+@pytest.fixture
+def user_table(sqlite_dorm):
+    dorm.raw_query("CREATE TABLE user (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, age INTEGER)", ())
+    yield
+    dorm.disable_result_cache()
+    dorm.raw_query("DROP TABLE user", ())
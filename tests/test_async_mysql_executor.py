@@ -0,0 +1,74 @@
+import asyncio
+from typing import Any
+
+import pymysql
+import pytest
+
+from pydorm.errors import ConnectionException
+from pydorm.mysql._async_mysql_executor import AsyncMysqlExecutor
+
+
+class _FakeCursor:
+    rowcount = 0
+
+    def __init__(self, error: BaseException | None):
+        self._error = error
+        self.closed = False
+
+    async def execute(self, sql: str, args: Any = None):
+        if self._error is None:
+            # 等待服务端响应，直到被取消
+            await asyncio.sleep(10)
+        raise self._error
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeConnection:
+    def __init__(self, error: BaseException | None = None):
+        self.fake_cursor = _FakeCursor(error)
+        self.broken = False
+
+    def get_data_source_id(self) -> str:
+        return "default"
+
+    async def cursor(self) -> _FakeCursor:
+        return self.fake_cursor
+
+    def invalidate(self):
+        self.broken = True
+
+
+def test_cancelled_statement_invalidates_connection():
+    conn = _FakeConnection()
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(AsyncMysqlExecutor(log_sql=False).select_many(conn, "SELECT 1"), 0.01))
+
+    assert conn.broken
+    assert not conn.fake_cursor.closed
+
+
+@pytest.mark.parametrize(
+    "error", [pymysql.err.OperationalError(2013, "Lost connection"), pymysql.err.InterfaceError(0, "")]
+)
+def test_disconnect_invalidates_connection(error):
+    conn = _FakeConnection(error)
+
+    with pytest.raises(ConnectionException) as exc_info:
+        asyncio.run(AsyncMysqlExecutor(log_sql=False).select_many(conn, "SELECT 1"))
+
+    assert exc_info.value.__cause__ is error
+    assert conn.broken
+
+
+def test_statement_error_keeps_connection():
+    error = pymysql.err.ProgrammingError(1064, "You have an error in your SQL syntax")
+    conn = _FakeConnection(error)
+
+    with pytest.raises(pymysql.err.ProgrammingError):
+        asyncio.run(AsyncMysqlExecutor(log_sql=False).select_many(conn, "SELECT"))
+
+    assert not conn.broken
+    assert conn.fake_cursor.closed
@@ -0,0 +1,54 @@
+import pytest
+
+from pydorm import dorm
+from pydorm.errors import BatchAbortedException
+
+from .conftest import User
+
+pytestmark = pytest.mark.usefixtures("user_table")
+
+
+def test_batch_executes_on_exit():
+    dorm.insert_bulk(User, [{"name": "a", "age": 1}, {"name": "b", "age": 2}])
+
+    with dorm.batch() as batch:
+        user = batch.find(dorm.qw(User).eq("id", 1))
+        users = batch.list(dorm.qw(User).asc("id"))
+        total = batch.count(dorm.qw(User))
+        updated = batch.update(dorm.uw(User).eq("id", 2).set(age=3))
+        assert not user.done()
+
+    assert user.get() == User(id=1, name="a", age=1)
+    assert [u.name for u in users.get()] == ["a", "b"]
+    assert total.get() == 2
+    assert updated.get() == 1
+    assert dorm.find(dorm.qw(User).eq("id", 2)).age == 3
+
+
+def test_batch_aborts_after_failed_statement():
+    dorm.insert_bulk(User, [{"name": "a", "age": 1}, {"name": "b", "age": 2}])
+
+    with pytest.raises(Exception) as exc_info:
+        with dorm.batch() as batch:
+            updated = batch.update(dorm.uw(User).eq("id", 1).set(age=10))
+            # 违反主键约束
+            failed = batch.update(dorm.uw(User).eq("id", 2).set(id=1))
+            deleted = batch.delete(dorm.dw(User).eq("id", 1))
+
+    assert not isinstance(exc_info.value, BatchAbortedException)
+    assert updated.get() == 1
+    assert failed.exception() is exc_info.value
+    with pytest.raises(BatchAbortedException):
+        deleted.get()
+    # 含写入的批量在一个事务中执行，失败时整体回滚
+    assert dorm.find(dorm.qw(User).eq("id", 1)).age == 1
+    assert dorm.count(dorm.qw(User)) == 2
+
+
+def test_batch_future_before_execute():
+    with dorm.batch() as batch:
+        total = batch.count(dorm.qw(User))
+        with pytest.raises(ValueError):
+            total.get()
+
+    assert total.get() == 0
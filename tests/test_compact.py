@@ -0,0 +1,112 @@
+import dataclasses
+import pickle
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from pydorm import compact, dorm
+
+
+@compact
+class Book:
+    __table_name__ = "book"
+
+    id: int | None = None
+    title: str | None = None
+    price: int = 0
+    tags: List[str] = field(default_factory=list)
+
+
+@compact
+@dataclass(frozen=True)
+class FrozenBook:
+    __table_name__ = "book"
+    __cache_ttl__ = 60
+
+    id: int
+    title: str
+    price: int = 0
+
+
+@compact
+@dataclass
+class RequiredBook:
+    __table_name__ = "book"
+
+    id: int
+    title: str
+
+
+@pytest.fixture(autouse=True)
+def book_table(sqlite_dorm):
+    dorm.raw_query("CREATE TABLE book (id INTEGER PRIMARY KEY, title TEXT, price INTEGER, tags TEXT)", ())
+    dorm.raw_query("INSERT INTO book (id, title, price) VALUES (1, 'a', 10), (2, 'b', 20), (3, 'c', 30)", ())
+    yield
+    dorm.disable_result_cache()
+    dorm.raw_query("DROP TABLE book", ())
+
+
+def test_compact_entity_has_slots():
+    book = Book(id=1, title="a")
+
+    assert not hasattr(book, "__dict__")
+    assert dataclasses.is_dataclass(book)
+    assert compact(Book) is Book
+    with pytest.raises(AttributeError):
+        book.unknown = 1  # type: ignore[attr-defined]
+
+
+def test_list_and_find():
+    books = dorm.list(dorm.qw(Book).select("id", "title", "price").asc("id"))
+
+    assert books == [Book(1, "a", 10), Book(2, "b", 20), Book(3, "c", 30)]
+    assert dorm.find(dorm.qw(Book).select("id", "title", "price").eq("id", 2)) == Book(2, "b", 20)
+    assert dorm.find(dorm.qw(Book).eq("id", 4)) is None
+
+
+def test_page_after():
+    books, after, _ = dorm.page_after(dorm.qw(Book).select("id", "title").asc("id"), size=2)
+    assert [book.id for book in books] == [1, 2]
+
+    books, after, _ = dorm.page_after(dorm.qw(Book).select("id", "title").asc("id"), after, size=2)
+    assert [book.id for book in books] == [3]
+    assert after is None
+
+
+def test_unselected_fields_use_defaults():
+    books = dorm.list(dorm.qw(Book).select("id", "title").asc("id"))
+
+    assert books[0] == Book(id=1, title="a", price=0, tags=[])
+    # default_factory 每个实体生成新的值
+    assert books[0].tags is not books[1].tags
+
+
+def test_columns_in_any_order():
+    assert dorm.find(dorm.qw(Book).select("price", "id").eq("id", 1)) == Book(id=1, price=10)
+
+
+def test_unselected_field_without_default():
+    with pytest.raises(ValueError):
+        dorm.list(dorm.qw(RequiredBook).select("id"))
+
+
+def test_frozen_entity():
+    book = dorm.find(dorm.qw(FrozenBook).eq("id", 1))
+
+    assert book == FrozenBook(1, "a", 10)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        book.title = "b"  # type: ignore[misc]
+    assert pickle.loads(pickle.dumps(book)) == book
+
+
+def test_frozen_entity_through_result_cache():
+    dorm.enable_result_cache()
+
+    first = dorm.list(dorm.qw(FrozenBook).asc("id"))
+    cached = dorm.list(dorm.qw(FrozenBook).asc("id"))
+
+    assert dorm.result_cache_stats()["hits"] == 1
+    assert cached == first
+    assert cached[0] is not first[0]
+    assert isinstance(cached[0], FrozenBook)
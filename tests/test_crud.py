@@ -0,0 +1,67 @@
+import pytest
+
+from pydorm import dorm
+
+from .conftest import User
+
+pytestmark = pytest.mark.usefixtures("user_table")
+
+
+def test_insert_and_find():
+    row_affected, last_id = dorm.insert(User, {"name": "alice", "age": 20})
+    assert row_affected == 1
+
+    user = dorm.find(dorm.qw(User).eq("id", last_id))
+    assert user == User(id=last_id, name="alice", age=20)
+    assert dorm.find(dorm.qw(User).eq("id", last_id + 1)) is None
+
+
+def test_insert_entity():
+    dorm.insert(User, User(name="bob", age=30))
+
+    assert dorm.find_dict(dorm.qw(User).eq("name", "bob")) == {"id": 1, "name": "bob", "age": 30}
+
+
+def test_list_and_count():
+    for age in (18, 25, 40):
+        dorm.insert(User, {"name": f"u{age}", "age": age})
+
+    users = dorm.list(dorm.qw(User).ge("age", 20).desc("age"))
+    assert [user.age for user in users] == [40, 25]
+    assert dorm.count(dorm.qw(User).lt("age", 30)) == 2
+    assert dorm.list(dorm.qw(User).select("name").in_("age", (18, 40)).asc("age")) == [
+        User(name="u18"),
+        User(name="u40"),
+    ]
+
+
+def test_update():
+    _, last_id = dorm.insert(User, {"name": "carol", "age": 20})
+
+    assert dorm.update(dorm.uw(User).eq("id", last_id).set(age=21)) == 1
+    assert dorm.find(dorm.qw(User).eq("id", last_id)).age == 21
+    assert dorm.update(dorm.uw(User).eq("id", last_id + 1).set(age=22)) == 0
+
+
+def test_delete():
+    _, last_id = dorm.insert(User, {"name": "dave", "age": 20})
+
+    assert dorm.delete(dorm.dw(User).eq("id", last_id)) == 1
+    assert dorm.find(dorm.qw(User).eq("id", last_id)) is None
+
+
+def test_rollback():
+    conn = dorm.begin()
+    dorm.insert(User, {"name": "erin", "age": 20}, conn=conn)
+    assert dorm.count(dorm.qw(User), conn=conn) == 1
+    dorm.rollback(conn)
+
+    assert dorm.count(dorm.qw(User)) == 0
+
+
+def test_commit():
+    conn = dorm.begin()
+    dorm.insert(User, {"name": "frank", "age": 20}, conn=conn)
+    dorm.commit(conn)
+
+    assert dorm.count(dorm.qw(User)) == 1
@@ -0,0 +1,132 @@
+from typing import List
+
+import pytest
+
+from pydorm import dorm
+from pydorm.sqlite._sqlite_executor import sqlite_executor
+
+from .conftest import User
+
+pytestmark = pytest.mark.usefixtures("user_table")
+
+
+@pytest.fixture
+def queries(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """记录访问数据库的查询"""
+    executed: List[str] = []
+    for name in ("select_one", "select_many", "select_tuples"):
+        method = getattr(sqlite_executor, name)
+
+        def record(conn, sql, *args, _method=method, **kwargs):
+            executed.append(str(sql))
+            return _method(conn, sql, *args, **kwargs)
+
+        monkeypatch.setattr(sqlite_executor, name, record)
+    return executed
+
+
+def _find_queries(queries: List[str], wrapper, conn) -> int:
+    """执行 find 并返回访问数据库的次数"""
+    queries.clear()
+    dorm.find(wrapper, conn=conn)
+    return len(queries)
+
+
+def test_find_by_primary_key_is_cached_in_transaction(queries):
+    _, last_id = dorm.insert(User, {"name": "a", "age": 1})
+
+    conn = dorm.begin()
+    try:
+        assert _find_queries(queries, dorm.qw(User).eq("id", last_id), conn) == 1
+        assert _find_queries(queries, dorm.qw(User).eq("id", last_id), conn) == 0
+        # 只查询部分字段或按其他条件查询时不使用缓存
+        assert _find_queries(queries, dorm.qw(User).select("name").eq("id", last_id), conn) == 1
+        assert _find_queries(queries, dorm.qw(User).eq("name", "a"), conn) == 1
+    finally:
+        dorm.rollback(conn)
+
+
+def test_reused_wrapper_is_cached(queries):
+    _, last_id = dorm.insert(User, {"name": "a", "age": 1})
+
+    conn = dorm.begin()
+    try:
+        wrapper = dorm.qw(User).eq("id", last_id)
+        assert _find_queries(queries, wrapper, conn) == 1
+        # 编译后的包装器仍是按主键查询整行
+        assert _find_queries(queries, wrapper, conn) == 0
+    finally:
+        dorm.rollback(conn)
+
+
+def test_cached_entity_is_a_copy():
+    _, last_id = dorm.insert(User, {"name": "a", "age": 1})
+
+    conn = dorm.begin()
+    try:
+        user = dorm.find(dorm.qw(User).eq("id", last_id), conn=conn)
+        user.name = "changed"
+        assert dorm.find(dorm.qw(User).eq("id", last_id), conn=conn).name == "a"
+    finally:
+        dorm.rollback(conn)
+
+
+def test_update_evicts_row(queries):
+    _, last_id = dorm.insert(User, {"name": "a", "age": 1})
+
+    conn = dorm.begin()
+    try:
+        dorm.find(dorm.qw(User).eq("id", last_id), conn=conn)
+        dorm.update(dorm.uw(User).eq("id", last_id).set(age=2), conn=conn)
+
+        assert _find_queries(queries, dorm.qw(User).eq("id", last_id), conn) == 1
+        assert dorm.find(dorm.qw(User).eq("id", last_id), conn=conn).age == 2
+    finally:
+        dorm.rollback(conn)
+
+
+def test_update_by_condition_evicts_table(queries):
+    dorm.insert_bulk(User, [{"name": "a", "age": 1}, {"name": "b", "age": 1}])
+
+    conn = dorm.begin()
+    try:
+        dorm.find(dorm.qw(User).eq("id", 1), conn=conn)
+        dorm.find(dorm.qw(User).eq("id", 2), conn=conn)
+        dorm.update(dorm.uw(User).eq("age", 1).set(age=3), conn=conn)
+
+        assert _find_queries(queries, dorm.qw(User).eq("id", 1), conn) == 1
+        assert _find_queries(queries, dorm.qw(User).eq("id", 2), conn) == 1
+        assert dorm.find(dorm.qw(User).eq("id", 2), conn=conn).age == 3
+    finally:
+        dorm.rollback(conn)
+
+
+def test_delete_and_raw_query_evict(queries):
+    dorm.insert_bulk(User, [{"name": "a", "age": 1}, {"name": "b", "age": 1}])
+
+    conn = dorm.begin()
+    try:
+        dorm.find(dorm.qw(User).eq("id", 1), conn=conn)
+        dorm.delete(dorm.dw(User).eq("id", 1), conn=conn)
+        assert dorm.find(dorm.qw(User).eq("id", 1), conn=conn) is None
+
+        dorm.find(dorm.qw(User).eq("id", 2), conn=conn)
+        dorm.raw_query("UPDATE user SET name = ? WHERE id = ?", ("c", 2), conn=conn)
+        assert _find_queries(queries, dorm.qw(User).eq("id", 2), conn) == 1
+        assert dorm.find(dorm.qw(User).eq("id", 2), conn=conn).name == "c"
+    finally:
+        dorm.rollback(conn)
+
+
+def test_transaction_end_discards_cache(queries):
+    _, last_id = dorm.insert(User, {"name": "a", "age": 1})
+
+    conn = dorm.begin()
+    dorm.find(dorm.qw(User).eq("id", last_id), conn=conn)
+    dorm.commit(conn)
+
+    conn = dorm.begin()
+    try:
+        assert _find_queries(queries, dorm.qw(User).eq("id", last_id), conn) == 1
+    finally:
+        dorm.rollback(conn)
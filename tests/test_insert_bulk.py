@@ -0,0 +1,143 @@
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+
+import pytest
+from pymysql.converters import escape_item
+
+from pydorm import InsertWrapper, dorm
+from pydorm.mysql._mysql_executor import MysqlExecutor
+from pydorm.sqlite._sqlite_executor import MAX_VARIABLE_NUMBER
+
+from .conftest import User
+
+
+@dataclass
+class Item:
+    __table_name__ = "item"
+
+    id: int | None = None
+    name: str | None = None
+
+
+class _FakeCursor:
+    def __init__(self, statements: List[str]):
+        self._statements = statements
+
+    def execute(self, sql: str, args: Any = None) -> int:
+        self._statements.append(sql)
+        return sql.count("),(") + 1
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    """记录执行的语句，按 PyMySQL 的规则转义参数"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def escape(self, value: Any) -> str:
+        return escape_item(value, "utf8mb4")
+
+    def cursor(self, *args: Any, **kwargs: Any) -> _FakeCursor:
+        return _FakeCursor(self.statements)
+
+    def get_slow_query_log(self) -> None:
+        return None
+
+
+def _insert_values(rows, chunk_rows=1000, max_packet_bytes=1 << 20):
+    conn = _FakeConnection()
+    prefix, suffix, values = InsertWrapper(Item).build_insert_values_sql(rows)
+    executor = MysqlExecutor(log_sql=False)
+    chunks = list(executor.insert_values(conn, prefix, suffix, values, chunk_rows, max_packet_bytes))
+    return chunks, conn.statements
+
+
+def test_build_insert_values_sql():
+    wrapper = InsertWrapper(Item)
+    rows = [{"id": 1, "name": "a", "unknown": 0}, {"id": 2, "name": "b", "unknown": 0}]
+
+    assert wrapper.build_insert_values_sql(rows) == ("INSERT INTO item(id,name) VALUES", "", [(1, "a"), (2, "b")])
+    assert wrapper.build_insert_values_sql(rows, ["name"])[1] == " ON DUPLICATE KEY UPDATE name=VALUES(name)"
+
+
+def test_chunks_by_rows():
+    chunks, statements = _insert_values([{"id": i, "name": f"n{i}"} for i in range(5)], chunk_rows=2)
+
+    assert chunks == [(2, 2), (2, 2), (1, 1)]
+    assert statements[0] == "INSERT INTO item(id,name) VALUES(0,'n0'),(1,'n1')"
+    assert statements[2] == "INSERT INTO item(id,name) VALUES(4,'n4')"
+
+
+def test_chunks_by_packet_bytes():
+    rows = [{"id": i, "name": "x" * 10} for i in range(10)]
+
+    chunks, statements = _insert_values(rows, max_packet_bytes=100)
+
+    assert sum(row_count for row_count, _ in chunks) == 10
+    assert len(chunks) > 1
+    assert all(len(sql.encode("utf-8")) <= 100 for sql in statements)
+
+
+def test_row_larger_than_packet():
+    with pytest.raises(ValueError):
+        _insert_values([{"id": 1, "name": "x" * 100}], max_packet_bytes=60)
+
+
+def test_escapes_values():
+    _, statements = _insert_values([{"id": 1, "name": "it's"}])
+
+    assert statements == ["INSERT INTO item(id,name) VALUES(1,'it\\'s')"]
+
+
+@pytest.mark.usefixtures("user_table")
+def test_insert_bulk_chunks_by_rows():
+    data = [{"name": f"u{i}", "age": i} for i in range(25)]
+    progress: List[Tuple[int, int, int]] = []
+
+    row_affected = dorm.insert_bulk(User, data, chunk_rows=10, on_progress=lambda *args: progress.append(args))
+
+    assert row_affected == 25
+    assert progress == [(0, 10, 25), (1, 20, 25), (2, 25, 25)]
+    assert [user.age for user in dorm.list(dorm.qw(User).asc("id"))] == list(range(25))
+
+
+@pytest.mark.usefixtures("user_table")
+def test_insert_bulk_chunks_by_variable_limit():
+    # SQLite 每块的行数受单条语句的参数个数上限限制
+    max_rows = MAX_VARIABLE_NUMBER // 2
+    data = [{"name": f"u{i}", "age": i} for i in range(max_rows + 1)]
+    progress: List[Tuple[int, int, int]] = []
+
+    dorm.insert_bulk(User, data, chunk_rows=len(data), on_progress=lambda *args: progress.append(args))
+
+    assert progress == [(0, max_rows, len(data)), (1, len(data), len(data))]
+    assert dorm.count(dorm.qw(User)) == len(data)
+
+
+@pytest.mark.usefixtures("user_table")
+def test_insert_bulk_empty():
+    assert dorm.insert_bulk(User, []) == 0
+
+
+@pytest.mark.usefixtures("user_table")
+def test_insert_bulk_rolls_back_on_failure():
+    data = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 1, "name": "c"}]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        dorm.insert_bulk(User, data, chunk_rows=2)
+
+    assert dorm.count(dorm.qw(User)) == 0
+
+
+@pytest.mark.usefixtures("user_table")
+def test_insert_bulk_commit_per_chunk_keeps_committed_chunks():
+    data = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 1, "name": "c"}]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        dorm.insert_bulk(User, data, chunk_rows=2, commit_per_chunk=True)
+
+    assert dorm.count(dorm.qw(User)) == 2
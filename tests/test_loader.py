@@ -0,0 +1,155 @@
+import asyncio
+from typing import Hashable, List
+
+import pytest
+
+from pydorm import AsyncLoader, QueryEvent, dorm, remove_query_listener, use_query_listener
+
+from .conftest import User
+
+
+@pytest.fixture(autouse=True)
+def users(user_table):
+    dorm.insert_bulk(User, [{"name": f"u{i}", "age": i} for i in range(1, 8)])
+
+
+@pytest.fixture
+def queries():
+    """记录访问数据库的 list 查询"""
+    events: List[QueryEvent] = []
+
+    def listener(event: QueryEvent):
+        if event.operation == "list":
+            events.append(event)
+
+    use_query_listener(listener)
+    yield events
+    remove_query_listener(listener)
+
+
+def _async_loader(max_batch_size: int, fail_key: int | None = None) -> AsyncLoader[User]:
+    async def fetch(keys: List[Hashable]) -> List[User]:
+        # 让出事件循环，模拟异步查询
+        await asyncio.sleep(0)
+        if fail_key in keys:
+            raise RuntimeError("fetch failed")
+        return dorm.list(dorm.qw(User).in_("id", keys))
+
+    return AsyncLoader[User](fetch, "id", max_batch_size)
+
+
+def test_load_many_in_request_order(queries):
+    loader = dorm.loader(User)
+
+    users = loader.load_many([3, 1, 100, 3, 2])
+
+    assert [user.id if user else None for user in users] == [3, 1, None, 3, 2]
+    assert len(queries) == 1
+    assert "IN" in queries[0].sql
+
+
+def test_one_query_per_batch(queries):
+    loader = dorm.loader(User, max_batch_size=3)
+
+    users = loader.load_many(range(1, 9))
+
+    assert [user.id if user else None for user in users] == [1, 2, 3, 4, 5, 6, 7, None]
+    assert [event.rows for event in queries] == [3, 3, 1]
+
+
+def test_pending_loads_share_one_query(queries):
+    loader = dorm.loader(User)
+    pending = [loader.load(key) for key in (2, 4, 6)]
+
+    assert pending[1].get().name == "u4"
+    assert [load.get().id for load in pending] == [2, 4, 6]
+    assert len(queries) == 1
+
+
+def test_loaded_keys_are_cached(queries):
+    loader = dorm.loader(User)
+    loader.load_many([1, 2])
+    loader.prime(3, User(id=3, name="primed"))
+
+    assert [user.name for user in loader.load_many([2, 3, 1])] == ["u2", "primed", "u1"]
+    assert len(queries) == 1
+
+    loader.clear(1)
+    assert loader.load(1).get().name == "u1"
+    assert len(queries) == 2
+
+
+def test_loader_by_other_key(queries):
+    loader = dorm.loader(User, key="name")
+
+    assert [user.age if user else None for user in loader.load_many(["u5", "missing", "u1"])] == [5, None, 1]
+    assert len(queries) == 1
+
+
+def test_loader_validation():
+    with pytest.raises(ValueError):
+        dorm.loader(User, key="missing")
+    with pytest.raises(ValueError):
+        dorm.loader(User, max_batch_size=0)
+
+
+def test_async_loader_coalesces_gather(queries):
+    loader = _async_loader(max_batch_size=3)
+
+    async def main():
+        return await asyncio.gather(*(loader.load(key) for key in (5, 1, 100, 5, 2, 7, 3)))
+
+    users = asyncio.run(main())
+
+    assert [user.id if user else None for user in users] == [5, 1, None, 5, 2, 7, 3]
+    # 去重后 6 个键，每批 3 个
+    assert len(queries) == 2
+
+
+def test_async_loader_load_many_and_cache(queries):
+    loader = _async_loader(max_batch_size=100)
+
+    async def main():
+        first = await loader.load_many([2, 1])
+        second = await loader.load_many([1, 2, 3])
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert [user.id for user in first] == [2, 1]
+    assert [user.id for user in second] == [1, 2, 3]
+    assert len(queries) == 2
+    assert queries[1].rows == 1
+
+
+def test_async_loader_failed_chunk_fails_only_its_keys(queries):
+    loader = _async_loader(max_batch_size=2, fail_key=3)
+
+    async def main():
+        return await asyncio.gather(*(loader.load(key) for key in (1, 2, 3, 4, 5)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert [result.id for result in (results[0], results[1], results[4])] == [1, 2, 5]
+    assert isinstance(results[2], RuntimeError)
+    assert isinstance(results[3], RuntimeError)
+    assert len(queries) == 2
+
+
+def test_async_loader_retries_failed_keys():
+    fail_key: List[int | None] = [2]
+
+    async def fetch(keys: List[Hashable]) -> List[User]:
+        if fail_key[0] in keys:
+            raise RuntimeError("fetch failed")
+        return dorm.list(dorm.qw(User).in_("id", keys))
+
+    loader = AsyncLoader[User](fetch, "id")
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await loader.load(2)
+        fail_key[0] = None
+        return await loader.load(2)
+
+    assert asyncio.run(main()).name == "u2"
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+
+import pytest
+
+from pydorm import dorm
+from pydorm.utils.cursor_utils import decode_cursor, encode_cursor
+
+from .conftest import User
+
+
+@dataclass
+class Article:
+    __table_name__ = "article"
+
+    id: int | None = None
+    author: str | None = None
+    created_at: str | None = None
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor((1, "张三", None))
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (1, "张三", None)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor(()) + "!", "eyJhIjoxfQ"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_seek_first_page():
+    sql, args = dorm.qw(Article).eq("author", "a").asc("id").seek_page(None, 10).build_sql()
+
+    assert sql == "SELECT id,author,created_at FROM article WHERE author = ? ORDER BY id asc LIMIT ?"
+    assert args == ("a", 10)
+
+
+def test_seek_after_single_key():
+    sql, args = dorm.qw(Article).eq("author", "a").asc("id").offset(20).seek_page((5,), 10).build_sql()
+
+    assert sql == "SELECT id,author,created_at FROM article WHERE author = ? and id > ? ORDER BY id asc LIMIT ?"
+    assert args == ("a", 5, 10)
+
+
+def test_seek_after_composite_desc_keys():
+    sql, args = dorm.qw(Article).desc("created_at", "id").seek_page(("2024-01-01", 5), 10).build_sql()
+
+    assert sql == (
+        "SELECT id,author,created_at FROM article "
+        "WHERE (created_at,id) < (?,?) ORDER BY created_at desc,id desc LIMIT ?"
+    )
+    assert args == ("2024-01-01", 5, 10)
+
+
+def test_seek_explicit_keys():
+    wrapper = dorm.qw(Article).seek_page((5,), 10, keys=["id"])
+
+    assert wrapper.get_seek_keys() == ("id",)
+    assert wrapper.build_sql()[0] == "SELECT id,author,created_at FROM article WHERE id > ? ORDER BY id asc LIMIT ?"
+
+
+def test_seek_page_validation():
+    with pytest.raises(ValueError):
+        dorm.qw(Article).seek_page(None, 10)
+    with pytest.raises(ValueError):
+        dorm.qw(Article).asc("id").seek_page((1, 2), 10)
+    with pytest.raises(ValueError):
+        dorm.qw(Article).seek_page(None, 10, keys=["missing"])
+
+
+def _insert_users(count: int):
+    dorm.insert_bulk(User, [{"name": f"u{i}", "age": i % 3} for i in range(count)])
+
+
+@pytest.mark.usefixtures("user_table")
+def test_page_after_walks_all_pages():
+    _insert_users(7)
+
+    pages = []
+    after = None
+    while True:
+        users, after, total = dorm.page_after(dorm.qw(User).asc("id"), after, size=3, with_count=True)
+        pages.append([user.id for user in users])
+        assert total == 7
+        if after is None:
+            break
+
+    assert pages == [[1, 2, 3], [4, 5, 6], [7]]
+
+
+@pytest.mark.usefixtures("user_table")
+def test_page_after_desc_with_condition():
+    _insert_users(7)
+
+    users, after, total = dorm.page_after(dorm.qw(User).eq("age", 0).desc("id"), size=2)
+    assert [user.id for user in users] == [7, 4]
+    assert total is None
+
+    users, after, _ = dorm.page_after(dorm.qw(User).eq("age", 0).desc("id"), after, size=2)
+    assert [user.id for user in users] == [1]
+    assert after is None
+
+
+@pytest.mark.usefixtures("user_table")
+def test_page_after_composite_keys():
+    _insert_users(6)
+
+    users, after, _ = dorm.page_after(dorm.qw(User).asc("age", "id"), size=4)
+    assert [(user.age, user.id) for user in users] == [(0, 1), (0, 4), (1, 2), (1, 5)]
+
+    users, after, _ = dorm.page_after(dorm.qw(User).asc("age", "id"), after, size=4)
+    assert [(user.age, user.id) for user in users] == [(2, 3), (2, 6)]
+    assert after is None
+
+
+@pytest.mark.usefixtures("user_table")
+def test_page_after_exact_last_page():
+    _insert_users(4)
+
+    users, after, _ = dorm.page_after(dorm.qw(User).asc("id"), size=2)
+    users, after, _ = dorm.page_after(dorm.qw(User).asc("id"), after, size=2)
+
+    assert [user.id for user in users] == [3, 4]
+    # 整页时无法判断是否还有数据，下一页为空
+    users, after, _ = dorm.page_after(dorm.qw(User).asc("id"), after, size=2)
+    assert users == []
+    assert after is None
+
+
+@pytest.mark.usefixtures("user_table")
+def test_page_after_dict():
+    _insert_users(3)
+
+    rows, after, _ = dorm.page_after_dict(dorm.qw(User).select("id", "name").asc("id"), size=2)
+    assert rows == [{"id": 1, "name": "u0"}, {"id": 2, "name": "u1"}]
+    assert after is not None
@@ -0,0 +1,104 @@
+import pytest
+
+from pydorm import dorm
+
+from .conftest import User
+
+
+@pytest.fixture(autouse=True)
+def result_cache(user_table):
+    dorm.enable_result_cache(ttl=60)
+    dorm.insert_bulk(User, [{"name": "a", "age": 1}, {"name": "b", "age": 2}])
+
+
+def _hits_and_misses(query):
+    """执行查询并返回本次的命中和未命中次数"""
+    before = dorm.result_cache_stats()
+    query()
+    after = dorm.result_cache_stats()
+    return after["hits"] - before["hits"], after["misses"] - before["misses"]
+
+
+def test_query_is_cached():
+    def query():
+        return dorm.list(dorm.qw(User).asc("id"))
+
+    assert _hits_and_misses(query) == (0, 1)
+    assert _hits_and_misses(query) == (1, 0)
+    assert [user.name for user in query()] == ["a", "b"]
+
+
+def test_different_args_are_cached_separately():
+    assert dorm.find(dorm.qw(User).eq("id", 1)).name == "a"
+    assert dorm.find(dorm.qw(User).eq("id", 2)).name == "b"
+
+
+def test_cached_entities_are_copies():
+    dorm.find(dorm.qw(User).eq("id", 1)).name = "changed"
+
+    assert dorm.find(dorm.qw(User).eq("id", 1)).name == "a"
+
+
+def test_write_invalidates_table():
+    def count():
+        return dorm.count(dorm.qw(User))
+
+    def find():
+        return dorm.find(dorm.qw(User).eq("id", 1))
+
+    assert count() == 2
+    assert find().age == 1
+
+    dorm.insert(User, {"name": "c", "age": 3})
+    assert _hits_and_misses(count) == (0, 1)
+    assert count() == 3
+
+    dorm.update(dorm.uw(User).eq("id", 1).set(age=10))
+    assert find().age == 10
+
+    dorm.delete(dorm.dw(User).eq("id", 1))
+    assert find() is None
+    assert count() == 2
+
+
+def test_transaction_write_invalidates_on_commit():
+    assert dorm.count(dorm.qw(User)) == 2
+
+    conn = dorm.begin()
+    dorm.insert(User, {"name": "c", "age": 3}, conn=conn)
+    # 提交前其他连接读到的仍是已提交的数据
+    assert dorm.count(dorm.qw(User)) == 2
+    dorm.commit(conn)
+
+    assert dorm.count(dorm.qw(User)) == 3
+
+
+def test_queries_on_connection_are_not_cached():
+    conn = dorm.begin()
+    try:
+        def query():
+            return dorm.count(dorm.qw(User), conn=conn)
+
+        assert _hits_and_misses(query) == (0, 0)
+        assert _hits_and_misses(query) == (0, 0)
+    finally:
+        dorm.rollback(conn)
+
+
+def test_raw_query_requires_manual_invalidation():
+    assert dorm.count(dorm.qw(User)) == 2
+
+    dorm.raw_query("DELETE FROM user WHERE id = ?", (1,))
+    assert dorm.count(dorm.qw(User)) == 2
+
+    dorm.invalidate_result_cache(User)
+    assert dorm.count(dorm.qw(User)) == 1
+
+
+def test_disable_result_cache():
+    assert dorm.count(dorm.qw(User)) == 2
+    dorm.disable_result_cache()
+
+    dorm.raw_query("DELETE FROM user WHERE id = ?", (1,))
+    assert dorm.result_cache_stats() == {}
+    assert dorm.count(dorm.qw(User)) == 1
@@ -0,0 +1,158 @@
+import time
+from typing import List
+
+import pytest
+from loguru import logger
+
+from pydorm import dorm
+from pydorm._sql_log import SqlLog, SqlLogPolicy, sql_log
+
+from .conftest import User
+
+
+@pytest.fixture
+def messages():
+    """loguru 输出的 级别|消息"""
+    records: List[str] = []
+
+    def sink(message):
+        records.append(f'{message.record["level"].name}|{message.record["message"]}')
+
+    handler_id = logger.add(sink)
+    yield records
+    logger.remove(handler_id)
+
+
+def _sql_messages(messages: List[str]) -> List[str]:
+    return [message for message in messages if "] SELECT" in message or "] INSERT" in message]
+
+
+def test_level():
+    assert SqlLogPolicy("warning").level == "WARNING"
+    assert SqlLogPolicy("off").level is None
+    assert SqlLogPolicy(None).level is None
+    assert not SqlLogPolicy("off").accept(1.0)
+
+
+@pytest.mark.parametrize("level", ["WARN", "verbose", ""])
+def test_unknown_level(level):
+    with pytest.raises(ValueError):
+        SqlLogPolicy(level)
+
+
+def test_invalid_config_keeps_policies():
+    log = SqlLog()
+    log.configure({"level": "INFO"})
+
+    with pytest.raises(ValueError):
+        log.configure({"level": "INFO", "data_sources": {"default": {"level": "WARN"}}})
+    with pytest.raises(ValueError):
+        log.configure({"sample_every": 0})
+    with pytest.raises(ValueError):
+        log.configure({"args": "full"})
+
+    assert log.get_policy("default").level == "INFO"
+
+
+def test_sample_every():
+    policy = SqlLogPolicy(sample_every=3)
+
+    assert [policy.accept(0.001) for _ in range(7)] == [True, False, False, True, False, False, True]
+
+
+def test_slow_ms():
+    policy = SqlLogPolicy(slow_ms=5)
+
+    # 执行前记录的语句没有耗时
+    assert not policy.accept(None)
+    assert not policy.accept(0.004)
+    assert policy.accept(0.005)
+    assert policy.accept(1.0)
+
+
+def test_args_modes():
+    args = ("secret-token", 42, None, (1, 2, 3, 4), b"\x00\x01")
+
+    assert SqlLogPolicy().format("ds", 1, "SELECT ?", args, None, None) == "[ds][1] SELECT ?"
+    assert SqlLogPolicy(args="redact").format("ds", 1, "SELECT ?", args, 0.0015, None) == (
+        "[ds][1] SELECT ? | 1.500ms | args=['<str:12>', '<int>', 'None', '<tuple:4>', '<bytes:2>']"
+    )
+    truncated = SqlLogPolicy(args="truncate", max_arg_length=6).format("ds", 1, "SELECT ?", args, None, None)
+    assert "'secre...(14 chars)" in truncated
+    assert "[1, 2, 3, ...] (4 items)" in truncated
+    assert "secret-token" not in truncated
+
+
+def test_max_sql_length_and_error():
+    message = SqlLogPolicy(max_sql_length=10).format("ds", 1, "SELECT * FROM user", None, None, ValueError("boom"))
+
+    assert message == "[ds][1] SELECT * F...(18 chars) | failed: ValueError: boom"
+
+
+def test_policy_resolution():
+    log = SqlLog()
+    log.configure(
+        {
+            "level": "INFO",
+            "args": "redact",
+            "data_sources": {"primary": {"level": "WARNING"}, "primary:replica-2": {"slow_ms": 100}},
+        }
+    )
+
+    default = log.get_policy("other")
+    primary = log.get_policy("primary")
+    assert (default.level, default.args) == ("INFO", "redact")
+    # 未配置的项继承默认策略
+    assert (primary.level, primary.args) == ("WARNING", "redact")
+    # 副本使用主库的策略，单独配置的副本除外
+    assert log.get_policy("primary:replica-1") is primary
+    assert log.get_policy("primary:replica-2").slow == 0.1
+    assert log.get_policy("primary:replica-2").level == "INFO"
+    assert log.get_policy("other:replica-1") is default
+
+
+def test_emit_and_flush(messages):
+    log = SqlLog()
+    log.configure({"level": "INFO", "args": "redact", "data_sources": {"quiet": {"level": "off"}}})
+
+    log.emit("default", 1, "SELECT ?", (1,), 0.001)
+    log.emit("quiet", 1, "SELECT ?", (1,), 0.001)
+    log.flush()
+
+    assert _sql_messages(messages) == ["INFO|[default][1] SELECT ? | 1.000ms | args=['<int>']"]
+    assert log.stats()["emitted"] == 1
+
+
+def test_queue_full_drops_records(messages):
+    log = SqlLog(max_queue_size=2, flush_interval=60)
+    log.configure({"level": "INFO"})
+
+    # 等待后台线程启动时的第一次写入，之后的记录留在队列中
+    log.emit("default", 1, "SELECT 0", None)
+    deadline = time.monotonic() + 5
+    while log.stats()["queued"] > 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    for i in range(1, 5):
+        log.emit("default", 1, f"SELECT {i}", None)
+
+    assert log.stats()["queued"] == 2
+    assert log.stats()["dropped"] == 2
+    log.flush()
+    assert [message.rsplit(" ", 1)[1] for message in _sql_messages(messages)] == ["0", "1", "2"]
+
+
+def test_executor_logs_through_policy(user_table, messages):
+    dorm.configure_sql_log({"level": "INFO", "args": "redact"})
+    try:
+        dorm.insert(User, {"name": "alice", "age": 20})
+        dorm.find(dorm.qw(User).eq("name", "alice"))
+        sql_log.flush()
+    finally:
+        dorm.configure_sql_log({"level": "off"})
+
+    logged = _sql_messages(messages)
+    assert len(logged) == 2
+    assert logged[0].startswith("INFO|[default][")
+    assert "INSERT INTO user(name,age) VALUES(?,?)" in logged[0]
+    assert logged[0].endswith("args=['<str:5>', '<int>']")
+    assert "alice" not in logged[1]
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from pydorm._instrumentation import QueryEvent
+from pydorm._statement_stats import LatencyHistogram, StatementStats, normalize_sql
+
+
+def _event(sql: str | None, duration: float = 0.001, operation: str = "list", data_source_id: str = "default"):
+    event = QueryEvent(operation, data_source_id, "user")
+    event.sql = sql
+    event.duration = duration
+    return event
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        ("SELECT * FROM t WHERE a = 'x''y' AND b = 'a\\'b'", "SELECT * FROM t WHERE a = ? AND b = ?"),
+        ("SELECT * FROM t WHERE a = 12 AND b = 1.5e3 AND c = 0x1F", "SELECT * FROM t WHERE a = ? AND b = ? AND c = ?"),
+        ("SELECT * FROM t WHERE a = %s AND b = ?", "SELECT * FROM t WHERE a = ? AND b = ?"),
+        # 标识符中的数字不是字面量
+        ("SELECT col1 FROM t2 WHERE $3 = 1", "SELECT col1 FROM t2 WHERE $3 = ?"),
+        ("SELECT  *\n  FROM t\tWHERE a = 1 ", "SELECT * FROM t WHERE a = ?"),
+    ],
+)
+def test_normalize_literals_and_placeholders(sql, expected):
+    assert normalize_sql(sql) == expected
+
+
+def test_normalize_collapses_lists():
+    assert normalize_sql("SELECT * FROM t WHERE id IN (?, ?,?)") == "SELECT * FROM t WHERE id IN (...)"
+    assert normalize_sql("SELECT * FROM t WHERE id IN (1, 2)") == normalize_sql("SELECT * FROM t WHERE id IN (%s)")
+    assert normalize_sql("INSERT INTO t(a,b) VALUES (?,?),(?,?), (?,?)") == "INSERT INTO t(a,b) VALUES (...)"
+    assert normalize_sql("INSERT INTO t(a,b) VALUES (1,'a'),(2,'b')") == "INSERT INTO t(a,b) VALUES (...)"
+    # 单行 VALUES 同样折叠，列名列表保持不变
+    assert normalize_sql("INSERT INTO t(a,b) VALUES (?,?)") == "INSERT INTO t(a,b) VALUES (...)"
+
+
+@pytest.mark.parametrize("growth", [1.05, 1.2])
+def test_quantile_error_bound(growth):
+    histogram = LatencyHistogram(growth=growth)
+    values = sorted(random.Random(0).lognormvariate(-6, 1.5) for _ in range(10000))
+    for value in values:
+        histogram.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        actual = values[int(q * len(values)) - 1]
+        assert abs(histogram.quantile(q) - actual) / actual <= (growth - 1) / 2 + 1e-9
+
+
+def test_quantile_empty_and_small_values():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) == 0.0
+
+    histogram.add(0.0)
+    assert histogram.quantile(0.5) < 2e-6
+
+
+def test_aggregates_by_statement_shape():
+    stats = StatementStats()
+    stats(_event("SELECT * FROM user WHERE id = ?", 0.002))
+    stats(_event("SELECT * FROM user WHERE id = 5", 0.004))
+    stats(_event("SELECT * FROM user WHERE id = ?", 0.001, operation="find"))
+    error_event = _event("SELECT * FROM user WHERE id = ?", 0.003)
+    error_event.error = ValueError()
+    stats(error_event)
+    # 未访问数据库的操作不计入
+    stats(_event(None))
+
+    entries = stats.snapshot()
+    assert [(entry["operation"], entry["calls"]) for entry in entries] == [("list", 3), ("find", 1)]
+    assert entries[0]["statement"] == "SELECT * FROM user WHERE id = ?"
+    assert entries[0]["errors"] == 1
+    assert entries[0]["total_time"] == pytest.approx(0.009)
+    assert entries[0]["max_time"] == 0.004
+    assert entries[0]["p99"] <= entries[0]["max_time"]
+    assert entries[0]["query_id"] != entries[1]["query_id"]
+
+
+def test_eviction_at_max_statements():
+    stats = StatementStats(max_statements=20)
+    for i in range(20):
+        for _ in range(i + 1):
+            stats(_event(f"SELECT * FROM t{i}"))
+
+    stats(_event("SELECT * FROM new_table"))
+
+    statements = {entry["statement"] for entry in stats.snapshot()}
+    # 移除调用次数最少的 5%（至少一条）后再加入新的语句
+    assert "SELECT * FROM t0" not in statements
+    assert "SELECT * FROM t1" in statements
+    assert "SELECT * FROM new_table" in statements
+    assert stats.stats() == {"size": 20, "max_statements": 20, "evicted": 1}
+
+
+def test_snapshot_reset():
+    stats = StatementStats()
+    stats(_event("SELECT 1"))
+
+    assert len(stats.snapshot(reset=True)) == 1
+    assert stats.snapshot() == []
+
+
+def test_max_statements_must_be_positive():
+    with pytest.raises(ValueError):
+        StatementStats(max_statements=0)
+
+
+def test_prometheus_format():
+    stats = StatementStats()
+    stats(_event("SELECT * FROM user WHERE name = ?", 0.5))
+
+    text = stats.to_prometheus()
+    assert "# TYPE pydorm_statement_calls_total counter" in text
+    assert "# TYPE pydorm_statement_duration_seconds summary" in text
+    assert 'operation="list",statement="SELECT * FROM user WHERE name = ?"} 1' in text
+    assert 'quantile="0.99"} ' in text
+    assert 'pydorm_statement_duration_seconds_sum{' in text
+    assert text.endswith("\n")
+
+
+def test_prometheus_label_escaping():
+    stats = StatementStats()
+    stats(_event('SELECT "a\\b"\nFROM t', data_source_id='ds"1\n'))
+
+    text = stats.to_prometheus()
+    assert 'data_source="ds\\"1\\n"' in text
+    assert 'statement="SELECT \\"a\\\\b\\" FROM t"' in text
+    # 每个样本占一行
+    assert all(line.startswith(("#", "pydorm_statement_")) for line in text.splitlines())